@@ -3,22 +3,31 @@ Bangla PDF Editor - Backend Server
 All PDF processing happens on the server side
 """
 
-from flask import Flask, request, jsonify, send_file, render_template
+from flask import Flask, request, jsonify, send_file, render_template, Response, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 import os
 from werkzeug.utils import secure_filename
 import uuid
 from datetime import datetime
 import json
+import math
 
 # Import utility modules
-from utils.pdf_processor import PDFProcessor
+from utils.pdf_processor import PDFProcessor, png_data_url
+from utils.page_extractor import merge_font_table
 from utils.ocr_handler import OCRHandler
 from utils.text_editor import TextEditor
 from utils.page_manager import PageManager
 from utils.annotation_handler import AnnotationHandler
 from utils.document_operations import DocumentOperations
-from utils.bijoy_unicode_converter import convert_bijoy_to_unicode, is_bijoy_text
+from utils.bijoy_unicode_converter import convert_batch, conversion_stats
+from utils.extraction_cache import ExtractionCache, save_with_digest
+from utils.render_cache import RenderCache, bump_page_version, page_version, render_key
+from utils.text_conversion import DIRECTIONS, decode_input, iter_converted
+from utils.thumbnails import ThumbnailService
+from utils.text_layer import api_default
+from utils.wire_format import WIRE_MIMETYPE, encode_response
 from session_manager import SessionManager
 import logging
 
@@ -33,6 +42,20 @@ app = Flask(__name__,
             template_folder='../frontend/templates',
             static_folder='../frontend/static')
 
+
+class TextLayerJSONProvider(DefaultJSONProvider):
+    """Send page text layers to the client as lists of per-word dicts"""
+    
+    @staticmethod
+    def default(o):
+        try:
+            return api_default(o)
+        except TypeError:
+            return DefaultJSONProvider.default(o)
+
+
+app.json = TextLayerJSONProvider(app)
+
 # Load configuration
 from config import config
 env = os.environ.get('FLASK_ENV', 'development')
@@ -65,6 +88,27 @@ page_manager = PageManager()
 annotation_handler = AnnotationHandler()
 doc_operations = DocumentOperations()
 
+# Processed uploads keyed by file content, so re-uploads skip extraction
+extraction_cache = ExtractionCache(
+    os.path.join(app.config.get('CACHE_FOLDER', 'cache'), 'extraction'),
+    app.config.get('EXTRACTION_CACHE_MAX_BYTES', 500 * 1024 * 1024)
+)
+
+# Rendered page images keyed by session, page, zoom and page version
+render_cache = RenderCache(
+    os.path.join(app.config.get('CACHE_FOLDER', 'cache'), 'render'),
+    app.config.get('RENDER_CACHE_MEMORY_BYTES', 64 * 1024 * 1024),
+    app.config.get('RENDER_CACHE_MAX_BYTES', 500 * 1024 * 1024)
+)
+
+# Page thumbnails in sprite sheets, rendered in the background after upload
+thumbnail_service = ThumbnailService(
+    os.path.join(app.config.get('CACHE_FOLDER', 'cache'), 'thumbnails'),
+    app.config.get('THUMBNAIL_WORKERS', 1),
+    app.config.get('THUMBNAIL_WIDTH', 120),
+    app.config.get('THUMBNAILS_PER_SHEET', 50)
+)
+
 # Initialize session manager with persistent storage
 session_manager = SessionManager(app.config['SESSION_FOLDER'])
 logger.info("Session manager initialized with persistent storage")
@@ -91,6 +135,7 @@ def cleanup_worker():
             
             # Clean old sessions
             deleted_sessions = session_manager.cleanup_old_sessions(24)
+            thumbnail_service.cleanup(24)
             
             # Clean old uploaded files
             import glob
@@ -140,6 +185,9 @@ def health_check():
             'timestamp': datetime.now().isoformat(),
             'version': '1.0.0',
             'sessions': session_count,
+            'extraction_cache': extraction_cache.stats(),
+            'render_cache': render_cache.stats(),
+            'bijoy_conversion': conversion_stats(),
             'folders': 'ok' if folders_ok else 'error'
         }), 200
     except Exception as e:
@@ -149,49 +197,142 @@ def health_check():
             'timestamp': datetime.now().isoformat()
         }), 503
 
+def convert_page_text(page, font_table=None):
+    """
+    Convert the Bijoy text of a page's text layer to Unicode in place
+    
+    font_table is the document's font table; sessions saved before it
+    existed leave it out and fall back to detecting Bijoy text per word
+    """
+    text_layer = page['text_blocks']
+    original_texts = text_layer.texts
+    font_names = [text_layer.fonts[font_id] for font_id in text_layer.font_ids]
+    
+    # Converts each distinct (word, font) once, through the shared memo
+    unicode_texts, bijoy_flags = convert_batch(original_texts, font_names, font_table)
+    for index, is_bijoy in enumerate(bijoy_flags):
+        if is_bijoy:
+            text_layer.set_bijoy(index)
+    
+    text_layer.texts = unicode_texts
+    text_layer.original_texts = original_texts  # Keep original for reference
+    logger.debug(f"Converted page {page['page_number']}: {len(original_texts)} words, "
+                 f"{sum(bijoy_flags)} Bijoy")
+
+def page_png(session_id, session, page_number, zoom):
+    """
+    PNG of a page at its current version, from the render cache if possible
+    
+    Scrolling back to a page reuses its render until the page is edited
+    """
+    version = page_version(session, page_number)
+    png_data = render_cache.get(session_id, page_number, zoom, version)
+    if png_data is None:
+        png_data = pdf_processor.render_page_png(session['filepath'], page_number, zoom)
+        render_cache.put(session_id, page_number, zoom, version, png_data)
+    return png_data
+
+def page_pixels(session, page_number, zoom):
+    """Pixel count of a whole page rendered at zoom"""
+    page = session['pdf_data']['pages'][page_number]
+    return math.ceil(page['width'] * zoom) * math.ceil(page['height'] * zoom)
+
+def zoom_value(value):
+    """value as a zoom factor, or None if it is not a positive number"""
+    if isinstance(value, bool):
+        return None
+    try:
+        zoom = float(value)
+    except (TypeError, ValueError):
+        return None
+    return zoom if zoom > 0 and math.isfinite(zoom) else None
+
+def zoom_arg():
+    """The zoom query parameter (default 1), or None if it is not a positive number"""
+    return zoom_value(request.args.get('zoom', '1'))
+
+def page_image_response(etag, version, render, mimetype='image/png'):
+    """
+    Respond with a page image or tile, or with 304 if the client has it
+    
+    A URL naming the current page version (v) is immutable; others have
+    to be revalidated. render is only called when the image is sent.
+    """
+    if request.args.get('v', type=int) == version:
+        cache_control = 'private, max-age=31536000, immutable'
+    else:
+        cache_control = 'private, no-cache'
+    
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = Response(render(), mimetype=mimetype)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = cache_control
+    return response
+
+def text_layer_response(payload):
+    """
+    Respond with payload as JSON, or in the packed text-layer wire format
+    when the client asks for it in its Accept header
+    """
+    if request.accept_mimetypes.best_match(['application/json', WIRE_MIMETYPE]) == WIRE_MIMETYPE:
+        response = Response(encode_response(payload), mimetype=WIRE_MIMETYPE)
+    else:
+        response = jsonify(payload)
+    response.vary.add('Accept')
+    return response
+
+def validate_pdf_upload():
+    """Return an error response if the request carries no PDF file, else None"""
+    if 'file' not in request.files:
+        return jsonify({'error': 'No file provided'}), 400
+    
+    file = request.files['file']
+    if file.filename == '':
+        return jsonify({'error': 'No file selected'}), 400
+    
+    if not file.filename.lower().endswith('.pdf'):
+        return jsonify({'error': 'Only PDF files are allowed'}), 400
+    
+    return None
+
 @app.route('/api/upload', methods=['POST'])
 def upload_pdf():
     """Upload and process PDF file"""
     try:
-        if 'file' not in request.files:
-            return jsonify({'error': 'No file provided'}), 400
-        
-        file = request.files['file']
-        if file.filename == '':
-            return jsonify({'error': 'No file selected'}), 400
-        
-        if not file.filename.lower().endswith('.pdf'):
-            return jsonify({'error': 'Only PDF files are allowed'}), 400
+        error = validate_pdf_upload()
+        if error:
+            return error
         
         # Generate session ID
         session_id = str(uuid.uuid4())
         
         # Save uploaded file
+        file = request.files['file']
         filename = secure_filename(file.filename)
         filepath = os.path.join(app.config['UPLOAD_FOLDER'], f"{session_id}_{filename}")
-        file.save(filepath)
-        
-        # Process PDF and extract text with OCR
-        pdf_data = pdf_processor.process_pdf(filepath, session_id)
-        
-        # Convert Bijoy text to Unicode in all text blocks
-        for page in pdf_data['pages']:
-            for text_block in page['text_blocks']:
-                # Check if text is Bijoy and convert
-                original_text = text_block['text']
-                font_name = text_block.get('font', '')
-                
-                # Convert Bijoy to Unicode
-                unicode_text = convert_bijoy_to_unicode(original_text, font_name)
-                
-                # Update text block
-                text_block['text'] = unicode_text
-                text_block['original_text'] = original_text  # Keep original for reference
-                text_block['is_bijoy'] = is_bijoy_text(original_text)
-                
-                # Add conversion info for debugging
-                if text_block['is_bijoy']:
-                    logger.info(f"Converted Bijoy text: '{original_text}' -> '{unicode_text}'")
+        digest = save_with_digest(file.stream, filepath)
+        
+        # Re-uploads of a known file reuse its processed data
+        pdf_data = extraction_cache.get(digest)
+        if pdf_data is None:
+            # Lazy uploads only extract the first pages; the viewer asks for
+            # the others through /api/page/text when it needs them
+            lazy = request.form.get('lazy', '').lower() in ('1', 'true', 'yes')
+            page_limit = app.config.get('LAZY_UPLOAD_PAGES', 1) if lazy else None
+            
+            # Process PDF and extract text with OCR
+            pdf_data = pdf_processor.process_pdf(filepath, session_id, page_limit=page_limit)
+            
+            # Convert Bijoy text to Unicode in all text blocks
+            for page in pdf_data['pages']:
+                convert_page_text(page, pdf_data['font_table'])
+            
+            if page_limit is None:
+                extraction_cache.put(digest, pdf_data)
+        else:
+            logger.info(f"Extraction cache hit: {digest}")
         
         # Store session with persistent storage
         session_data = {
@@ -203,8 +344,9 @@ def upload_pdf():
         }
         session_manager.save(session_id, session_data)
         logger.info(f"Session created and saved: {session_id}")
+        thumbnail_service.start(session_id, filepath)
         
-        return jsonify({
+        return text_layer_response({
             'success': True,
             'session_id': session_id,
             'pdf_data': pdf_data,
@@ -215,6 +357,155 @@ def upload_pdf():
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/upload/stream', methods=['POST'])
+def upload_pdf_stream():
+    """
+    Upload a PDF and stream its pages back as NDJSON
+    
+    The first line describes the document (session ID, metadata, the
+    first LAZY_UPLOAD_PAGES pages and size-only placeholders for the
+    rest), then one line per further page is sent as soon as it is
+    extracted, and a final line marks the end.
+    """
+    try:
+        error = validate_pdf_upload()
+        if error:
+            return error
+        
+        # Generate session ID
+        session_id = str(uuid.uuid4())
+        
+        # Save uploaded file
+        file = request.files['file']
+        filename = secure_filename(file.filename)
+        filepath = os.path.join(app.config['UPLOAD_FOLDER'], f"{session_id}_{filename}")
+        digest = save_with_digest(file.stream, filepath)
+        
+        # A cached document is complete: the stream is just the document
+        # line. Otherwise the first pages are extracted right away and sent
+        # with the document line (the viewer shows them first), and the
+        # session is saved with placeholders for the rest so /api/page/text
+        # can serve pages the viewer asks for before the stream reaches them
+        first_pages = app.config.get('LAZY_UPLOAD_PAGES', 1)
+        cached_data = extraction_cache.get(digest)
+        if cached_data is not None:
+            logger.info(f"Extraction cache hit: {digest}")
+            pdf_data = cached_data
+        else:
+            pdf_data = pdf_processor.process_pdf(filepath, session_id, page_limit=first_pages)
+            for page in pdf_data['pages'][:first_pages]:
+                convert_page_text(page, pdf_data['font_table'])
+        session_data = {
+            'filename': filename,
+            'filepath': filepath,
+            'pdf_data': pdf_data,
+            'created_at': datetime.now().isoformat(),
+            'modifications': []
+        }
+        session_manager.save(session_id, session_data)
+        logger.info(f"Session created, streaming pages: {session_id}")
+        thumbnail_service.start(session_id, filepath)
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+    
+    def generate():
+        yield json.dumps({
+            'type': 'document',
+            'session_id': session_id,
+            'pdf_data': pdf_data
+        }, ensure_ascii=False, default=api_default) + '\n'
+        
+        try:
+            if cached_data is not None:
+                yield json.dumps({
+                    'type': 'done',
+                    'message': 'পিডিএফ সফলভাবে আপলোড হয়েছে | PDF uploaded successfully'
+                }, ensure_ascii=False, default=api_default) + '\n'
+                return
+            
+            for page in pdf_processor.iter_pages(filepath, start=first_pages):
+                merge_font_table(pdf_data['font_table'], page.pop('font_table'))
+                convert_page_text(page, pdf_data['font_table'])
+                pdf_data['pages'][page['page_number']] = page
+                yield json.dumps({'type': 'page', 'page': page}, ensure_ascii=False, default=api_default) + '\n'
+            
+            # Pages opened (and possibly edited) while the stream was
+            # running are already in the stored session; keep those
+            with session_manager.lock(session_id):
+                stored = session_manager.load(session_id) or session_data
+                stored_pages = stored['pdf_data']['pages']
+                for page in pdf_data['pages']:
+                    if stored_pages[page['page_number']].get('extracted', True) is False:
+                        stored_pages[page['page_number']] = page
+                stored['pdf_data']['bbox_corrections'] = pdf_processor.correction_totals(stored_pages)
+                merge_font_table(stored['pdf_data'].setdefault('font_table', {}), pdf_data['font_table'])
+                session_manager.save(session_id, stored)
+            
+            pdf_data['bbox_corrections'] = pdf_processor.correction_totals(pdf_data['pages'])
+            extraction_cache.put(digest, pdf_data)
+            logger.info(f"Session saved after streaming: {session_id}")
+            
+            yield json.dumps({
+                'type': 'done',
+                'message': 'পিডিএফ সফলভাবে আপলোড হয়েছে | PDF uploaded successfully'
+            }, ensure_ascii=False, default=api_default) + '\n'
+        
+        except Exception as e:
+            logger.error(f"Streaming upload failed: {e}", exc_info=True)
+            yield json.dumps({'type': 'error', 'error': str(e)}) + '\n'
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+
+@app.route('/api/page/text', methods=['POST'])
+def get_page_text():
+    """Return the text layer of a page, extracting it on first request"""
+    try:
+        data = request.json
+        session_id = data.get('session_id')
+        page_number = data.get('page_number', 0)
+        
+        if not session_manager.exists(session_id):
+            return jsonify({'error': 'Invalid session'}), 404
+        
+        session = session_manager.load(session_id)
+        pages = session['pdf_data']['pages']
+        
+        if not isinstance(page_number, int) or not 0 <= page_number < len(pages):
+            return jsonify({'error': 'Invalid page number'}), 400
+        
+        page = pages[page_number]
+        
+        # Pages from a lazy upload are extracted once and cached in the session.
+        # Extraction runs unlocked; the page is merged into a fresh copy of the
+        # session, unless another request has stored it meanwhile. The page's
+        # fonts join the document's font table along with it.
+        if not page.get('extracted', True):
+            page = pdf_processor.extract_page_text(session['filepath'], page_number)
+            page_fonts = page.pop('font_table')
+            font_table = merge_font_table(dict(session['pdf_data'].get('font_table') or {}), page_fonts)
+            convert_page_text(page, font_table)
+            with session_manager.lock(session_id):
+                session = session_manager.load(session_id)
+                pages = session['pdf_data']['pages']
+                if pages[page_number].get('extracted', True):
+                    page = pages[page_number]
+                else:
+                    pages[page_number] = page
+                    merge_font_table(session['pdf_data'].setdefault('font_table', {}), page_fonts)
+                    session_manager.save(session_id, session)
+                    logger.info(f"Extracted page {page_number} on demand for session {session_id}")
+        
+        return text_layer_response({
+            'success': True,
+            'page': page
+        })
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
 @app.route('/api/ocr/detect', methods=['POST'])
 def detect_text_ocr():
     """Detect text using OCR on a specific page"""
@@ -250,47 +541,50 @@ def edit_text():
         if not session_manager.exists(session_id):
             return jsonify({'error': 'Invalid session'}), 404
         
-        session = session_manager.load(session_id)
-        
-        # Apply edit immediately to the working PDF file
-        try:
-            pdf_processor.apply_edit_immediately(
-                session['filepath'],
-                data.get('page_number'),
-                data.get('bbox'),
-                data.get('original_text', ''),
-                data.get('new_text'),
-                data.get('font', 'helv'),
-                data.get('font_size', 12),
-                data.get('color', '#000000'),
-                data.get('position', {'x': 50, 'y': 50})
-            )
-        except Exception as e:
-            logger.warning(f"Error applying edit immediately: {e}")
-        
-        # Store modification for final save
-        session['modifications'].append({
-            'type': 'text_edit',
-            'timestamp': datetime.now().isoformat(),
-            'data': data
-        })
-        
-        # Update the text block in session data
-        page_data = session['pdf_data']['pages'][data.get('page_number')]
-        for block in page_data['text_blocks']:
-            if block['id'] == data.get('text_box_id'):
-                block['text'] = data.get('new_text')
-                block['font'] = data.get('font')
-                block['size'] = data.get('font_size')
-                block['color'] = data.get('color')
-                break
-        
-        # Save updated session
-        session_manager.save(session_id, session)
+        with session_manager.lock(session_id):
+            session = session_manager.load(session_id)
+            
+            # Apply edit immediately to the working PDF file
+            try:
+                pdf_processor.apply_edit_immediately(
+                    session['filepath'],
+                    data.get('page_number'),
+                    data.get('bbox'),
+                    data.get('original_text', ''),
+                    data.get('new_text'),
+                    data.get('font', 'helv'),
+                    data.get('font_size', 12),
+                    data.get('color', '#000000'),
+                    data.get('position', {'x': 50, 'y': 50})
+                )
+            except Exception as e:
+                logger.warning(f"Error applying edit immediately: {e}")
+            
+            # Renders of the page from before the edit are stale
+            version = bump_page_version(session, data.get('page_number'))
+            render_cache.invalidate(session_id, data.get('page_number'))
+            
+            # Store modification for final save
+            session['modifications'].append({
+                'type': 'text_edit',
+                'timestamp': datetime.now().isoformat(),
+                'data': data
+            })
+            
+            # Update the text block in session data
+            text_layer = session['pdf_data']['pages'][data.get('page_number')]['text_blocks']
+            index = text_layer.index_of(data.get('text_box_id'))
+            if index is not None:
+                text_layer.update_word(index, data.get('new_text'), data.get('font'),
+                                       data.get('font_size'), data.get('color'))
+            
+            # Save updated session
+            session_manager.save(session_id, session)
         logger.info(f"Session updated: {session_id}")
         
         return jsonify({
             'success': True,
+            'page_version': version,
             'message': 'টেক্সট সফলভাবে সম্পাদিত হয়েছে | Text edited successfully'
         })
     
@@ -307,28 +601,29 @@ def add_text():
         if not session_manager.exists(session_id):
             return jsonify({'error': 'Invalid session'}), 404
         
-        session = session_manager.load(session_id)
-        
-        result = text_editor.add_text(
-            session['filepath'],
-            session_id,
-            data.get('page_number'),
-            data.get('text'),
-            data.get('position'),
-            data.get('font'),
-            data.get('font_size'),
-            data.get('color'),
-            data.get('style')
-        )
-        
-        session['modifications'].append({
-            'type': 'text_add',
-            'timestamp': datetime.now().isoformat(),
-            'data': data
-        })
-        
-        # Save updated session
-        session_manager.save(session_id, session)
+        with session_manager.lock(session_id):
+            session = session_manager.load(session_id)
+            
+            result = text_editor.add_text(
+                session['filepath'],
+                session_id,
+                data.get('page_number'),
+                data.get('text'),
+                data.get('position'),
+                data.get('font'),
+                data.get('font_size'),
+                data.get('color'),
+                data.get('style')
+            )
+            
+            session['modifications'].append({
+                'type': 'text_add',
+                'timestamp': datetime.now().isoformat(),
+                'data': data
+            })
+            
+            # Save updated session
+            session_manager.save(session_id, session)
         
         return jsonify(result)
     
@@ -345,29 +640,69 @@ def delete_text():
         if not session_manager.exists(session_id):
             return jsonify({'error': 'Invalid session'}), 404
         
-        session = session_manager.load(session_id)
-        
-        result = text_editor.delete_text(
-            session['filepath'],
-            session_id,
-            data.get('page_number'),
-            data.get('text_box_id')
-        )
-        
-        session['modifications'].append({
-            'type': 'text_delete',
-            'timestamp': datetime.now().isoformat(),
-            'data': data
-        })
-        
-        # Save updated session
-        session_manager.save(session_id, session)
+        with session_manager.lock(session_id):
+            session = session_manager.load(session_id)
+            
+            result = text_editor.delete_text(
+                session['filepath'],
+                session_id,
+                data.get('page_number'),
+                data.get('text_box_id')
+            )
+            
+            session['modifications'].append({
+                'type': 'text_delete',
+                'timestamp': datetime.now().isoformat(),
+                'data': data
+            })
+            
+            # Save updated session
+            session_manager.save(session_id, session)
         
         return jsonify(result)
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/convert/<direction>', methods=['POST'])
+def convert_text(direction):
+    """
+    Convert plain text between Bijoy and Unicode
+    
+    direction is 'bijoy-to-unicode' or 'unicode-to-bijoy'. The text is an
+    uploaded .txt file ('file') or the request body. It is split at
+    whitespace boundaries, large texts are converted by a worker pool, and
+    the result is streamed back as UTF-8 text in the original order.
+    """
+    if direction not in DIRECTIONS:
+        return jsonify({'error': f'Unknown conversion: {direction}'}), 404
+    
+    try:
+        if 'file' in request.files:
+            file = request.files['file']
+            if not file.filename.lower().endswith('.txt'):
+                return jsonify({'error': 'Only .txt files are allowed'}), 400
+            data = file.read()
+        else:
+            data = request.get_data()
+        
+        try:
+            text = decode_input(data, direction)
+        except UnicodeDecodeError:
+            return jsonify({'error': 'Text must be UTF-8 encoded'}), 400
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+    
+    workers = 1
+    if len(text) >= app.config.get('PARALLEL_CONVERT_MIN_CHARS', 256 * 1024):
+        workers = app.config.get('CONVERT_WORKERS', 1)
+    chunks = iter_converted(text, direction, workers,
+                            app.config.get('CONVERT_CHUNK_CHARS', 64 * 1024))
+    logger.info(f"Converting {len(text)} characters ({direction}, {workers} workers)")
+    
+    return Response(stream_with_context(chunks), mimetype='text/plain; charset=utf-8')
+
 @app.route('/api/fonts/list', methods=['GET'])
 def list_fonts():
     """Get list of available fonts"""
@@ -398,28 +733,199 @@ def render_page():
         data = request.json
         session_id = data.get('session_id')
         page_number = data.get('page_number', 0)
-        zoom = data.get('zoom', 1.0)
+        zoom = zoom_value(data.get('zoom', 1.0))
         
         if not session_manager.exists(session_id):
             return jsonify({'error': 'Invalid session'}), 404
+        if zoom is None:
+            return jsonify({'error': 'Invalid zoom'}), 400
         
         session = session_manager.load(session_id)
+        if not isinstance(page_number, int) or not 0 <= page_number < len(session['pdf_data']['pages']):
+            return jsonify({'error': 'Invalid page number'}), 400
+        if page_pixels(session, page_number, zoom) > app.config.get('RENDER_MAX_PIXELS', 16 * 1024 * 1024):
+            return jsonify({'error': 'Page is too large at this zoom, load it as tiles'}), 400
+        png_data = page_png(session_id, session, page_number, zoom)
         
-        # Render page to image
-        image_data = pdf_processor.render_page(
-            session['filepath'],
-            page_number,
-            zoom
-        )
+        return jsonify({
+            'success': True,
+            'image_data': png_data_url(png_data)
+        })
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/page/<session_id>/<int:page_number>/image', methods=['GET'])
+def get_page_image(session_id, page_number):
+    """
+    Return a rendered page as PNG bytes
+    
+    The page's current version goes in the v query parameter (0 until the
+    page is edited; /api/text/edit returns the new one). A URL with the
+    current version never changes its content and is cached as immutable;
+    without it (or with an old one) the browser revalidates every time.
+    Both are answered with 304 when If-None-Match has the current ETag.
+    Pages larger than RENDER_MAX_PIXELS at the zoom have to be loaded as
+    tiles.
+    """
+    try:
+        if not session_manager.exists(session_id):
+            return jsonify({'error': 'Invalid session'}), 404
+        
+        zoom = zoom_arg()
+        if zoom is None:
+            return jsonify({'error': 'Invalid zoom'}), 400
+        
+        session = session_manager.load(session_id)
+        if not 0 <= page_number < len(session['pdf_data']['pages']):
+            return jsonify({'error': 'Invalid page number'}), 404
+        if page_pixels(session, page_number, zoom) > app.config.get('RENDER_MAX_PIXELS', 16 * 1024 * 1024):
+            return jsonify({'error': 'Page is too large at this zoom, load it as tiles'}), 400
+        
+        version = page_version(session, page_number)
+        return page_image_response(
+            render_key(session_id, page_number, zoom, version), version,
+            lambda: page_png(session_id, session, page_number, zoom))
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/page/<session_id>/<int:page_number>/preview', methods=['GET'])
+def get_page_preview(session_id, page_number):
+    """
+    Return a low-resolution JPEG of a page
+    
+    The viewer shows it (scaled up) right away and replaces it when the
+    full image arrives. Previews are rendered at RENDER_PREVIEW_ZOOM for
+    every zoom level, so one cached preview per page version serves all
+    of them. Caching works like the page image.
+    """
+    try:
+        if not session_manager.exists(session_id):
+            return jsonify({'error': 'Invalid session'}), 404
+        
+        session = session_manager.load(session_id)
+        if not 0 <= page_number < len(session['pdf_data']['pages']):
+            return jsonify({'error': 'Invalid page number'}), 404
+        
+        zoom = app.config.get('RENDER_PREVIEW_ZOOM', 0.5)
+        version = page_version(session, page_number)
+        
+        def render():
+            jpeg_data = render_cache.get(session_id, page_number, zoom, version, image_format='jpg')
+            if jpeg_data is None:
+                jpeg_data = pdf_processor.render_page_preview(
+                    session['filepath'], page_number, zoom,
+                    app.config.get('RENDER_PREVIEW_QUALITY', 60))
+                render_cache.put(session_id, page_number, zoom, version, jpeg_data, image_format='jpg')
+            return jpeg_data
+        
+        return page_image_response(
+            render_key(session_id, page_number, zoom, version, image_format='jpg'), version,
+            render, 'image/jpeg')
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/page/<session_id>/<int:page_number>/tile/<int:column>/<int:row>', methods=['GET'])
+def get_page_tile(session_id, page_number, column, row):
+    """
+    Return one tile of a rendered page as PNG bytes
+    
+    At high zoom only the tiles in view are rendered: each is a
+    RENDER_TILE_SIZE square (column and row counted from the top left),
+    rasterized on its own and cached on its own, so memory per request
+    stays the same at any zoom. Caching works like the page image.
+    """
+    try:
+        if not session_manager.exists(session_id):
+            return jsonify({'error': 'Invalid session'}), 404
+        
+        zoom = zoom_arg()
+        if zoom is None:
+            return jsonify({'error': 'Invalid zoom'}), 400
+        
+        session = session_manager.load(session_id)
+        pages = session['pdf_data']['pages']
+        if not 0 <= page_number < len(pages):
+            return jsonify({'error': 'Invalid page number'}), 404
+        
+        tile_size = app.config.get('RENDER_TILE_SIZE', 512)
+        columns = math.ceil(pages[page_number]['width'] * zoom / tile_size)
+        rows = math.ceil(pages[page_number]['height'] * zoom / tile_size)
+        if column >= columns or row >= rows:
+            return jsonify({'error': 'Invalid tile'}), 404
+        
+        version = page_version(session, page_number)
+        tile = (column, row)
+        
+        def render():
+            png_data = render_cache.get(session_id, page_number, zoom, version, tile)
+            if png_data is None:
+                png_data = pdf_processor.render_tile_png(session['filepath'], page_number, zoom,
+                                                         column, row, tile_size)
+                render_cache.put(session_id, page_number, zoom, version, png_data, tile)
+            return png_data
+        
+        return page_image_response(
+            render_key(session_id, page_number, zoom, version, tile), version, render)
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/thumbnails/<session_id>', methods=['GET'])
+def get_thumbnails(session_id):
+    """
+    Return the thumbnail index of a document
+    
+    Thumbnails are packed into sprite sheets (/api/thumbnails/<session>/<n>);
+    the index lists each sheet and the position and size of every page in
+    it. Answers 202 while the sheets are still being rendered, and 500
+    with status 'failed' if rendering them failed.
+    """
+    try:
+        if not session_manager.exists(session_id):
+            return jsonify({'error': 'Invalid session'}), 404
+        
+        index = thumbnail_service.get_index(session_id)
+        if index is None:
+            # A failed build is reported, not restarted on every poll
+            error = thumbnail_service.failure(session_id)
+            if error is not None:
+                return jsonify({'success': False, 'status': 'failed', 'error': error}), 500
+            
+            # Sessions from before a restart have no build running
+            if not thumbnail_service.is_building(session_id):
+                thumbnail_service.start(session_id, session_manager.load(session_id)['filepath'])
+            return jsonify({'success': False, 'status': 'rendering'}), 202
         
         return jsonify({
             'success': True,
-            'image_data': image_data
+            'thumbnails': index
         })
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/thumbnails/<session_id>/<int:sheet_number>', methods=['GET'])
+def get_thumbnail_sheet(session_id, sheet_number):
+    """Return a thumbnail sprite sheet as WebP"""
+    try:
+        if not session_manager.exists(session_id):
+            return jsonify({'error': 'Invalid session'}), 404
+        
+        sheet_path = thumbnail_service.sheet_path(session_id, sheet_number)
+        if not os.path.exists(sheet_path):
+            return jsonify({'error': 'Thumbnail sheet not found'}), 404
+        
+        response = send_file(os.path.abspath(sheet_path), mimetype='image/webp', max_age=3600)
+        response.cache_control.private = True
+        response.cache_control.public = False
+        return response
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/save', methods=['POST'])
 def save_pdf():
     """Save edited PDF"""
@@ -452,8 +958,10 @@ def save_pdf():
             logger.info(f"PDF saved to: {abs_output_path}")
             
             # Store the absolute export path in session for download
-            session['export_path'] = abs_output_path
-            session_manager.save(session_id, session)
+            with session_manager.lock(session_id):
+                session = session_manager.load(session_id)
+                session['export_path'] = abs_output_path
+                session_manager.save(session_id, session)
             
         except Exception as e:
             logger.error(f"Error saving PDF: {e}", exc_info=True)
@@ -5,17 +5,21 @@ Handles persistent session storage using file-based approach
 
 import json
 import os
+import threading
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 import logging
 
+from utils.text_layer import storage_default, storage_object_hook
+
 logger = logging.getLogger(__name__)
 
 
 class SessionManager:
     """
     Manages user sessions with file-based persistence.
-    Sessions are stored as JSON files in the sessions folder.
+    Sessions are stored as JSON files in the sessions folder; page text
+    layers are written in their compact columnar form.
     """
     
     def __init__(self, session_folder='sessions'):
@@ -26,9 +30,30 @@ class SessionManager:
             session_folder (str): Directory to store session files
         """
         self.session_folder = session_folder
+        self._locks = {}
+        self._locks_lock = threading.Lock()
         os.makedirs(session_folder, exist_ok=True)
         logger.info(f"SessionManager initialized with folder: {session_folder}")
     
+    def lock(self, session_id: str) -> threading.RLock:
+        """
+        Get the lock of a session.
+        
+        Hold it around every load-modify-save of the session, so concurrent
+        requests (lazy page extraction, edits, the upload stream) do not
+        overwrite each other's changes.
+        
+        Args:
+            session_id (str): Unique session identifier
+            
+        Returns:
+            threading.RLock: The session's lock (one per session)
+        """
+        with self._locks_lock:
+            if session_id not in self._locks:
+                self._locks[session_id] = threading.RLock()
+            return self._locks[session_id]
+    
     def _get_filepath(self, session_id: str) -> str:
         """Get file path for a session ID"""
         return os.path.join(self.session_folder, f'{session_id}.json')
@@ -53,7 +78,7 @@ class SessionManager:
             
             # Write to file
             with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+                json.dump(data, f, indent=2, ensure_ascii=False, default=storage_default)
             
             logger.info(f"Session saved: {session_id}")
             return True
@@ -80,7 +105,7 @@ class SessionManager:
                 return None
             
             with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+                data = json.load(f, object_hook=storage_object_hook)
             
             logger.info(f"Session loaded: {session_id}")
             return data
@@ -131,6 +156,9 @@ class SessionManager:
         try:
             filepath = self._get_filepath(session_id)
             
+            with self._locks_lock:
+                self._locks.pop(session_id, None)
+            
             if os.path.exists(filepath):
                 os.remove(filepath)
                 logger.info(f"Session deleted: {session_id}")
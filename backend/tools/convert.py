@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Batch Converter
+Converts directory trees of .txt files and PDF text layers between Bijoy and Unicode
+
+Usage (from the project root):
+
+    python -m backend.tools.convert bijoy-to-unicode archive/ converted/
+
+Every .txt file under the source directory is converted to a file of the
+same relative path under the destination (UTF-8; Bijoy output can be
+written as ANSI with --ansi). The text layer of every PDF is extracted,
+converted word by word and written next to it as <name>.pdf.txt, one line
+of text per line and pages separated by form feeds.
+
+Files are converted by a process pool. Each finished file is appended to
+a JSONL manifest in the destination; a second run skips files the manifest
+lists as done with the same size and modification time, so an interrupted
+run picks up where it stopped.
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import fitz  # PyMuPDF
+
+from backend.utils.bijoy_codec import unicode_to_bijoy
+from backend.utils.bijoy_unicode_converter import convert_batch
+from backend.utils.page_extractor import extract_page, merge_font_table
+from backend.utils.script_classifier import has_bengali
+from backend.utils.text_conversion import (BIJOY_TO_UNICODE, DIRECTIONS, UNICODE_TO_BIJOY,
+                                           decode_input, iter_converted)
+
+MANIFEST_NAME = 'convert-manifest.jsonl'
+FILE_TYPES = ('.txt', '.pdf')
+
+
+def output_path(relpath):
+    """Relative output path of a source file"""
+    if relpath.lower().endswith('.pdf'):
+        return relpath + '.txt'
+    return relpath
+
+
+def find_files(source, file_types=FILE_TYPES):
+    """Yield (relative path, size, mtime_ns) of the files to convert, sorted"""
+    for root, dirs, files in os.walk(source):
+        dirs.sort()
+        for name in sorted(files):
+            if not name.lower().endswith(file_types):
+                continue
+            path = os.path.join(root, name)
+            stat = os.stat(path)
+            yield os.path.relpath(path, source), stat.st_size, stat.st_mtime_ns
+
+
+def load_manifest(path):
+    """
+    Read a manifest written by an earlier run.
+
+    Returns:
+        dict: Relative path -> last entry for that file. A line cut off
+        by an interrupted run is ignored.
+    """
+    entries = {}
+    if not os.path.exists(path):
+        return entries
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            entries[entry['path']] = entry
+    return entries
+
+
+def is_done(entry, size, mtime_ns, direction):
+    """Check if a manifest entry covers the current version of a file"""
+    return (entry is not None and entry.get('status') == 'done'
+            and entry.get('size') == size and entry.get('mtime_ns') == mtime_ns
+            and entry.get('direction') == direction)
+
+
+def convert_text_file(source_path, direction):
+    """Convert a .txt file, returning the converted text"""
+    with open(source_path, 'rb') as f:
+        text = decode_input(f.read(), direction)
+    return ''.join(iter_converted(text, direction))
+
+
+def convert_pdf_file(source_path, direction):
+    """
+    Convert the text layer of a PDF, returning it as plain text.
+
+    Bijoy to Unicode converts the words whose font the document's font
+    table labels Bijoy (like uploads do); Unicode to Bijoy converts the
+    words that contain Bengali.
+    """
+    doc = fitz.open(source_path)
+    try:
+        font_table = {}
+        font_labels = {}
+        pages = []
+        for page_num in range(doc.page_count):
+            page = extract_page(doc[page_num], page_num, font_labels)
+            merge_font_table(font_table, page['font_table'])
+            layer = page['text_blocks']
+            if direction == BIJOY_TO_UNICODE:
+                font_names = [layer.fonts[font_id] for font_id in layer.font_ids]
+                texts = convert_batch(layer.texts, font_names, font_table)[0]
+            else:
+                texts = [unicode_to_bijoy(text) if has_bengali(text) else text
+                         for text in layer.texts]
+            pages.append(_page_lines(layer, texts))
+        return '\f'.join(pages)
+    finally:
+        doc.close()
+
+
+def _page_lines(layer, texts):
+    """Join the words of a page into lines (words of one text line per line)"""
+    lines = []
+    words = []
+    current = None
+    for i, text in enumerate(texts):
+        key = (layer.block_nos[i], layer.line_nos[i])
+        if key != current and words:
+            lines.append(' '.join(words))
+            words = []
+        current = key
+        words.append(text)
+    if words:
+        lines.append(' '.join(words))
+    return '\n'.join(lines) + '\n' if lines else ''
+
+
+def convert_file(source, destination, relpath, direction, ansi=False):
+    """
+    Convert one file; runs inside worker processes.
+
+    The output is written to a temporary name and renamed into place, so
+    an interrupted run never leaves a partial file behind.
+
+    Returns:
+        tuple: (relpath, error message or None, output characters)
+    """
+    source_path = os.path.join(source, relpath)
+    target_path = os.path.join(destination, output_path(relpath))
+    try:
+        if relpath.lower().endswith('.pdf'):
+            text = convert_pdf_file(source_path, direction)
+        else:
+            text = convert_text_file(source_path, direction)
+
+        os.makedirs(os.path.dirname(target_path), exist_ok=True)
+        encoding = 'cp1252' if ansi and direction == UNICODE_TO_BIJOY else 'utf-8'
+        partial_path = target_path + '.part'
+        with open(partial_path, 'w', encoding=encoding, errors='replace', newline='') as f:
+            f.write(text)
+        os.replace(partial_path, target_path)
+        return relpath, None, len(text)
+    except Exception as e:
+        return relpath, f"{type(e).__name__}: {e}", 0
+
+
+class Progress:
+    """Progress line on stderr (rewritten in place on a terminal)"""
+
+    def __init__(self, total, stream=sys.stderr):
+        self.total = total
+        self.stream = stream
+        self.done = 0
+        self.failed = 0
+        self.started = time.monotonic()
+        self.interactive = stream.isatty()
+        self._last_report = 0.0
+
+    def update(self, relpath, error=None):
+        self.done += 1
+        if error:
+            self.failed += 1
+            self.message(f"error: {relpath}: {error}")
+
+        now = time.monotonic()
+        # Once a second (every file on a terminal), and always at the end
+        if not self.interactive and now - self._last_report < 1.0 and self.done < self.total:
+            return
+        self._last_report = now
+        elapsed = now - self.started
+        rate = self.done / elapsed if elapsed else 0.0
+        remaining = (self.total - self.done) / rate if rate else 0.0
+        self._status(f"[{self.done}/{self.total}] {self.failed} failed, "
+                     f"{rate:.1f} files/s, {remaining:.0f}s left")
+
+    def finish(self):
+        if self.interactive:
+            self.stream.write('\n')
+        self.stream.flush()
+
+    def message(self, text):
+        """Print a line above the progress line"""
+        self.stream.write(('\r\033[K' if self.interactive else '') + text + '\n')
+        self.stream.flush()
+
+    def _status(self, text):
+        if self.interactive:
+            self.stream.write('\r\033[K' + text)
+        else:
+            self.stream.write(text + '\n')
+        self.stream.flush()
+
+
+def run(source, destination, direction, workers=1, manifest_path=None,
+        file_types=FILE_TYPES, ansi=False, force=False):
+    """
+    Convert a directory tree.
+
+    Returns:
+        tuple: (converted, failed, skipped) file counts
+    """
+    manifest_path = manifest_path or os.path.join(destination, MANIFEST_NAME)
+    os.makedirs(destination, exist_ok=True)
+    manifest = {} if force else load_manifest(manifest_path)
+
+    pending = []
+    skipped = 0
+    for relpath, size, mtime_ns in find_files(source, file_types):
+        if is_done(manifest.get(relpath), size, mtime_ns, direction):
+            skipped += 1
+        else:
+            pending.append((relpath, size, mtime_ns))
+    sizes = {relpath: (size, mtime_ns) for relpath, size, mtime_ns in pending}
+
+    progress = Progress(len(pending))
+    if skipped:
+        progress.message(f"Skipping {skipped} files already converted (see {manifest_path})")
+
+    with open(manifest_path, 'a', encoding='utf-8') as manifest_file:
+        def record(relpath, error, chars):
+            size, mtime_ns = sizes[relpath]
+            entry = {'path': relpath, 'output': output_path(relpath), 'direction': direction,
+                     'size': size, 'mtime_ns': mtime_ns,
+                     'status': 'error' if error else 'done', 'chars': chars}
+            if error:
+                entry['error'] = error
+            manifest_file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            manifest_file.flush()
+            progress.update(relpath, error)
+
+        if workers <= 1:
+            for relpath, _, _ in pending:
+                record(*convert_file(source, destination, relpath, direction, ansi))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(convert_file, source, destination, relpath, direction, ansi)
+                           for relpath, _, _ in pending]
+                try:
+                    for future in as_completed(futures):
+                        record(*future.result())
+                except KeyboardInterrupt:
+                    executor.shutdown(cancel_futures=True)
+                    raise
+
+    progress.finish()
+    return progress.done - progress.failed, progress.failed, skipped
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m backend.tools.convert',
+        description='Convert .txt files and PDF text layers between Bijoy and Unicode.')
+    parser.add_argument('direction', choices=sorted(DIRECTIONS))
+    parser.add_argument('source', help='directory to convert')
+    parser.add_argument('destination', help='directory for the converted files')
+    parser.add_argument('-j', '--workers', type=int, default=os.cpu_count() or 1,
+                        help='worker processes (default: number of CPUs)')
+    parser.add_argument('--only', choices=('txt', 'pdf'),
+                        help='convert only .txt files or only PDFs')
+    parser.add_argument('--manifest',
+                        help=f'manifest file (default: DESTINATION/{MANIFEST_NAME})')
+    parser.add_argument('--ansi', action='store_true',
+                        help='write Bijoy output as ANSI (Windows-1252) instead of UTF-8')
+    parser.add_argument('--force', action='store_true',
+                        help='convert all files, ignoring the manifest')
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.source):
+        parser.error(f"not a directory: {args.source}")
+
+    logging.basicConfig(level=logging.WARNING, format='%(levelname)s: %(message)s')
+    file_types = ('.' + args.only,) if args.only else FILE_TYPES
+
+    try:
+        converted, failed, skipped = run(args.source, args.destination, args.direction,
+                                         args.workers, args.manifest, file_types,
+                                         args.ansi, args.force)
+    except KeyboardInterrupt:
+        print("\nInterrupted; run the same command again to resume", file=sys.stderr)
+        return 130
+
+    print(f"{converted} converted, {failed} failed, {skipped} already done", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
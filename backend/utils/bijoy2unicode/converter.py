@@ -1,3 +1,5 @@
+import re
+
 from . import util
 
 preConversionMap = {
@@ -240,6 +242,427 @@ postConversionMap = {
     '্‌্‌': '্‌'
 }
 
+# Unicode to Bijoy, replaced longest key first by unicodeToBijoyEngine
+unicodeToBijoyMap = {
+    "।"   :   "|", 	"‘"   :   "Ô", 	"’"   :   "Õ", 
+    "“"   :   "Ò", 	"”"   :   "Ó", 	"্র্য"   :   "ª¨", 
+    "ম্প্র"   :   "¤cÖ", 	"র‌্য"   :   "i¨", 	"ক্ষ্ম"   :   "²", 
+    "ক্ক"   :   "°", 	"ক্ট"   :   "±", 	"ক্ত"   :   "³", 
+    "ক্ব"   :   "K¡", 	"স্ক্র"   :   "¯Œ", 	"ক্র"   :   "µ", 
+    "ক্ল"   :   "K¬", 	"ক্ষ"   :   "¶", 	"ক্স"   :   "·", 
+    "গু"   :   "¸", 	"গ্ধ"   :   "»", 	"গ্ন"   :   "Mœ", 
+    "গ্ম"   :   "M¥", 	"গ্ল"   :   "M­", 	"গ্রু"   :   "Mªy", 
+    "ঙ্ক"   :   "¼", 	"ঙ্ক্ষ"   :   "•¶", 	"ঙ্খ"   :   "•L", 
+    "ঙ্গ"   :   "½", 	"ঙ্ঘ"   :   "•N", 	"চ্ছ্ব"   :   "”Q¡", 
+    "চ্চ"   :   "”P", 	"চ্ছ"   :   "”Q", 	"চ্ঞ"   :   "”T", 
+    "জ্জ্ব"   :   "¾¡", 	"জ্জ"   :   "¾", 	"জ্ঝ"   :   "À", 
+    "জ্ঞ"   :   "Á", 	"জ্ব"   :   "R¡", 	"ঞ্চ"   :   "Â", 
+    "ঞ্ছ"   :   "Ã", 	"ঞ্জ"   :   "Ä", 	"ঞ্ঝ"   :   "Å", 
+    "ট্ট"   :   "Æ", 	"ট্ব"   :   "U¡", 	"ট্ম"   :   "U¥", 
+    "ড্ড"   :   "Ç", 	"ণ্ট"   :   "È", 	"ণ্ঠ"   :   "É", 
+    "ন্স"   :   "Ý", 	"ণ্ড"   :   "Ê", 	"ন্তু"   :   "š‘", 
+    "ণ্ব"   :   "Y^", 	"ত্ত্ব"   :   "Ë¡", 	"ত্ত"   :   "Ë", 
+    "ত্থ"   :   "Ì", 	"ত্ন"   :   "Zœ", 	"ত্ম"   :   "Z¥", 
+    "ন্ত্ব"   :   "š—¡", 	"ত্ব"   :   "Z¡", 	"থ্ব"   :   "_¡", 
+    "দ্গ"   :   "˜M", 	"দ্ঘ"   :   "˜N", 	"দ্দ"   :   "Ï", 
+    "দ্ধ"   :   "×", 	"দ্ব"   :   "Ø", 
+    "দ্ভ"   :   "™¢", 	"দ্ম"   :   "Ù", 	"দ্রু"   :   "`ª“", 
+    "ধ্ব"   :   "aŸ", 	"ধ্ম"   :   "a¥", 	"ন্ট"   :   "›U", 
+    "ন্ঠ"   :   "Ú", 	"ন্ড"   :   "Û", 	"ন্ত্র"   :   "š¿", 
+    "ন্ত"   :   "š—", 	"স্ত্র"   :   "¯¿", 	"ত্র"   :   "Î", 
+    "ন্থ"   :   "š’", 	"ন্দ"   :   "›`", 	"ন্দ্ব"   :   "›Ø", 
+    "ন্ধ"   :   "Ü", 	"ন্ন"   :   "bœ", 	"ন্ব"   :   "š^", 
+    "ন্ম"   :   "b¥", 	"প্ট"   :   "Þ", 	"প্ত"   :   "ß", 
+    "প্ন"   :   "cœ", 	"প্প"   :   "à", 	"প্ল"   :   "c­", 
+    "প্স"   :   "á", 	"ফ্ল"   :   "d¬", 	"ব্জ"   :   "â", 
+    "ব্দ"   :   "ã", 	"ব্ধ"   :   "ä", 	"ব্ব"   :   "eŸ", 
+    "ব্ল"   :   "e­", 	"ভ্র"   :   "å", 	"ম্ন"   :   "gœ", 
+    "ম্প"   :   "¤ú", 	"ম্ফ"   :   "ç", 	"ম্ব"   :   "¤^", 
+    "ম্ভ"   :   "¤¢", 	"ম্ভ্র"   :   "¤£", 	"ম্ম"   :   "¤§", 
+    "ম্ল"   :   "¤­", 	"্র"   :   "ª", 	"রু"   :   "i“", 
+    "রূ"   :   "iƒ", 	"ল্ক"   :   "é", 	"ল্গ"   :   "ê", 
+    "ল্ট"   :   "ë", 	"ল্ড"   :   "ì", 	"ল্প"   :   "í", 
+    "ল্ফ"   :   "î", 	"ল্ব"   :   "j¦", 	"ল্ম"   :   "j¥", 
+    "ল্ল"   :   "j­", 	"শু"   :   "ï", 	"শ্চ"   :   "ð", 
+    "শ্ন"   :   "kœ", 	"শ্ব"   :   "k¦", 	"শ্ম"   :   "k¥", 
+    "শ্ল"   :   "k­", 	"ষ্ক"   :   "®‹", 	"ষ্ক্র"   :   "®Œ", 
+    "ষ্ট"   :   "ó", 	"ষ্ঠ"   :   "ô", 	"ষ্ণ"   :   "ò", 
+    "ষ্প"   :   "®ú", 	"ষ্ফ"   :   "õ", 	"ষ্ম"   :   "®§", 
+    "স্ক"   :   "¯‹", 	"স্ট"   :   "÷", 	"স্খ"   :   "ö", 
+    "স্ত"   :   "¯—", 	"স্তু"   :   "¯‘", 	"স্থ"   :   "¯’", 
+    "স্ন"   :   "mœ", 	"স্প"   :   "¯ú", 	"স্ফ"   :   "ù", 
+    "স্ব"   :   "¯^", 	"স্ম"   :   "¯§", 	"স্ল"   :   "¯­", 
+    "হু"   :   "û", 	"হ্ণ"   :   "nè", 	"হ্ব"   :   "nŸ", 
+    "হ্ন"   :   "ý", 	"হ্ম"   :   "þ", 	"হ্ল"   :   "n¬", 
+    "হৃ"   :   "ü", 	"র্"   :   "©",
+    "্য"   :   "¨", 	"্"   :   "&", 	"আ"   :   "Av", 
+    "অ"   :   "A", 	"ই"   :   "B", 	"ঈ"   :   "C", 
+    "উ"   :   "D", 	"ঊ"   :   "E", 	"ঋ"   :   "F", 
+    "এ"   :   "G", 	"ঐ"   :   "H", 	"ও"   :   "I", 
+    "ঔ"   :   "J", 	"ক"   :   "K", 	"খ"   :   "L", 
+    "গ"   :   "M", 	"ঘ"   :   "N", 	"ঙ"   :   "O", 
+    "চ"   :   "P", 	"ছ"   :   "Q", 	"জ"   :   "R", 
+    "ঝ"   :   "S", 	"ঞ"   :   "T", 	"ট"   :   "U", 
+    "ঠ"   :   "V", 	"ড"   :   "W", 	"ঢ"   :   "X", 
+    "ণ"   :   "Y", 	"ত"   :   "Z", 	"থ"   :   "_", 
+    "দ"   :   "`", 	"ধ"   :   "a", 	"ন"   :   "b", 
+    "প"   :   "c", 	"ফ"   :   "d", 	"ব"   :   "e", 
+    "ভ"   :   "f", 	"ম"   :   "g", 	"য"   :   "h", 
+    "র"   :   "i", 	"ল"   :   "j", 	"শ"   :   "k", 
+    "ষ"   :   "l", 	"স"   :   "m", 	"হ"   :   "n", 
+    "ড়"   :   "o", 	"ঢ়"   :   "p", 	"য়"   :   "q", 
+    "ৎ"   :   "r", 	"০"   :   "0", 	"১"   :   "1", 
+    "২"   :   "2", 	"৩"   :   "3", 	"৪"   :   "4", 
+    "৫"   :   "5", 	"৬"   :   "6", 	"৭"   :   "7", 
+    "৮"   :   "8", 	"৯"   :   "9", 	"া"   :   "v", 
+    "ি"   :   "w", 	"ী"   :   "x", 	"ু"   :   "y", 
+    "ূ"   :   "~", 	"ৃ"   :   "…", 	"ে"   :   "‡", 
+    "ৈ"   :   "‰", 	"ৗ"   :   "Š", 	"ং"   :   "s", 
+    "ঃ"   :   "t", 	"ঁ"   :   "u",
+    # Decomposed forms (consonant + nukta) of ড়, ঢ় and য়
+    "\u09a1\u09bc"   :   "o", 	"\u09a2\u09bc"   :   "p", 	"\u09af\u09bc"   :   "q"
+}
+
+# The maps compiled once into single-pass engines (see util.compile_char_map)
+preConversionEngine = util.compile_char_map(tuple(preConversionMap.items()))
+conversionEngine = util.compile_char_map(tuple(conversionMap.items()))
+proConversionEngine = util.compile_char_map(tuple(proConversionMap.items()))
+postConversionEngine = util.compile_char_map(tuple(postConversionMap.items()))
+unicodeToBijoyEngine = util.compile_longest_match(unicodeToBijoyMap.items())
+
+
+# Character classes of the reordering passes. 'ড়', 'ঢ়' and 'য়' are written
+# decomposed (two code points) exactly as in the original comparisons, so
+# like there they never match a single character.
+PRE_KARS = frozenset(['ি', 'ৈ', 'ে'])
+POST_KARS = frozenset(['া', 'ো', 'ৌ', 'ৗ', 'ু', 'ূ', 'ী', 'ৃ'])
+KARS = PRE_KARS | POST_KARS
+BANJONBORNO = frozenset([
+    'ক', 'খ', 'গ', 'ঘ', 'ঙ', 'চ', 'ছ', 'জ', 'ঝ', 'ঞ', 'ট', 'ঠ', 'ড', 'ঢ', 'ণ', 'ত',
+    'থ', 'দ', 'ধ', 'ন', 'প', 'ফ', 'ব', 'ভ', 'ম', 'য', 'র', 'ল', 'শ', 'ষ', 'স', 'হ',
+    'ড়', 'ঢ়', 'য়', 'ৎ', 'ং', 'ঃ', 'ঁ'
+])
+SOROBORNO = frozenset(['অ', 'আ', 'ই', 'ঈ', 'উ', 'ঊ', 'ঋ', 'ঌ', 'এ', 'ঐ', 'ও', 'ঔ'])
+NUKTA = 'ঁ'
+HALANT = '্'
+RA = 'র'
+SPACES = frozenset([' ', '\t', '\n', '\r'])
+
+# Where a reordering pass can change anything. The passes search the
+# still untouched rest of the text for these and skip everything in
+# between. The lookbehinds are only used where the preceding character is
+# untouched as well.
+_REF_TRIGGERS = re.compile('(?<=%s)%s(?=%s)' % (HALANT, RA, HALANT))
+_KAR_TRIGGERS = re.compile('%s(?=%s)|[%s]' % (RA, HALANT, ''.join(sorted(PRE_KARS | {HALANT, NUKTA}))))
+_KAR_TRIGGER_CHARS = frozenset([RA, HALANT, NUKTA]) | PRE_KARS
+_AFTER_HALANT_TRIGGERS = KARS | {NUKTA, RA}
+_ASCII_TRIGGERS = re.compile('[%s]|(?<=%s)%s' % (''.join(sorted(PRE_KARS)), RA, HALANT))
+
+
+def _char_at(buf, k):
+    """util.mbCharAt() on a list: negative indexes wrap, out of range is None"""
+    try:
+        return buf[k]
+    except IndexError:
+        return None
+
+
+def _ref_cluster_length(at, i):
+    """
+    How far the reph (র্) at i moves left: back over consonant+halant
+    pairs, or over a single kar. May overshoot to i - j == -1, which the
+    callers replicate with the original string slicing.
+    """
+    j = 1
+    while i - j >= 0:
+        if at(i - j) in BANJONBORNO and at(i - j - 1) == HALANT:
+            j += 2
+        elif j == 1 and at(i - j) in KARS:
+            j += 1
+        else:
+            break
+    return j
+
+
+def _move_refs(text):
+    """
+    First pass of reArrangeUnicodeConvertedText: 'র্' that follows a
+    halant moves in front of the consonant cluster it belongs to.
+
+    The text is rearranged in place in a list. A move only permutes the
+    characters of one cluster, and positions after `clean` are still
+    untouched, so the scan jumps from one 'র্' of the source string to
+    the next and the pass is linear in the text length.
+    """
+    buf = list(text)
+    n = len(buf)
+    clean = 0
+    i = 0
+    while i < n:
+        if i > clean:
+            match = _REF_TRIGGERS.search(text, i)
+            if match is None:
+                break
+            i = match.start()
+        if i < n - 1 and buf[i] == RA and buf[i + 1] == HALANT and buf[i - 1] == HALANT:
+            j = _ref_cluster_length(lambda k: _char_at(buf, k), i)
+            if i - j < 0:
+                # The cluster scan wrapped around to the end of the text;
+                # replicate the original slicing exactly
+                text = ''.join(buf)
+                text = text[:i - j] + text[i] + text[i + 1] + text[i - j:i] + text[i + 2:]
+                buf = list(text)
+                n = len(buf)
+                clean = 0
+            else:
+                buf[i - j:i + 2] = [buf[i], buf[i + 1]] + buf[i - j:i]
+                clean = max(clean, i + 2)
+        i += 1
+    return ''.join(buf)
+
+
+def _move_kars(text):
+    """
+    Second pass of reArrangeUnicodeConvertedText: refs before kars,
+    halant and kar order, pre-kars after their consonant cluster
+    (merging 'ে' + 'া'/'ৗ' into 'ো'/'ৌ') and nukta after post-kars.
+
+    Merging shortens the text, so it is kept as a gap buffer: `left`
+    holds everything before the current position, `ahead` the few
+    characters after it that were already moved (in reverse), and
+    text[p:] the untouched rest. Edits only touch characters next to the
+    gap, and untouched stretches without a trigger are copied at once.
+    """
+    left = []
+    ahead = []
+    p = 0
+
+    def at(k):
+        # util.mbCharAt() semantics on the buffer
+        nl = len(left)
+        if k < 0:
+            k += nl + len(ahead) + len(text) - p
+            if k < 0:
+                return None
+        if k < nl:
+            return left[k]
+        k -= nl
+        if k < len(ahead):
+            return ahead[-1 - k]
+        k += p - len(ahead)
+        return text[k] if k < len(text) else None
+
+    while True:
+        if not ahead:
+            match = _KAR_TRIGGERS.search(text, p)
+            if match is None:
+                left += text[p:]
+                break
+            left += text[p:match.start()]
+            p = match.start()
+            if text[p] == HALANT and left and left[-1] not in _AFTER_HALANT_TRIGGERS:
+                # A halant only matters after a kar, nukta or 'র'
+                left.append(HALANT)
+                p += 1
+                continue
+        elif ahead[-1] not in _KAR_TRIGGER_CHARS or (
+                ahead[-1] == HALANT and left and left[-1] not in _AFTER_HALANT_TRIGGERS):
+            left.append(ahead.pop())
+            continue
+
+        # Move the characters the rules below look at into `ahead`
+        if len(ahead) < 3:
+            chunk = text[p:p + 3 - len(ahead)]
+            ahead[:0] = reversed(chunk)
+            p += len(chunk)
+
+        i = len(left)
+        n = i + len(ahead) + len(text) - p
+
+        #  Change refs
+        if i < n - 1 and ahead[-1] == RA and ahead[-2] == HALANT and at(i - 1) != HALANT and at(i + 2) == HALANT:
+            j = _ref_cluster_length(at, i)
+            if i - j < 0:
+                # Wrapped around to the end of the text; replicate the
+                # original slicing and continue at i + 1
+                s = ''.join(left) + ''.join(reversed(ahead)) + text[p:]
+                text = s[:i - j] + s[i] + s[i + 1] + s[i - j:i] + s[i + 2:]
+                left = list(text[:i + 1])
+                ahead = []
+                p = i + 1
+                continue
+            cluster = left[i - j:]
+            del left[i - j:]
+            left.append(ahead.pop())
+            left.append(ahead.pop())
+            left += cluster
+            ahead.append(left.pop())
+            continue
+
+        #  for 'Vowel + HALANT + Consonant' it should be 'HALANT + Consonant + Vowel'
+        if i > 0 and i < n - 1 and ahead[-1] == HALANT and (left[-1] in KARS or left[-1] == NUKTA):
+            vowel = left.pop()
+            left.append(ahead.pop())
+            consonant = ahead.pop()
+            ahead.append(vowel)
+            ahead.append(consonant)
+
+        #  for 'RA + HALANT + Vowel' it should be 'Vowel + RA + HALANT'
+        if i > 0 and i < n - 1 and ahead[-1] == HALANT and left[-1] == RA and at(i - 2) != HALANT and ahead[-2] in KARS:
+            ra = left.pop()
+            halant = ahead.pop()
+            left.append(ahead.pop())
+            ahead.append(halant)
+            ahead.append(ra)
+
+        #  Change pre-kar to post format suitable for unicode
+        if i < n - 1 and ahead[-1] in PRE_KARS and ahead[-2] not in SPACES:
+            j = 1
+            while i + j < n - 1 and at(i + j) in BANJONBORNO:
+                if at(i + j + 1) == HALANT:
+                    j += 2
+                else:
+                    break
+
+            if len(ahead) < j + 2:
+                chunk = text[p:p + j + 2 - len(ahead)]
+                ahead[:0] = reversed(chunk)
+                p += len(chunk)
+            kar = ahead.pop()
+            cluster = [ahead.pop() for _ in range(min(j, len(ahead)))]
+            following = ahead[-1] if ahead else None
+            if kar == 'ে' and following == 'া':
+                ahead[-1] = 'ো'
+            elif kar == 'ে' and following == 'ৗ':
+                ahead[-1] = 'ৌ'
+            else:
+                ahead.append(kar)
+            left += cluster
+            i += j
+            n = len(left) + len(ahead) + len(text) - p
+
+        #  nukta should be placed after kars
+        if i < n - 1 and at(i) == NUKTA and at(i + 1) in POST_KARS:
+            if len(ahead) < 2:
+                chunk = text[p:p + 2 - len(ahead)]
+                ahead[:0] = reversed(chunk)
+                p += len(chunk)
+            ahead[-1], ahead[-2] = ahead[-2], ahead[-1]
+
+        if ahead:
+            left.append(ahead.pop())
+        elif p < len(text):
+            left.append(text[p])
+            p += 1
+        else:
+            break
+
+    return ''.join(left)
+
+
+def _move_kars_for_ascii(text):
+    """
+    Reordering before Unicode to Bijoy conversion: pre-kars move in front
+    of their consonant cluster and 'র্' moves behind it, the order Bijoy
+    text is typed in. Every move permutes a few characters of one list
+    and the scan jumps between triggers like _move_refs(), so the pass
+    is linear.
+
+    The original loop never terminates when the text starts with a
+    pre-kar: there is nothing to move it in front of, and it keeps
+    "moving" in place. Such a pre-kar (like one right after another
+    pre-kar, which it would keep swapping places with) is left where it
+    is.
+    """
+    buf = list(text)
+    n = len(buf)
+    at = lambda k: _char_at(buf, k)
+    clean = 0
+    cY = 0
+    i = 0
+    while i < n:
+        if i > clean:
+            match = _ASCII_TRIGGERS.search(text, i)
+            if match is None:
+                break
+            i = match.start()
+
+        c = buf[i]
+        if c in PRE_KARS:
+            if i == 0 or buf[i - 1] in PRE_KARS:
+                i += 1
+                continue
+            j = 1
+            while at(i - j) in BANJONBORNO:
+                if i - j < 0 or i - j <= cY:
+                    break
+                if at(i - j - 1) == HALANT:
+                    j += 2
+                else:
+                    break
+            if i - j < 0:
+                # Replicate the original slicing of a wrapped index
+                text = ''.join(buf)
+                text = text[:i - j] + text[i] + text[i - j:i] + text[i + 1:]
+                buf = list(text)
+                n = len(buf)
+                clean = 0
+            else:
+                buf[i - j:i + 1] = [c] + buf[i - j:i]
+                clean = max(clean, i + 1)
+            cY = i + 1
+            continue
+
+        if c == HALANT and i < n - 1 and buf[i - 1] == RA and buf[i - 2] != HALANT:
+            # 'র্' moves behind the next character, and then keeps moving
+            # one character at a time for as long as the rule applies
+            # again (in the original loop to the end of the text, unless
+            # a halant or a consonant cluster stops it). Do such a run of
+            # single steps in one go. (At i == 0 the 'র' is the last
+            # character of the text, handled by the general case below.)
+            k = 0
+            while i and i + k < n - 1:
+                x = buf[i + k + 1]
+                if x in BANJONBORNO and i + k + 2 < n and (buf[i + k + 2] == HALANT or buf[i + k + 2] in PRE_KARS):
+                    break
+                k += 1
+                if x == HALANT:
+                    break
+            if k:
+                buf[i - 1:i + k + 1] = buf[i + 1:i + k + 1] + [RA, HALANT]
+                i += k
+                cY = i + 1
+                clean = max(clean, i + 1)
+                continue
+
+            j = 1
+            aZ = 0
+            while at(i + j) in BANJONBORNO:
+                if at(i + j + 1) == HALANT:
+                    j += 2
+                elif at(i + j + 1) in PRE_KARS:
+                    aZ = 1
+                    break
+                else:
+                    break
+            if i == 0:
+                # Replicate the original slicing of a wrapped index
+                text = ''.join(buf)
+                text = (text[:-1] + text[j + 1:j + aZ + 1] + text[1:j + 1]
+                        + text[-1] + text[0] + text[j + aZ + 1:])
+                buf = list(text)
+                n = len(buf)
+                clean = 0
+            else:
+                buf[i - 1:i + j + aZ + 1] = buf[i + j + 1:i + j + aZ + 1] + buf[i + 1:i + j + 1] + [RA, HALANT]
+                clean = max(clean, i + j + aZ + 1)
+            i += j + aZ
+            cY = i + 1
+            continue
+
+        i += 1
+    return ''.join(buf)
+
 
 class Unicode:
 
@@ -249,336 +672,63 @@ class Unicode:
         return False
 
     def IsBanglaPreKar(self, c):
-        if (c == 'ি' or c == 'ৈ' or c == 'ে'):
-            return True
-        return False
+        return c in PRE_KARS
 
     def IsBanglaPostKar(self, c):
-        if (c == 'া' or c == 'ো' or c == 'ৌ' or c == 'ৗ' or c == 'ু' or c == 'ূ' or c == 'ী' or c == 'ৃ'):
-            return True
-        return False
+        return c in POST_KARS
 
     def IsBanglaKar(self, c):
-        if (self.IsBanglaPreKar(c) or self.IsBanglaPostKar(c)):
-            return True
-        return False
+        return c in KARS
 
     def IsBanglaBanjonborno(self, c):
-        if (c == 'ক' or c == 'খ' or c == 'গ' or c == 'ঘ' or c == 'ঙ' or c == 'চ' or c == 'ছ' or c == 'জ' or c == 'ঝ' or c == 'ঞ' or c == 'ট' or c == 'ঠ' or c == 'ড' or c == 'ঢ' or c == 'ণ' or c == 'ত' or c == 'থ' or c == 'দ' or c == 'ধ' or c == 'ন' or c == 'প' or c == 'ফ' or c == 'ব' or c == 'ভ' or c == 'ম' or c == 'য' or c == 'র' or c == 'ল' or c == 'শ' or c == 'ষ' or c == 'স' or c == 'হ' or c == 'ড়' or c == 'ঢ়' or c == 'য়' or c == 'ৎ' or c == 'ং' or c == 'ঃ' or c == 'ঁ'):
-            return True
-        return False
+        return c in BANJONBORNO
 
     def IsBanglaSoroborno(self, c):
-        if (c == 'অ' or c == 'আ' or c == 'ই' or c == 'ঈ' or c == 'উ' or c == 'ঊ' or c == 'ঋ' or c == 'ঌ' or c == 'এ' or c == 'ঐ' or c == 'ও' or c == 'ঔ'):
-            return True
-        return False
+        return c in SOROBORNO
 
     def IsBanglaNukta(self, c):
-        if (c == 'ঁ'):
-            return True
-        return False
+        return c == NUKTA
 
     def IsBanglaHalant(self, c):
-        if (c == '্'):
-            return True
-        return False
+        return c == HALANT
 
     def IsSpace(self, c):
-        if (c == ' ' or c == '\t' or c == '\n' or c == '\r'):
-            return True
-        return False
+        return c in SPACES
 
     def reArrangeUnicodeConvertedText(self, str):
-
-        #mb_internal_encoding("UTF-8") # force multi-byte UTF-8 encoding
-
-        #global proConversionMap
-
-        #for (i = 0; i < mb_strlen(str); ++i) 
-        i = 0
-        while i < util.mb_strlen(str):
-            #  Change refs
-            if (i < (util.mb_strlen(str) - 1) and util.mbCharAt(str, i) == 'র' and self.IsBanglaHalant(util.mbCharAt(str, i + 1)) and self.IsBanglaHalant(util.mbCharAt(str, i - 1))):
-                j = 1
-                while (True):
-                    if (i - j < 0):
-                        break
-                    
-                    if (self.IsBanglaBanjonborno(util.mbCharAt(str, i - j)) and self.IsBanglaHalant(util.mbCharAt(str, i - j - 1))): 
-                        j += 2
-                    elif (j == 1 and self.IsBanglaKar(util.mbCharAt(str, i - j))):
-                        j += 1
-                    else:
-                        break
-                    
-                
-                temp = util.subString(str, 0, i - j)
-                temp += util.mbCharAt(str, i)
-                temp += util.mbCharAt(str, i + 1)
-                temp += util.subString(str, i - j, i)
-                temp += util.subString(str, i + 2, util.mb_strlen(str))
-                str = temp
-                i += 1
-                continue
-
-            i += 1
-
-        str = util.doCharMap(str, proConversionMap)
-
-        #for (i = 0 i < mb_strlen(str) ++i) 
-        i=0
-        while i<util.mb_strlen(str):
-            if (i < util.mb_strlen(str) - 1 and util.mbCharAt(str, i) == 'র' and self.IsBanglaHalant(util.mbCharAt(str, i + 1)) and not self.IsBanglaHalant(util.mbCharAt(str, i - 1)) and self.IsBanglaHalant(util.mbCharAt(str, i + 2))):
-                j = 1
-                while (True):
-                    if (i - j < 0):
-                        break
-                    
-                    if (self.IsBanglaBanjonborno(util.mbCharAt(str, i - j)) and self.IsBanglaHalant(util.mbCharAt(str, i - j - 1))):
-                        j += 2
-                    elif (j == 1 and self.IsBanglaKar(util.mbCharAt(str, i - j))):
-                        j += 1
-                    else:
-                        break
-                    
-                
-                temp = util.subString(str, 0, i - j)
-                temp += util.mbCharAt(str, i)
-                temp += util.mbCharAt(str, i + 1)
-                temp += util.subString(str, i - j, i)
-                temp += util.subString(str, i + 2, util.mb_strlen(str))
-                str = temp
-                i += 1
-                continue
-            
-
-            #  for 'Vowel + HALANT + Consonant' it should be 'HALANT + Consonant + Vowel'
-            if (i > 0 and util.mbCharAt(str, i) == '\u09CD' and (self.IsBanglaKar(util.mbCharAt(str, i - 1)) or self.IsBanglaNukta(util.mbCharAt(str, i - 1))) and i < util.mb_strlen(str) - 1):
-                temp = util.subString(str, 0, i - 1)
-                temp += util.mbCharAt(str, i)
-                temp += util.mbCharAt(str, i + 1)
-                temp += util.mbCharAt(str, i - 1)
-                temp += util.subString(str, i + 2, util.mb_strlen(str))
-                str = temp
-            
-
-            #  for 'RA (\u09B0) + HALANT + Vowel' it should be 'Vowel + RA (\u09B0) + HALANT'
-            if (i > 0 and i < util.mb_strlen(str) - 1 and util.mbCharAt(str, i) == '\u09CD' and util.mbCharAt(str, i - 1) == '\u09B0' and util.mbCharAt(str, i - 2) != '\u09CD' and self.IsBanglaKar(util.mbCharAt(str, i + 1))):
-                temp = util.subString(str, 0, i - 1)
-                temp += util.mbCharAt(str, i + 1)
-                temp += util.mbCharAt(str, i - 1)
-                temp += util.mbCharAt(str, i)
-                temp += util.subString(str, i + 2, util.mb_strlen(str))
-                str = temp            
-
-            #  Change pre-kar to post format suitable for unicode
-            if (i < util.mb_strlen(str) - 1 and self.IsBanglaPreKar(util.mbCharAt(str, i)) and self.IsSpace(util.mbCharAt(str, i + 1)) == False):
-                
-                temp = util.subString(str, 0, i)
-
-                j = 1
-                while ((i + j) < util.mb_strlen(str) - 1 and self.IsBanglaBanjonborno(util.mbCharAt(str, i + j))):
-                    if ((i + j) < util.mb_strlen(str) and self.IsBanglaHalant(util.mbCharAt(str, i + j + 1))):
-                        j += 2
-                    else:
-                        break                    
-                
-                temp += util.subString(str, i + 1, i + j + 1)
-
-                l = 0
-                if (util.mbCharAt(str, i) == 'ে' and util.mbCharAt(str, i + j + 1) == 'া'):
-                    temp += "ো"
-                    l = 1
-                elif (util.mbCharAt(str, i) == 'ে' and util.mbCharAt(str, i + j + 1) == "ৗ"):
-                    temp += "ৌ"
-                    l = 1
-                else:
-                    temp += util.mbCharAt(str, i)
-                
-                temp += util.subString(str, i + j + l + 1, util.mb_strlen(str))
-                str = temp
-                i += j
-            
-            #  nukta should be placed after kars
-            if (i < util.mb_strlen(str) - 1 and self.IsBanglaNukta(util.mbCharAt(str, i)) and self.IsBanglaPostKar(util.mbCharAt(str, i + 1))):
-                temp = util.subString(str, 0, i)
-                temp += util.mbCharAt(str, i + 1)
-                temp += util.mbCharAt(str, i)
-                temp += util.subString(str, i + 2, util.mb_strlen(str))
-                str = temp
-
-            i += 1
-        return str
+        str = _move_refs(str)
+        str = proConversionEngine.apply(str)
+        return _move_kars(str)
 
     def reArranceUnicodeTextForASCI(self, str):
-        
-        cY = 0
-        i = 0
-        
-        #for ($i = 0; $i < util.mb_strlen(str); ++$i) 
-        while i<util.mb_strlen(str):
-
-            if(i<util.mb_strlen(str) and self.IsBanglaPreKar(util.mbCharAt(str,i))):
-                j=1
-                while self.IsBanglaBanjonborno(util.mbCharAt(str,i-j)):
-                    if (i-j)<0:
-                        break
-                    if (i-j)<=cY:
-                        break
-                    if self.IsBanglaHalant(util.mbCharAt(str,i-j-1)):
-                        j+=2
-                    else:
-                        break
-
-                R = util.subString(str,0, i-j)
-                R += util.mbCharAt(str,i)
-                R += util.subString(str,i-j, i)
-                R += util.subString(str,i+1, util.mb_strlen(str))
-                
-                str = R
-                
-                cY= i+1
-                continue
-            
-            
-            if i<(util.mb_strlen(str)-1) and self.IsBanglaHalant(util.mbCharAt(str,i)) and util.mbCharAt(str,i-1)=='র' and not self.IsBanglaHalant(util.mbCharAt(str,i-2)):
-                j=1
-                aZ=0
-
-                while True:
-                    if self.IsBanglaBanjonborno(util.mbCharAt(str,i+j)) and self.IsBanglaHalant(util.mbCharAt(str,i+j+1)):
-                        j+=2
-
-                    elif self.IsBanglaBanjonborno(util.mbCharAt(str,i+j)) and self.IsBanglaPreKar(util.mbCharAt(str,i+j+1)):
-                        aZ=1
-                        break
-                    
-                    else:
-                        break
-
-                R  = util.subString(str,0, i-1)
-                R += util.subString(str, i+j+1, i+j+aZ+1)
-                R += util.subString(str, i+1, i+j+1)
-                R += util.mbCharAt(str, i-1)
-                R += util.mbCharAt(str, i)
-                R += util.subString(str, i+j+aZ+1, util.mb_strlen(str))
-                
-                str = R
-                
-                i+=(j+aZ)
-                cY=i+1
-                continue
-
-            i += 1
-        return str
+        return _move_kars_for_ascii(str)
 
     # main conversion def
     def convertBijoyToUnicode(self, srcString):
         if not srcString:
             return srcString
 
-        srcString = util.doCharMap(srcString, preConversionMap)
-        srcString = util.doCharMap(srcString, conversionMap)
+        srcString = preConversionEngine.apply(srcString)
+        srcString = conversionEngine.apply(srcString)
         
         srcString = self.reArrangeUnicodeConvertedText(srcString)
-        srcString = util.doCharMap(srcString, postConversionMap)
+        srcString = postConversionEngine.apply(srcString)
         return srcString
 
     def convertUnicodeToBijoy(self, srcString):
         if not srcString:
             return srcString
 
-        main_char = {
-            "।"   :   "|", 	"‘"   :   "Ô", 	"’"   :   "Õ", 
-            "“"   :   "Ò", 	"”"   :   "Ó", 	"্র্য"   :   "ª¨", 
-            "ম্প্র"   :   "¤cÖ", 	"র‌্য"   :   "i¨", 	"ক্ষ্ম"   :   "²", 
-            "ক্ক"   :   "°", 	"ক্ট"   :   "±", 	"ক্ত"   :   "³", 
-            "ক্ব"   :   "K¡", 	"স্ক্র"   :   "¯Œ", 	"ক্র"   :   "µ", 
-            "ক্ল"   :   "K¬", 	"ক্ষ"   :   "¶", 	"ক্স"   :   "·", 
-            "গু"   :   "¸", 	"গ্ধ"   :   "»", 	"গ্ন"   :   "Mœ", 
-            "গ্ম"   :   "M¥", 	"গ্ল"   :   "M­", 	"গ্রু"   :   "Mªy", 
-            "ঙ্ক"   :   "¼", 	"ঙ্ক্ষ"   :   "•¶", 	"ঙ্খ"   :   "•L", 
-            "ঙ্গ"   :   "½", 	"ঙ্ঘ"   :   "•N", 	"চ্ছ্ব"   :   "”Q¡", 
-            "চ্চ"   :   "”P", 	"চ্ছ"   :   "”Q", 	"চ্ঞ"   :   "”T", 
-            "জ্জ্ব"   :   "¾¡", 	"জ্জ"   :   "¾", 	"জ্ঝ"   :   "À", 
-            "জ্ঞ"   :   "Á", 	"জ্ব"   :   "R¡", 	"ঞ্চ"   :   "Â", 
-            "ঞ্ছ"   :   "Ã", 	"ঞ্জ"   :   "Ä", 	"ঞ্ঝ"   :   "Å", 
-            "ট্ট"   :   "Æ", 	"ট্ব"   :   "U¡", 	"ট্ম"   :   "U¥", 
-            "ড্ড"   :   "Ç", 	"ণ্ট"   :   "È", 	"ণ্ঠ"   :   "É", 
-            "ন্স"   :   "Ý", 	"ণ্ড"   :   "Ê", 	"ন্তু"   :   "š‘", 
-            "ণ্ব"   :   "Y^", 	"ত্ত্ব"   :   "Ë¡", 	"ত্ত"   :   "Ë", 
-            "ত্থ"   :   "Ì", 	"ত্ন"   :   "Zœ", 	"ত্ম"   :   "Z¥", 
-            "ন্ত্ব"   :   "š—¡", 	"ত্ব"   :   "Z¡", 	"থ্ব"   :   "_¡", 
-            "দ্গ"   :   "˜M", 	"দ্ঘ"   :   "˜N", 	"দ্দ"   :   "Ï", 
-            "দ্ধ"   :   "×", 	"দ্ব"   :   "Ø", 
-            "দ্ভ"   :   "™¢", 	"দ্ম"   :   "Ù", 	"দ্রু"   :   "`ª“", 
-            "ধ্ব"   :   "aŸ", 	"ধ্ম"   :   "a¥", 	"ন্ট"   :   "›U", 
-            "ন্ঠ"   :   "Ú", 	"ন্ড"   :   "Û", 	"ন্ত্র"   :   "š¿", 
-            "ন্ত"   :   "š—", 	"স্ত্র"   :   "¯¿", 	"ত্র"   :   "Î", 
-            "ন্থ"   :   "š’", 	"ন্দ"   :   "›`", 	"ন্দ্ব"   :   "›Ø", 
-            "ন্ধ"   :   "Ü", 	"ন্ন"   :   "bœ", 	"ন্ব"   :   "š^", 
-            "ন্ম"   :   "b¥", 	"প্ট"   :   "Þ", 	"প্ত"   :   "ß", 
-            "প্ন"   :   "cœ", 	"প্প"   :   "à", 	"প্ল"   :   "c­", 
-            "প্স"   :   "á", 	"ফ্ল"   :   "d¬", 	"ব্জ"   :   "â", 
-            "ব্দ"   :   "ã", 	"ব্ধ"   :   "ä", 	"ব্ব"   :   "eŸ", 
-            "ব্ল"   :   "e­", 	"ভ্র"   :   "å", 	"ম্ন"   :   "gœ", 
-            "ম্প"   :   "¤ú", 	"ম্ফ"   :   "ç", 	"ম্ব"   :   "¤^", 
-            "ম্ভ"   :   "¤¢", 	"ম্ভ্র"   :   "¤£", 	"ম্ম"   :   "¤§", 
-            "ম্ল"   :   "¤­", 	"্র"   :   "ª", 	"রু"   :   "i“", 
-            "রূ"   :   "iƒ", 	"ল্ক"   :   "é", 	"ল্গ"   :   "ê", 
-            "ল্ট"   :   "ë", 	"ল্ড"   :   "ì", 	"ল্প"   :   "í", 
-            "ল্ফ"   :   "î", 	"ল্ব"   :   "j¦", 	"ল্ম"   :   "j¥", 
-            "ল্ল"   :   "j­", 	"শু"   :   "ï", 	"শ্চ"   :   "ð", 
-            "শ্ন"   :   "kœ", 	"শ্ব"   :   "k¦", 	"শ্ম"   :   "k¥", 
-            "শ্ল"   :   "k­", 	"ষ্ক"   :   "®‹", 	"ষ্ক্র"   :   "®Œ", 
-            "ষ্ট"   :   "ó", 	"ষ্ঠ"   :   "ô", 	"ষ্ণ"   :   "ò", 
-            "ষ্প"   :   "®ú", 	"ষ্ফ"   :   "õ", 	"ষ্ম"   :   "®§", 
-            "স্ক"   :   "¯‹", 	"স্ট"   :   "÷", 	"স্খ"   :   "ö", 
-            "স্ত"   :   "¯—", 	"স্তু"   :   "¯‘", 	"স্থ"   :   "¯’", 
-            "স্ন"   :   "mœ", 	"স্প"   :   "¯ú", 	"স্ফ"   :   "ù", 
-            "স্ব"   :   "¯^", 	"স্ম"   :   "¯§", 	"স্ল"   :   "¯­", 
-            "হু"   :   "û", 	"হ্ণ"   :   "nè", 	"হ্ব"   :   "nŸ", 
-            "হ্ন"   :   "ý", 	"হ্ম"   :   "þ", 	"হ্ল"   :   "n¬", 
-            "হৃ"   :   "ü", 	"র্"   :   "©",
-            "্য"   :   "¨", 	"্"   :   "&", 	"আ"   :   "Av", 
-            "অ"   :   "A", 	"ই"   :   "B", 	"ঈ"   :   "C", 
-            "উ"   :   "D", 	"ঊ"   :   "E", 	"ঋ"   :   "F", 
-            "এ"   :   "G", 	"ঐ"   :   "H", 	"ও"   :   "I", 
-            "ঔ"   :   "J", 	"ক"   :   "K", 	"খ"   :   "L", 
-            "গ"   :   "M", 	"ঘ"   :   "N", 	"ঙ"   :   "O", 
-            "চ"   :   "P", 	"ছ"   :   "Q", 	"জ"   :   "R", 
-            "ঝ"   :   "S", 	"ঞ"   :   "T", 	"ট"   :   "U", 
-            "ঠ"   :   "V", 	"ড"   :   "W", 	"ঢ"   :   "X", 
-            "ণ"   :   "Y", 	"ত"   :   "Z", 	"থ"   :   "_", 
-            "দ"   :   "`", 	"ধ"   :   "a", 	"ন"   :   "b", 
-            "প"   :   "c", 	"ফ"   :   "d", 	"ব"   :   "e", 
-            "ভ"   :   "f", 	"ম"   :   "g", 	"য"   :   "h", 
-            "র"   :   "i", 	"ল"   :   "j", 	"শ"   :   "k", 
-            "ষ"   :   "l", 	"স"   :   "m", 	"হ"   :   "n", 
-            "ড়"   :   "o", 	"ঢ়"   :   "p", 	"য়"   :   "q", 
-            "ৎ"   :   "r", 	"০"   :   "0", 	"১"   :   "1", 
-            "২"   :   "2", 	"৩"   :   "3", 	"৪"   :   "4", 
-            "৫"   :   "5", 	"৬"   :   "6", 	"৭"   :   "7", 
-            "৮"   :   "8", 	"৯"   :   "9", 	"া"   :   "v", 
-            "ি"   :   "w", 	"ী"   :   "x", 	"ু"   :   "y", 
-            "ূ"   :   "~", 	"ৃ"   :   "…", 	"ে"   :   "‡", 
-            "ৈ"   :   "‰", 	"ৗ"   :   "Š", 	"ং"   :   "s", 
-            "ঃ"   :   "t", 	"ঁ"   :   "u"
-        }
-
-        pattern = 'ো'
-        replacement = 'ো'
-        srcString = util.preg_replace(pattern, replacement, srcString)
-	
-        pattern = 'ৌ'
-        replacement = 'ৌ'
-        srcString = util.preg_replace(pattern, replacement, srcString)
+        # Decomposed o-kar and au-kar, so the reordering sees the pre-kar
+        srcString = srcString.replace('\u09cb', '\u09c7\u09be').replace('\u09cc', '\u09c7\u09d7')
+        # Precomposed ড় ঢ় য় (NFC text has them decomposed), so a pre-kar
+        # moves in front of the whole letter
+        srcString = srcString.replace('\u09a1\u09bc', '\u09dc').replace('\u09a2\u09bc', '\u09dd').replace('\u09af\u09bc', '\u09df')
 
         # make correction
         srcString = self.reArranceUnicodeTextForASCI(srcString)
 
-        #inv_conversionMap = {v: k for k, v in conversionMap.items()}
-        srcString = util.doCharMap(srcString, main_char)
+        srcString = unicodeToBijoyEngine.apply(srcString)
         
         return srcString
 
@@ -0,0 +1,158 @@
+"""
+Bijoy Codec Module
+Python codec for Bijoy (ANSI) encoded Bengali text
+
+Importing this module registers the 'bijoy' codec, so Bijoy files and
+streams can be read and written as Unicode Bengali directly:
+
+    with open('letter.txt', encoding='bijoy') as f:
+        for line in f:
+            ...
+
+Bijoy text is stored as single-byte Windows-1252 (ANSI) codes. Decoding
+maps the bytes to their Windows-1252 characters and runs the bijoy2unicode
+conversion; encoding runs the reverse conversion and writes the codes back.
+The incremental decoder only converts up to a safe boundary and keeps the
+rest of the input for the next chunk, so pending i-kar/e-kar and reph
+reordering never sees half a word and memory stays constant.
+
+The incremental encoder holds back a trailing partial word that ends in
+a Bengali letter or sign, since a following kar, hasanta or nukta still
+changes it (an i-kar moves in front of its consonant), or that has a
+reph, which moves behind the characters that follow it. It is converted
+once whitespace or the final chunk arrives. Text files opened for writing
+never pass a final chunk to their encoder: a last word that is held back
+is only written if whitespace (a final newline) follows it.
+"""
+
+import codecs
+import re
+from encodings import cp1252
+
+from .bijoy2unicode.converter import Unicode
+
+CODEC_NAME = 'bijoy'
+
+# Windows-1252 with its five undefined bytes mapped to the Latin-1
+# characters of the same value, so any byte string decodes
+DECODING_TABLE = ''.join(chr(code) if char == '\ufffe' else char
+                         for code, char in enumerate(cp1252.decoding_table))
+ENCODING_TABLE = codecs.charmap_build(DECODING_TABLE)
+
+# Decoding may split a chunk after a run of whitespace that is followed by
+# a digit or by a letter that converts to a consonant or independent vowel.
+# Kars and the reph move across the characters next to them, and ' ,',
+# ' |', ' ঃ' and repeated whitespace are rewritten as one, so a chunk must
+# never start with those (and a run after a backslash is part of '\\ ')
+BIJOY_BOUNDARY = re.compile(r'(?<![\\ \t\r\n])[ \t\r\n]+(?=[0-9A-Z_`a-nr])')
+_DECODE_BOUNDARY = re.compile(BIJOY_BOUNDARY.pattern.encode('ascii'))
+
+# Encoding converts each word on its own; whitespace is copied, and any
+# whitespace run ends a chunk that can be encoded on its own
+UNICODE_BOUNDARY = re.compile(r'\s+')
+_WORDS = re.compile(r'(\s+)')
+
+# A word is not complete until whitespace follows if it ends in a Bengali
+# letter or sign, ZWNJ or ZWJ (digits and '।' take no signs), or if it has
+# a reph, which moves behind the characters that follow it
+_OPEN_WORD_END = re.compile('[\u0980-\u09e3\u09f0\u09f1\u200c\u200d]')
+_REPH = '\u09b0\u09cd'
+
+_converter = Unicode()
+
+
+def bijoy_to_unicode(bijoy_text):
+    """Convert a complete Bijoy text (as Windows-1252 characters) to Unicode"""
+    return _converter.convertBijoyToUnicode(bijoy_text)
+
+
+def unicode_to_bijoy(unicode_text):
+    """
+    Convert a complete Unicode text to Bijoy, word by word.
+
+    Each whitespace-separated word is converted like a single edited word,
+    which keeps a reph inside its own word.
+    """
+    parts = _WORDS.split(unicode_text)
+    for i in range(0, len(parts), 2):
+        if parts[i]:
+            parts[i] = _converter.convertUnicodeToBijoy(parts[i])
+    return ''.join(parts)
+
+
+def _decode_boundary(data):
+    """Length of the longest prefix of data that can be decoded on its own"""
+    end = 0
+    for match in _DECODE_BOUNDARY.finditer(data):
+        end = match.end()
+    return end
+
+
+def _encode_boundary(text):
+    """Length of the longest prefix of text that later input cannot change"""
+    end = 0
+    for match in UNICODE_BOUNDARY.finditer(text):
+        end = match.end()
+    word = text[end:]
+    if _OPEN_WORD_END.match(word[-1:]) or _REPH in word:
+        return end
+    return len(text)
+
+
+def decode(input, errors='strict'):
+    """Decode Bijoy bytes to Unicode text"""
+    bijoy_text, consumed = codecs.charmap_decode(input, errors, DECODING_TABLE)
+    return bijoy_to_unicode(bijoy_text), consumed
+
+
+def encode(input, errors='strict'):
+    """Encode Unicode text as Bijoy bytes"""
+    data, _ = codecs.charmap_encode(unicode_to_bijoy(input), errors, ENCODING_TABLE)
+    return data, len(input)
+
+
+class IncrementalDecoder(codecs.BufferedIncrementalDecoder):
+    """
+    Decode a Bijoy byte stream chunk by chunk.
+
+    Bytes after the last safe boundary stay in the buffer until more input
+    (or the final chunk) arrives.
+    """
+
+    def _buffer_decode(self, input, errors, final):
+        end = len(input) if final else _decode_boundary(input)
+        if not end:
+            return '', 0
+        bijoy_text, _ = codecs.charmap_decode(input[:end], errors, DECODING_TABLE)
+        return bijoy_to_unicode(bijoy_text), end
+
+
+class IncrementalEncoder(codecs.BufferedIncrementalEncoder):
+    """
+    Encode Unicode text chunk by chunk.
+
+    A trailing word that a later chunk could still change stays in the
+    buffer until whitespace (or the final chunk) arrives, so a word split
+    across two writes is converted as one.
+    """
+
+    def _buffer_encode(self, input, errors, final):
+        end = len(input) if final else _encode_boundary(input)
+        data, _ = codecs.charmap_encode(unicode_to_bijoy(input[:end]), errors, ENCODING_TABLE)
+        return data, end
+
+
+def search(name):
+    """codecs search function for the 'bijoy' codec"""
+    if name != CODEC_NAME:
+        return None
+    return codecs.CodecInfo(
+        name=CODEC_NAME,
+        encode=encode,
+        decode=decode,
+        incrementalencoder=IncrementalEncoder,
+        incrementaldecoder=IncrementalDecoder,
+    )
+
+
+codecs.register(search)
@@ -6,18 +6,16 @@ This module uses the bijoy2unicode library for comprehensive and accurate conver
 Source: https://github.com/Mad-FOX/bijoy2unicode
 """
 
-try:
-    # Try to import from installed package first
-    from bijoy2unicode import converter as bijoy_converter
-    BIJOY2UNICODE_AVAILABLE = True
-except ImportError:
-    try:
-        # Try to import from local copy
-        from .bijoy2unicode import converter as bijoy_converter
-        BIJOY2UNICODE_AVAILABLE = True
-    except ImportError:
-        BIJOY2UNICODE_AVAILABLE = False
-        print("Warning: bijoy2unicode not available. Using fallback implementation.")
+import threading
+from collections import OrderedDict
+
+from . import script_classifier
+
+# Always the local copy: it has the compiled char map engine, the linear
+# reordering passes and the longest-match Unicode to Bijoy table. The PyPI
+# release of bijoy2unicode has none of these and converts differently.
+from .bijoy2unicode import converter as bijoy_converter
+BIJOY2UNICODE_AVAILABLE = True
 
 class BijoyUnicodeConverter:
     def __init__(self):
@@ -98,19 +96,7 @@ class BijoyUnicodeConverter:
         
     def is_bijoy_text(self, text):
         """Detect if text is in Bijoy encoding"""
-        # Check for common Bijoy patterns
-        bijoy_indicators = [
-            # Bijoy uses ASCII characters for Bengali
-            any(c in text for c in ['Av', '©', '¨', '¯', '°']),
-            # Check for Bijoy font names
-            any(font in text.lower() for font in ['sutonnymj', 'solaiman', 'kalpurush'])
-        ]
-        
-        # Check if text has ASCII-range characters but font suggests Bengali
-        has_ascii = any(ord(c) < 128 for c in text if c.isalpha())
-        has_bijoy_chars = any(128 <= ord(c) <= 255 for c in text)
-        
-        return any(bijoy_indicators) or (has_ascii and has_bijoy_chars)
+        return script_classifier.is_bijoy_text(text)
     
     def convert_to_unicode(self, text):
         """Convert Bijoy text to Unicode"""
@@ -127,7 +113,7 @@ class BijoyUnicodeConverter:
         
         # Fallback implementation (original code)
         # If already Unicode Bengali, return as is
-        if any('\u0980' <= c <= '\u09FF' for c in text):
+        if script_classifier.has_bengali(text):
             return text
         
         result = []
@@ -262,26 +248,132 @@ class BijoyUnicodeConverter:
         print("Warning: Unicode to Bijoy conversion requires bijoy2unicode library")
         return text
     
+    def is_bijoy_font(self, font_name):
+        """Check if a font name belongs to a Bijoy font"""
+        return script_classifier.is_bijoy_font(font_name)
+    
     def convert_with_font_info(self, text, font_name):
         """Convert text based on font name"""
-        # List of Bijoy fonts
-        bijoy_fonts = [
-            'sutonnymj', 'sutonnymj bold', 'sutonnymj italic',
-            'solaiman', 'solaiman lipi',
-            'kalpurush', 'nikosh', 'likhan',
-            'siyam rupali', 'ekushey',
-        ]
-        
-        # Check if font is Bijoy
-        is_bijoy_font = any(bf in font_name.lower() for bf in bijoy_fonts)
-        
-        if is_bijoy_font or self.is_bijoy_text(text):
+        if self.is_bijoy_font(font_name) or self.is_bijoy_text(text):
             return self.convert_to_unicode(text)
         
         return text
 
+
+class ConversionMemo:
+    """
+    Bounded LRU memo of word conversions for batch conversion.
+    
+    Documents repeat the same words ("Ges", "|", numbers) thousands of
+    times, so each distinct (text, Bijoy font) pair is converted once and
+    the result kept until it falls out of the least recently used end.
+    """
+    
+    def __init__(self, converter, maxsize=50000):
+        self.converter = converter
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def _lookup(self, text, is_bijoy_font):
+        """
+        Return (unicode_text, is_bijoy) for one distinct word.
+        
+        is_bijoy_font is True or False for a font known only by name (the
+        text is checked with is_bijoy_text()), or FONT_BIJOY for a font the
+        document's font table labels Bijoy (the text is always converted).
+        """
+        key = (text, is_bijoy_font)
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return result
+            self.misses += 1
+        
+        if is_bijoy_font == script_classifier.FONT_BIJOY:
+            result = (self.converter.convert_to_unicode(text), True)
+        else:
+            is_bijoy = self.converter.is_bijoy_text(text)
+            if is_bijoy_font or is_bijoy:
+                result = (self.converter.convert_to_unicode(text), is_bijoy)
+            else:
+                result = (text, is_bijoy)
+        
+        with self._lock:
+            self._entries[key] = result
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return result
+    
+    def convert_batch(self, texts, font_names, font_table=None):
+        """
+        Convert many words at once.
+        
+        Words are grouped by font and identical strings within a group
+        are converted once. The encoding of a group is looked up in
+        font_table when the font is listed there: words in Bijoy fonts are
+        converted and words in Unicode Bengali fonts kept, without looking
+        at the text. Latin fonts may still be Bijoy fonts missing from
+        BIJOY_FONT_FAMILIES (or renamed ones), so their words and those of
+        fonts not in the table give the results of
+        convert_bijoy_to_unicode() and is_bijoy_text() applied word by word.
+        
+        Args:
+            texts (list): Words to convert
+            font_names (list): Font name of each word
+            font_table (dict): Document font table (font name -> label),
+                merged from the pages extracted so far
+                (see page_extractor.merge_font_table())
+        
+        Returns:
+            tuple: (list of Unicode texts, list of is_bijoy flags)
+        """
+        groups = {}
+        for index, (text, font_name) in enumerate(zip(texts, font_names)):
+            groups.setdefault(font_name, {}).setdefault(text, []).append(index)
+        
+        unicode_texts = [None] * len(texts)
+        bijoy_flags = [False] * len(texts)
+        for font_name, words in groups.items():
+            label = font_table.get(font_name) if font_table else None
+            if label is None:
+                is_bijoy_font = script_classifier.is_bijoy_font(font_name)
+            elif label == script_classifier.FONT_BIJOY:
+                is_bijoy_font = label
+            elif label == script_classifier.FONT_LATIN:
+                is_bijoy_font = False
+            else:
+                for indices in words.values():
+                    for index in indices:
+                        unicode_texts[index] = texts[index]
+                continue
+            for text, indices in words.items():
+                unicode_text, is_bijoy = self._lookup(text, is_bijoy_font)
+                for index in indices:
+                    unicode_texts[index] = unicode_text
+                    bijoy_flags[index] = is_bijoy
+        
+        return unicode_texts, bijoy_flags
+    
+    def stats(self):
+        """Memo counters for monitoring"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+                'entries': len(self._entries),
+                'maxsize': self.maxsize
+            }
+
 # Global converter instance
 converter = BijoyUnicodeConverter()
+conversion_memo = ConversionMemo(converter)
 
 def convert_bijoy_to_unicode(text, font_name=''):
     """Helper function to convert Bijoy to Unicode"""
@@ -290,3 +382,11 @@ def convert_bijoy_to_unicode(text, font_name=''):
 def is_bijoy_text(text):
     """Helper function to detect Bijoy text"""
     return converter.is_bijoy_text(text)
+
+def convert_batch(texts, font_names, font_table=None):
+    """Helper function to convert a batch of words through the shared memo"""
+    return conversion_memo.convert_batch(texts, font_names, font_table)
+
+def conversion_stats():
+    """Helper function to get the conversion memo counters"""
+    return conversion_memo.stats()
@@ -0,0 +1,179 @@
+"""
+Extraction Cache Module
+Keeps processed pdf_data on disk keyed by the uploaded file's content hash
+"""
+
+import hashlib
+import json
+import os
+import threading
+import logging
+
+from .page_extractor import EXTRACTOR_VERSION
+from .text_layer import storage_default, storage_object_hook
+
+logger = logging.getLogger(__name__)
+
+# Uploads are hashed while they are copied to disk in chunks of this size
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def save_with_digest(stream, filepath):
+    """
+    Copy an upload stream to filepath and return its SHA-256 hex digest.
+
+    The hash is computed on the same pass that writes the file, so the
+    upload is never read twice.
+    """
+    digest = hashlib.sha256()
+    with open(filepath, 'wb') as f:
+        while True:
+            chunk = stream.read(HASH_CHUNK_SIZE)
+            if not chunk:
+                break
+            digest.update(chunk)
+            f.write(chunk)
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    """
+    Bounded on-disk cache of processed (extracted and converted) pdf_data.
+
+    Entries are JSON files named after the content hash and the extractor
+    version, so a change to the extraction output invalidates old entries
+    without any cleanup step. When the folder grows past max_bytes the
+    least recently used entries (oldest mtime; hits touch the file) are
+    deleted.
+    """
+
+    def __init__(self, cache_folder='cache', max_bytes=500 * 1024 * 1024):
+        """
+        Initialize ExtractionCache.
+
+        Args:
+            cache_folder (str): Directory to store cache entries
+            max_bytes (int): Size limit of the cache folder
+        """
+        self.cache_folder = cache_folder
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        os.makedirs(cache_folder, exist_ok=True)
+
+    def _get_filepath(self, digest):
+        """Get file path for a content hash"""
+        return os.path.join(self.cache_folder, f'{digest}-v{EXTRACTOR_VERSION}.json')
+
+    def get(self, digest):
+        """
+        Look up the processed pdf_data of a file.
+
+        Args:
+            digest (str): SHA-256 hex digest of the PDF file
+
+        Returns:
+            dict or None: A fresh copy of the cached pdf_data, None on a miss
+        """
+        filepath = self._get_filepath(digest)
+        try:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                pdf_data = json.load(f, object_hook=storage_object_hook)
+            os.utime(filepath)
+        except FileNotFoundError:
+            pdf_data = None
+        except Exception as e:
+            logger.warning(f"Dropping unreadable cache entry {filepath}: {e}")
+            self._remove(filepath)
+            pdf_data = None
+
+        with self._lock:
+            if pdf_data is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return pdf_data
+
+    def put(self, digest, pdf_data):
+        """
+        Store the processed pdf_data of a file and enforce the size limit.
+
+        Only fully extracted documents should be stored; lazy uploads
+        still contain placeholder pages.
+        """
+        filepath = self._get_filepath(digest)
+        tmp_path = f'{filepath}.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(pdf_data, f, ensure_ascii=False, default=storage_default)
+            os.replace(tmp_path, filepath)
+        except Exception as e:
+            logger.error(f"Error writing cache entry {filepath}: {e}", exc_info=True)
+            self._remove(tmp_path)
+            return False
+
+        self._evict()
+        return True
+
+    def _evict(self):
+        """Delete least recently used entries until the folder fits max_bytes"""
+        entries = []
+        total = 0
+        for filename in os.listdir(self.cache_folder):
+            if not filename.endswith('.json'):
+                continue
+            filepath = os.path.join(self.cache_folder, filename)
+            try:
+                stat = os.stat(filepath)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, filepath))
+            total += stat.st_size
+
+        entries.sort()
+        for mtime, size, filepath in entries:
+            if total <= self.max_bytes:
+                break
+            if self._remove(filepath):
+                total -= size
+                with self._lock:
+                    self.evictions += 1
+                logger.info(f"Evicted extraction cache entry: {os.path.basename(filepath)}")
+
+    def _remove(self, filepath):
+        try:
+            os.remove(filepath)
+            return True
+        except OSError:
+            return False
+
+    def stats(self):
+        """
+        Get cache counters for monitoring.
+
+        Returns:
+            dict: hits, misses, hit rate, evictions, entry count and bytes held
+        """
+        entries = 0
+        size = 0
+        for filename in os.listdir(self.cache_folder):
+            if filename.endswith('.json'):
+                try:
+                    size += os.path.getsize(os.path.join(self.cache_folder, filename))
+                    entries += 1
+                except OSError:
+                    pass
+
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+                'evictions': self.evictions,
+                'entries': entries,
+                'bytes': size,
+                'max_bytes': self.max_bytes
+            }
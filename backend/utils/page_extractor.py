@@ -0,0 +1,356 @@
+"""
+Page Extraction Module
+Builds the word-level text layer of a single PDF page in one pass
+"""
+
+import fitz  # PyMuPDF
+from bisect import bisect_right
+import logging
+
+from .script_classifier import FONT_BIJOY, FONT_LATIN, font_class, is_bijoy_font
+from .text_layer import PageTextLayer
+
+logger = logging.getLogger(__name__)
+
+# One TextPage serves both the "words" and the "rawdict" views of a page,
+# so MuPDF parses the content stream once. Images are left out of the text
+# page: they are listed separately and their pixels are never needed here.
+TEXTPAGE_FLAGS = fitz.TEXTFLAGS_WORDS
+
+# Bump whenever the extracted page data (or the Bijoy conversion applied to
+# it on upload) changes shape or content; cached extractions are keyed by it
+EXTRACTOR_VERSION = 7
+
+
+def extract_page(page, page_num, font_labels=None):
+    """
+    Extract word-level text blocks and image placements from a page.
+
+    Words come from page.get_text("words"); their font, size, color and
+    flags are looked up in the rawdict of the same TextPage instead of
+    running a clipped get_text("dict") per word.
+
+    Args:
+        page: fitz.Page to extract
+        page_num (int): Zero-based page number (used for element IDs)
+        font_labels (dict): Font labels by xref shared by the pages of
+            one document (see page_font_table())
+
+    Returns:
+        dict: Page data with 'text_blocks' (a PageTextLayer), 'images',
+        the ANSI 'bbox_corrections' counters and the page's 'font_table',
+        which callers move into the document's (see merge_font_table())
+    """
+    text_layer = PageTextLayer(page_num)
+    page_data = {
+        'page_number': page_num,
+        'width': page.rect.width,
+        'height': page.rect.height,
+        'text_blocks': text_layer,
+        'images': [],
+        'has_text': False,
+        'extracted': True
+    }
+    font_table = page_font_table(page, font_labels)
+
+    textpage = page.get_textpage(flags=TEXTPAGE_FLAGS)
+
+    # GEMINI SOLUTION: Extract WORD-LEVEL text with precise bounding boxes
+    # page.get_text("words") returns: (x0, y0, x1, y1, "word", block_no, line_no, word_no)
+    words = page.get_text("words", textpage=textpage)
+    raw_dict = page.get_text("rawdict", textpage=textpage)
+    line_spans = _index_line_spans(raw_dict)
+    origin_index = None
+    corrected = 0
+    uncorrected = 0
+
+    if words:
+        page_data['has_text'] = True
+
+    for word_tuple in words:
+        x0, y0, x1, y1, word_text, block_no, line_no, word_no = word_tuple
+
+        span = _find_span(line_spans, block_no, line_no, x0)
+        if span is not None:
+            font_name = span.get("font", "")
+            font_size = span.get("size", 12)
+            font_color = span.get("color", 0)
+            flags = span.get("flags", 0)
+        else:
+            # Fallback if can't extract styles
+            font_name = ""
+            font_size = 12
+            font_color = 0
+            flags = 0
+
+        # ANSI/BIJOY FIX: Correct bbox vertical position
+        # For ANSI fonts (SutonnyMJ, etc.), PyMuPDF returns bbox with wrong Y position
+        # This applies to ALL lines (both negative and positive Y).
+        # Fonts are judged by their label: Nikosh, Kalpurush or SolaimanLipi
+        # with a Bengali cmap are Unicode fonts and keep their bbox
+        label = font_table.get(font_name)
+        bijoy_font = label == FONT_BIJOY if label is not None else is_bijoy_font(font_name)
+
+        corrected_bbox = [x0, y0, x1, y1]
+
+        # CRITICAL: ALL ANSI fonts need correction (not just negative Y)
+        # The origin Y is always the correct baseline, bbox Y is always wrong
+        if bijoy_font:
+            if origin_index is None:
+                origin_index = CharOriginIndex(raw_dict)
+            origin = origin_index.find(x0, y0)
+            if origin is None:
+                uncorrected += 1
+            else:
+                corrected += 1
+                origin_y = origin[1]
+
+                # Use origin Y as baseline (bottom); top = baseline - height
+                original_height = y1 - y0
+                corrected_bbox[1] = origin_y - original_height
+                corrected_bbox[3] = origin_y
+
+                # Formatted only when debug logging is on: this runs per word
+                logger.debug("ANSI bbox corrected: [%.1f,%.1f,%.1f,%.1f] → [%.1f,%.1f,%.1f,%.1f] (origin_y=%.1f)",
+                             x0, y0, x1, y1, *corrected_bbox, origin_y)
+
+        # Word IDs and origins are derived from the index and the
+        # corrected bbox when the layer is turned into dicts
+        text_layer.append(word_text, font_name, round(font_size, 2), _rgb_to_hex(font_color),
+                          flags, corrected_bbox, block_no, line_no, word_no)
+
+    # Image placement metadata only: get_image_info() never copies image
+    # bytes into Python, unlike the image blocks of get_text("dict").
+    # "number" is the image's block number in that dict, so IDs are unchanged
+    for image in page.get_image_info():
+        page_data['images'].append({
+            'id': f"img_{page_num}_{image['number']}",
+            'bbox': image["bbox"],
+            'width': image.get("width", 0),
+            'height': image.get("height", 0)
+        })
+
+    page_data['bbox_corrections'] = {'corrected': corrected, 'uncorrected': uncorrected}
+    page_data['font_table'] = font_table
+    return page_data
+
+
+def page_placeholder(page, page_num):
+    """
+    Size-only entry for a page whose text layer has not been extracted yet.
+
+    Lazy uploads send these for every page after the first few; the
+    viewer fetches the real text layer through /api/page/text on demand.
+    """
+    return {
+        'page_number': page_num,
+        'width': page.rect.width,
+        'height': page.rect.height,
+        'text_blocks': PageTextLayer(page_num),
+        'images': [],
+        'has_text': False,
+        'extracted': False,
+        'bbox_corrections': {'corrected': 0, 'uncorrected': 0}
+    }
+
+
+def extract_page_range(filepath, start, stop):
+    """
+    Extract pages [start, stop) of a PDF file.
+
+    Runs inside worker processes: the document is opened by path so only
+    the file name and page range cross the process boundary, and the page
+    dictionaries come back in page order.
+    """
+    doc = fitz.open(filepath)
+    font_labels = {}
+    try:
+        return [extract_page(doc[page_num], page_num, font_labels) for page_num in range(start, stop)]
+    finally:
+        doc.close()
+
+
+def page_font_table(page, font_labels=None):
+    """
+    Label the fonts of a page from its font resources.
+
+    Fonts are listed with page.get_fonts(), which reads the page resources
+    without parsing any content stream. Each font object is classified by
+    its name and, when it is embedded, by the Unicode coverage of its cmap
+    (see script_classifier.font_class()).
+
+    Args:
+        page: fitz.Page
+        font_labels (dict): xref -> (name, label) of the fonts already
+            classified in the same document; filled in here, so a font
+            used on many pages is classified once
+
+    Returns:
+        dict: Font name as reported in text spans (subset prefix removed)
+        -> FONT_BIJOY, FONT_UNICODE_BENGALI or FONT_LATIN
+    """
+    if font_labels is None:
+        font_labels = {}
+    table = {}
+    for xref, ext, _, basefont, _, _ in page.get_fonts():
+        entry = font_labels.get(xref)
+        if entry is None:
+            entry = font_labels[xref] = _classify_font(page.parent, xref, ext, basefont)
+        merge_font_table(table, {entry[0]: entry[1]})
+    return table
+
+
+def merge_font_table(font_table, labels):
+    """
+    Merge font labels (of a page) into a document font table.
+
+    Subsets of one font can differ in coverage; any label other than
+    Latin wins.
+
+    Returns:
+        dict: font_table
+    """
+    for name, label in labels.items():
+        if font_table.get(name, FONT_LATIN) == FONT_LATIN:
+            font_table[name] = label
+    return font_table
+
+
+def build_font_table(doc):
+    """Font table of a whole document (see page_font_table())"""
+    table = {}
+    font_labels = {}
+    for page in doc:
+        merge_font_table(table, page_font_table(page, font_labels))
+    return table
+
+
+def _classify_font(doc, xref, ext, basefont):
+    """(name, label) of one font object"""
+    name = _span_font_name(_descendant_font_name(doc, xref) or basefont)
+    codepoints = ()
+    if ext != 'n/a':
+        try:
+            buffer = doc.extract_font(xref)[3]
+            if buffer:
+                codepoints = fitz.Font(fontbuffer=buffer).valid_codepoints()
+        except Exception as e:
+            logger.debug(f"Could not read cmap of font {basefont} ({xref}): {e}")
+    return name, font_class(name, codepoints)
+
+
+def _descendant_font_name(doc, xref):
+    """
+    BaseFont of a Type0 font's CIDFont, or None.
+
+    MuPDF names the spans of a Type0 font after its descendant, which can
+    differ from the Type0 BaseFont (PyMuPDF writes 'SutonnyMJ Bold' over
+    'SutonnyMJ-Bold', for one).
+    """
+    try:
+        kind, value = doc.xref_get_key(xref, 'DescendantFonts')
+        if kind == 'array' and value.endswith(' 0 R]'):
+            kind, value = doc.xref_get_key(int(value[1:].split()[0]), 'BaseFont')
+            if kind == 'name':
+                return value[1:]
+    except Exception as e:
+        logger.debug(f"Could not read the descendant of font {xref}: {e}")
+    return None
+
+
+def _span_font_name(basefont):
+    """Font name as text spans report it: without the ABCDEF+ subset prefix"""
+    if len(basefont) > 7 and basefont[6] == '+' and basefont[:6].isalpha() and basefont[:6].isupper():
+        return basefont[7:]
+    return basefont
+
+
+def _index_line_spans(raw_dict):
+    """
+    Index rawdict spans by (block_no, line_no).
+
+    Block numbers match the block_no of get_text("words") because both
+    views come from the same TextPage. Spans of each line are kept sorted
+    by their left edge so a word can be joined to its span by bisection.
+    """
+    line_spans = {}
+    for block in raw_dict.get("blocks", []):
+        block_no = block.get("number")
+        for line_no, line in enumerate(block.get("lines", [])):
+            spans = sorted(line.get("spans", []), key=lambda s: s["bbox"][0])
+            if spans:
+                line_spans[(block_no, line_no)] = ([s["bbox"][0] for s in spans], spans)
+    return line_spans
+
+
+def _find_span(line_spans, block_no, line_no, x0):
+    """Return the span that contains the word starting at x0, or None"""
+    entry = line_spans.get((block_no, line_no))
+    if entry is None:
+        return None
+
+    starts, spans = entry
+    # Small tolerance: the word's x0 is its first character's x0,
+    # which equals the span's x0 up to float rounding
+    idx = bisect_right(starts, x0 + 0.01) - 1
+    return spans[max(idx, 0)]
+
+
+class CharOriginIndex:
+    """
+    Grid index of character origins keyed by the character's (x0, y0).
+
+    Built once per page from the rawdict. Cells are as large as the match
+    tolerance (1pt in X, 5pt in Y), so a lookup only inspects the 3x3 block
+    of cells around the query point instead of every character on the page.
+    """
+
+    X_TOLERANCE = 1.0
+    Y_TOLERANCE = 5.0  # Allow 5pt tolerance for Y
+
+    def __init__(self, raw_dict):
+        self.cells = {}
+        seq = 0
+        for block in raw_dict.get("blocks", []):
+            for line in block.get("lines", []):
+                for span in line.get("spans", []):
+                    for char in span.get("chars", []):
+                        char_bbox = char.get("bbox", [0, 0, 0, 0])
+                        key = self._cell(char_bbox[0], char_bbox[1])
+                        self.cells.setdefault(key, []).append(
+                            (seq, char_bbox[0], char_bbox[1], char.get("origin", [0, 0]))
+                        )
+                        seq += 1
+
+    def _cell(self, x, y):
+        return (int(x // self.X_TOLERANCE), int(y // self.Y_TOLERANCE))
+
+    def find(self, x0, y0):
+        """
+        Find the origin of the character that starts at (x0, y0).
+
+        When several characters match, the first one in reading order wins.
+        Returns the origin tuple or None when no character matches.
+        """
+        cx, cy = self._cell(x0, y0)
+        best = None
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for entry in self.cells.get((cx + dx, cy + dy), ()):
+                    seq, char_x0, char_y0, origin = entry
+                    if best is not None and seq >= best[0]:
+                        continue
+                    if abs(char_x0 - x0) < self.X_TOLERANCE and abs(char_y0 - y0) < self.Y_TOLERANCE:
+                        best = entry
+        return best[3] if best is not None else None
+
+
+def _rgb_to_hex(rgb_int):
+    """Convert RGB integer to hex color"""
+    try:
+        r = (rgb_int >> 16) & 0xFF
+        g = (rgb_int >> 8) & 0xFF
+        b = rgb_int & 0xFF
+        return f"#{r:02x}{g:02x}{b:02x}"
+    except:
+        return "#000000"
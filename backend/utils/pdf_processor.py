@@ -9,181 +9,202 @@ from io import BytesIO
 from PIL import Image
 import os
 import logging
+from concurrent.futures import ProcessPoolExecutor
+
+from .page_extractor import extract_page, extract_page_range, merge_font_table, page_placeholder
+from .script_classifier import has_bengali, is_bijoy_font
 
 logger = logging.getLogger(__name__)
 
+
+def png_data_url(png_data):
+    """Data URL of PNG bytes, as the viewer takes page images"""
+    return f"data:image/png;base64,{base64.b64encode(png_data).decode('utf-8')}"
+
+
 class PDFProcessor:
     def __init__(self, config):
         self.config = config
         self.custom_fonts = {}
         self._load_custom_fonts()
         
-    def process_pdf(self, filepath, session_id):
-        """Process PDF and extract all text elements with metadata"""
+    def process_pdf(self, filepath, session_id, page_limit=None):
+        """
+        Process PDF and extract all text elements with metadata
+        
+        Args:
+            filepath (str): Path to the PDF file
+            session_id (str): Session the document belongs to
+            page_limit (int): Only extract the text layer of the first
+                page_limit pages; the rest get size-only placeholders
+        """
         try:
             doc = fitz.open(filepath)
             pdf_data = {
                 'num_pages': doc.page_count,
                 'pages': [],
-                'metadata': doc.metadata
+                'metadata': doc.metadata,
+                # Encoding of the fonts of the extracted pages, decided from
+                # the font resources; words refer to their font by name.
+                # Pages extracted later merge theirs in
+                'font_table': {}
             }
             
-            for page_num in range(doc.page_count):
-                page = doc[page_num]
-                page_data = {
-                    'page_number': page_num,
-                    'width': page.rect.width,
-                    'height': page.rect.height,
-                    'text_blocks': [],
-                    'images': [],
-                    'has_text': False
-                }
-                
-                # GEMINI SOLUTION: Extract WORD-LEVEL text with precise bounding boxes
-                # page.get_text("words") returns: (x0, y0, x1, y1, "word", block_no, line_no, word_no)
-                words = page.get_text("words")
-                
-                if words:
-                    page_data['has_text'] = True
-                
-                for word_idx, word_tuple in enumerate(words):
-                    x0, y0, x1, y1, word_text, block_no, line_no, word_no = word_tuple
-                    
-                    # Get original font styles for this specific word
-                    word_rect = fitz.Rect(x0, y0, x1, y1)
-                    try:
-                        # Query the PDF's internal character dictionary for this word
-                        text_dict = page.get_text("dict", clip=word_rect)
-                        span = text_dict["blocks"][0]["lines"][0]["spans"][0]
-                        font_name = span.get("font", "")
-                        font_size = span.get("size", 12)
-                        font_color = span.get("color", 0)
-                        flags = span.get("flags", 0)
-                    except (IndexError, KeyError):
-                        # Fallback if can't extract styles
-                        font_name = ""
-                        font_size = 12
-                        font_color = 0
-                        flags = 0
-                    
-                    # ANSI/BIJOY FIX: Correct bbox vertical position
-                    # For ANSI fonts (SutonnyMJ, etc.), PyMuPDF returns bbox with wrong Y position
-                    # This applies to ALL lines (both negative and positive Y)
-                    is_bijoy_font = font_name and any(bijoy_name in font_name.lower() for bijoy_name in 
-                        ['sutonnymj', 'sushree', 'solaimanlpi', 'nikosh', 'kalpurush', 'akaash'])
-                    
-                    corrected_bbox = [x0, y0, x1, y1]
-                    
-                    # CRITICAL: ALL ANSI fonts need correction (not just negative Y)
-                    # The origin Y is always the correct baseline, bbox Y is always wrong
-                    if is_bijoy_font:
-                        # CRITICAL FIX: Use character origin from full page rawdict
-                        # For ANSI fonts with negative bbox Y, the origin Y is the true baseline
-                        try:
-                            # Get rawdict for ENTIRE page (clipping doesn't work with negative coords)
-                            raw_dict = page.get_text("rawdict")
-                            
-                            found_correction = False
-                            if raw_dict.get("blocks"):
-                                for block in raw_dict["blocks"]:
-                                    if block.get("lines"):
-                                        for line in block["lines"]:
-                                            if line.get("spans"):
-                                                for span in line["spans"]:
-                                                    chars = span.get("chars", [])
-                                                    if chars:
-                                                        # Find the character that matches our word X AND Y position
-                                                        for char in chars:
-                                                            char_bbox = char.get("bbox", [0, 0, 0, 0])
-                                                            # Check if this char is in our word range (match both X and Y)
-                                                            x_match = abs(char_bbox[0] - x0) < 1.0
-                                                            y_match = abs(char_bbox[1] - y0) < 5.0  # Allow 5pt tolerance for Y
-                                                            if x_match and y_match:
-                                                                origin = char.get("origin", [0, 0])
-                                                                origin_y = origin[1]
-                                                                
-                                                                # Calculate height from original bbox
-                                                                original_height = y1 - y0
-                                                                
-                                                                # Use origin Y as baseline (bottom)
-                                                                # Top = baseline - height
-                                                                corrected_bbox[0] = x0
-                                                                corrected_bbox[1] = origin_y - original_height  # top
-                                                                corrected_bbox[2] = x1
-                                                                corrected_bbox[3] = origin_y  # bottom (baseline)
-                                                                
-                                                                logger.info(f"ANSI bbox corrected: [{x0:.1f},{y0:.1f},{x1:.1f},{y1:.1f}] → [{corrected_bbox[0]:.1f},{corrected_bbox[1]:.1f},{corrected_bbox[2]:.1f},{corrected_bbox[3]:.1f}] (origin_y={origin_y:.1f})")
-                                                                found_correction = True
-                                                                break
-                                                        if found_correction:
-                                                            break
-                                            if found_correction:
-                                                break
-                                    if found_correction:
-                                        break
-                        except Exception as e:
-                            logger.warning(f"Could not correct ANSI bbox: {e}")
-                    
-                    text_block = {
-                        'id': f"word_{page_num}_{word_idx}",
-                        'text': word_text,
-                        'font': font_name,
-                        'size': round(font_size, 2),
-                        'color': self._rgb_to_hex(font_color),
-                        'flags': flags,
-                        'bbox': corrected_bbox,  # Use corrected bbox
-                        'origin': (corrected_bbox[0], corrected_bbox[3]),  # Bottom-left baseline
-                        'bold': bool(flags & 2**4),
-                        'italic': bool(flags & 2**1),
-                        'block_no': block_no,
-                        'line_no': line_no,
-                        'word_no': word_no,
-                        'is_word': True  # Mark as word-level (not span-level)
-                    }
-                    page_data['text_blocks'].append(text_block)
-                
-                # Extract images separately
-                blocks = page.get_text("dict")["blocks"]
-                for block_idx, block in enumerate(blocks):
-                    if "image" in block:  # Image block
-                        page_data['images'].append({
-                            'id': f"img_{page_num}_{block_idx}",
-                            'bbox': block["bbox"],
-                            'width': block.get("width", 0),
-                            'height': block.get("height", 0)
-                        })
-                
-                pdf_data['pages'].append(page_data)
+            if page_limit is not None:
+                font_labels = {}
+                for page_num in range(doc.page_count):
+                    page = doc[page_num]
+                    if page_num < page_limit:
+                        pdf_data['pages'].append(extract_page(page, page_num, font_labels))
+                    else:
+                        pdf_data['pages'].append(page_placeholder(page, page_num))
+                doc.close()
+            else:
+                doc.close()
+                pdf_data['pages'] = list(self.iter_pages(filepath))
             
-            doc.close()
+            for page in pdf_data['pages']:
+                if page['extracted']:
+                    merge_font_table(pdf_data['font_table'], page.pop('font_table'))
+
+            # ANSI bbox correction counters for the whole document
+            pdf_data['bbox_corrections'] = self.correction_totals(pdf_data['pages'])
+            logger.info(f"ANSI bbox correction: {pdf_data['bbox_corrections']['corrected']} corrected, "
+                        f"{pdf_data['bbox_corrections']['uncorrected']} uncorrected")
             return pdf_data
             
         except Exception as e:
             raise Exception(f"Error processing PDF: {str(e)}")
     
-    def render_page(self, filepath, page_number, zoom=1.0):
-        """Render a page as base64 encoded image"""
+    def iter_pages(self, filepath, start=0):
+        """
+        Yield the extracted pages of a PDF in page order
+        
+        Each page is yielded as soon as it is ready, so callers can stream
+        results while later pages are still being extracted. Pages before
+        start (already extracted by the caller) are skipped. Every page
+        carries its 'font_table' for the caller to merge.
+        """
+        doc = fitz.open(filepath)
+        page_count = doc.page_count
+        workers = self._extraction_workers(page_count - start)
+        
+        if workers > 1:
+            doc.close()
+            yield from self._iter_pages_parallel(filepath, page_count, workers, start)
+            return
+        
+        font_labels = {}
         try:
-            doc = fitz.open(filepath)
-            page = doc[page_number]
-            
-            # Render page to pixmap
-            mat = fitz.Matrix(zoom, zoom)
-            pix = page.get_pixmap(matrix=mat)
-            
-            # Convert to PNG
-            img_data = pix.tobytes("png")
-            
-            # Convert to base64
-            base64_data = base64.b64encode(img_data).decode('utf-8')
-            
+            for page_num in range(start, page_count):
+                yield extract_page(doc[page_num], page_num, font_labels)
+        finally:
             doc.close()
-            
-            return f"data:image/png;base64,{base64_data}"
+    
+    def correction_totals(self, pages):
+        """Sum the per-page ANSI bbox correction counters"""
+        return {
+            'corrected': sum(p['bbox_corrections']['corrected'] for p in pages),
+            'uncorrected': sum(p['bbox_corrections']['uncorrected'] for p in pages)
+        }
+    
+    def extract_page_text(self, filepath, page_number):
+        """Extract the text layer (and 'font_table') of a single page"""
+        try:
+            doc = fitz.open(filepath)
+            try:
+                return extract_page(doc[page_number], page_number)
+            finally:
+                doc.close()
+        except Exception as e:
+            raise Exception(f"Error extracting page text: {str(e)}")
+    
+    def _extraction_workers(self, page_count):
+        """Number of worker processes to use for a document (1 = serial)"""
+        workers = self.config.get('EXTRACTION_WORKERS', 1) or 1
+        min_pages = self.config.get('PARALLEL_EXTRACTION_MIN_PAGES', 50)
+        if page_count < min_pages:
+            return 1
+        return max(1, min(workers, page_count))
+    
+    def _iter_pages_parallel(self, filepath, page_count, workers, first_page=0):
+        """Extract pages first_page.. with a process pool, yielded in page order"""
+        # Several chunks per worker keep the pool busy when page costs differ
+        chunk_size = max(1, -(-(page_count - first_page) // (workers * 4)))
+        ranges = [(start, min(start + chunk_size, page_count))
+                  for start in range(first_page, page_count, chunk_size)]
+        
+        next_page = first_page
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(extract_page_range, filepath, start, stop)
+                           for start, stop in ranges]
+                for future in futures:
+                    for page in future.result():
+                        yield page
+                        next_page += 1
+            logger.info(f"Extracted {page_count - first_page} pages with {workers} worker processes")
+        except Exception as e:
+            logger.warning(f"Parallel extraction failed ({e}), falling back to serial extraction")
+            yield from extract_page_range(filepath, next_page, page_count)
+    
+    def render_page_png(self, filepath, page_number, zoom=1.0):
+        """Render a page as PNG bytes"""
+        return self._render_page_bytes(filepath, page_number, zoom, 'png')
+    
+    def render_page_preview(self, filepath, page_number, zoom=0.5, quality=60):
+        """Render a page as a small JPEG to show while the full image loads"""
+        return self._render_page_bytes(filepath, page_number, zoom, 'jpg', quality)
+    
+    def _render_page_bytes(self, filepath, page_number, zoom, output, jpg_quality=95):
+        try:
+            doc = fitz.open(filepath)
+            try:
+                page = doc[page_number]
+                
+                # Render page to pixmap
+                mat = fitz.Matrix(zoom, zoom)
+                pix = page.get_pixmap(matrix=mat)
+                
+                # Convert to PNG or JPEG
+                return pix.tobytes(output, jpg_quality=jpg_quality)
+            finally:
+                doc.close()
             
         except Exception as e:
             raise Exception(f"Error rendering page: {str(e)}")
     
+    def render_tile_png(self, filepath, page_number, zoom, column, row, tile_size=512):
+        """
+        Render one tile of a page as PNG bytes.
+        
+        At the given zoom the page is cut into tile_size x tile_size pixel
+        tiles, counted from the top left; only the tile's clip of the page
+        is rasterized (tiles in the last row and column are smaller).
+        """
+        try:
+            doc = fitz.open(filepath)
+            try:
+                page = doc[page_number]
+                rect = page.rect
+                step = tile_size / zoom
+                clip = fitz.Rect(rect.x0 + column * step, rect.y0 + row * step,
+                                 rect.x0 + (column + 1) * step, rect.y0 + (row + 1) * step) & rect
+                if clip.is_empty:
+                    raise ValueError(f"tile {column},{row} is outside the page")
+                
+                pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), clip=clip)
+                return pix.tobytes("png")
+            finally:
+                doc.close()
+            
+        except Exception as e:
+            raise Exception(f"Error rendering tile: {str(e)}")
+    
+    def render_page(self, filepath, page_number, zoom=1.0):
+        """Render a page as base64 encoded image"""
+        return png_data_url(self.render_page_png(filepath, page_number, zoom))
+    
     def save_pdf(self, input_path, output_path, modifications):
         """Apply all modifications and save PDF"""
         try:
@@ -281,9 +302,7 @@ class PDFProcessor:
     def _get_font_for_text(self, font_name, text):
         """Get appropriate font for text, prioritizing custom fonts for Bengali"""
         # Check if text contains Bengali characters
-        has_bengali = any('\u0980' <= c <= '\u09FF' for c in text)
-        
-        if has_bengali:
+        if has_bengali(text):
             # Try to find a matching custom Bengali font
             if font_name in self.custom_fonts:
                 return ('custom', self.custom_fonts[font_name])
@@ -320,7 +339,8 @@ class PDFProcessor:
                 # STEP 1: Get original font properties from the word's area
                 # GEMINI FIX: Always use original font size from PDF metadata
                 try:
-                    text_dict = page.get_text("dict", clip=word_rect)
+                    # Text-only flags: image blocks (and their bytes) are left out
+                    text_dict = page.get_text("dict", clip=word_rect, flags=fitz.TEXTFLAGS_TEXT)
                     span = text_dict["blocks"][0]["lines"][0]["spans"][0]
                     original_font_size = span.get("size", font_size)
                     original_color = span.get("color", 0)
@@ -351,11 +371,10 @@ class PDFProcessor:
                 # GEMINI RECOMMENDATION: Convert Unicode → Bijoy for Bijoy fonts!
                 
                 # Detect if text contains Bengali characters
-                is_bengali = any('\u0980' <= c <= '\u09FF' for c in new_text)
+                is_bengali = has_bengali(new_text)
                 
                 # Detect if this is a Bijoy font (SutonnyMJ, Sushree, etc.)
-                is_bijoy_font = font_name and any(bijoy_name in font_name.lower() for bijoy_name in 
-                    ['sutonnymj', 'sushree', 'solaimanlpi', 'nikosh', 'kalpurush', 'akaash'])
+                bijoy_font = is_bijoy_font(font_name)
                 
                 # Get font file path for Bengali support
                 font_path = None
@@ -365,11 +384,11 @@ class PDFProcessor:
                 # CRITICAL: If inserting Bengali Unicode text into a Bijoy font, CONVERT IT!
                 # Using professional converter as per Gemini recommendation
                 text_to_insert = new_text
-                if is_bengali and is_bijoy_font:
+                if is_bengali and bijoy_font:
                     logger.info(f"⚠️  Bijoy font detected: {font_name}")
                     logger.info(f"Converting Unicode '{new_text}' → Bijoy encoding...")
                     
-                    from backend.utils.unicode_to_bijoy_converter import unicode_to_bijoy
+                    from .unicode_to_bijoy_converter import unicode_to_bijoy
                     try:
                         text_to_insert = unicode_to_bijoy(new_text)
                         logger.info(f"✓ Converted Unicode→Bijoy: '{new_text}' → '{text_to_insert}'")
@@ -0,0 +1,238 @@
+"""
+Render Cache Module
+Keeps rendered page images in memory and on disk, keyed by session, page,
+zoom and page version
+"""
+
+import os
+import threading
+import logging
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+# Image formats the cache stores (render_key file extensions)
+IMAGE_EXTENSIONS = ('.png', '.jpg')
+
+
+def page_version(session, page_number):
+    """Edit count of a page in a session (0 for unedited pages and old sessions)"""
+    return session.get('page_versions', {}).get(str(page_number), 0)
+
+
+def render_key(session_id, page_number, zoom, version, tile=None, image_format='png'):
+    """
+    File name of one render of a page, or of one (column, row) tile of it.
+
+    Also serves as its HTTP entity tag: a page's image only changes when
+    its version does.
+    """
+    key = f'{session_id}-p{page_number}-z{float(zoom):g}-v{version}'
+    if tile is not None:
+        key += f'-t{tile[0]}_{tile[1]}'
+    return f'{key}.{image_format}'
+
+
+def bump_page_version(session, page_number):
+    """
+    Record an edit to a page, so renders of its old content are never served.
+
+    Versions live in the session (string keys, as JSON stores them).
+
+    Returns:
+        int: The page's new version
+    """
+    versions = session.setdefault('page_versions', {})
+    versions[str(page_number)] = versions.get(str(page_number), 0) + 1
+    return versions[str(page_number)]
+
+
+class RenderCache:
+    """
+    Two-tier cache of rendered page images and tiles (PNG or JPEG bytes).
+
+    The memory tier is an LRU of up to memory_bytes; the disk tier keeps
+    one file per entry up to disk_bytes and evicts the least recently used
+    files (oldest mtime; hits touch the file). A disk hit is copied back
+    into memory.
+
+    The page version is part of the key, so an edit only has to bump the
+    version of the pages it touched; invalidate() frees their old entries
+    right away instead of waiting for eviction.
+    """
+
+    def __init__(self, cache_folder='cache/render', memory_bytes=64 * 1024 * 1024,
+                 disk_bytes=500 * 1024 * 1024):
+        """
+        Initialize RenderCache.
+
+        Args:
+            cache_folder (str): Directory for the disk tier
+            memory_bytes (int): Size limit of the memory tier
+            disk_bytes (int): Size limit of the disk tier
+        """
+        self.cache_folder = cache_folder
+        self.memory_bytes = memory_bytes
+        self.disk_bytes = disk_bytes
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._memory = OrderedDict()
+        self._memory_size = 0
+        self._lock = threading.Lock()
+        os.makedirs(cache_folder, exist_ok=True)
+
+    def _get_filepath(self, key):
+        """Get file path for a cache key"""
+        return os.path.join(self.cache_folder, key)
+
+    def get(self, session_id, page_number, zoom, version, tile=None, image_format='png'):
+        """
+        Look up a rendered page (or tile; see render_key).
+
+        Returns:
+            bytes or None: Image data, None on a miss
+        """
+        key = render_key(session_id, page_number, zoom, version, tile, image_format)
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return data
+
+        filepath = self._get_filepath(key)
+        try:
+            with open(filepath, 'rb') as f:
+                data = f.read()
+            os.utime(filepath)
+        except FileNotFoundError:
+            data = None
+        except OSError as e:
+            logger.warning(f"Dropping unreadable render cache entry {filepath}: {e}")
+            self._remove(filepath)
+            data = None
+
+        with self._lock:
+            if data is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._remember(key, data)
+        return data
+
+    def put(self, session_id, page_number, zoom, version, data, tile=None, image_format='png'):
+        """Store a rendered page (or tile) in both tiers and enforce the size limits"""
+        key = render_key(session_id, page_number, zoom, version, tile, image_format)
+        with self._lock:
+            self._remember(key, data)
+
+        filepath = self._get_filepath(key)
+        tmp_path = f'{filepath}.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, filepath)
+        except OSError as e:
+            logger.error(f"Error writing render cache entry {filepath}: {e}", exc_info=True)
+            self._remove(tmp_path)
+            return False
+
+        self._evict_disk()
+        return True
+
+    def invalidate(self, session_id, page_number=None):
+        """
+        Drop the cached renders (and tiles) of one page, or of a whole session.
+
+        Returns:
+            int: Number of entries removed from either tier
+        """
+        prefix = f'{session_id}-' if page_number is None else f'{session_id}-p{page_number}-'
+        removed = 0
+        with self._lock:
+            for key in [key for key in self._memory if key.startswith(prefix)]:
+                self._memory_size -= len(self._memory.pop(key))
+                removed += 1
+
+        for filename in os.listdir(self.cache_folder):
+            if filename.startswith(prefix) and filename.endswith(IMAGE_EXTENSIONS):
+                if self._remove(os.path.join(self.cache_folder, filename)):
+                    removed += 1
+        return removed
+
+    def _remember(self, key, data):
+        """Add an entry to the memory tier (lock held) and evict down to memory_bytes"""
+        if len(data) > self.memory_bytes:
+            return
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_size -= len(old)
+        self._memory[key] = data
+        self._memory_size += len(data)
+        while self._memory_size > self.memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_size -= len(evicted)
+
+    def _disk_entries(self):
+        """(mtime, size, path) of every disk entry"""
+        entries = []
+        for filename in os.listdir(self.cache_folder):
+            if not filename.endswith(IMAGE_EXTENSIONS):
+                continue
+            filepath = os.path.join(self.cache_folder, filename)
+            try:
+                stat = os.stat(filepath)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, filepath))
+        return entries
+
+    def _evict_disk(self):
+        """Delete least recently used files until the disk tier fits disk_bytes"""
+        entries = self._disk_entries()
+        total = sum(size for _, size, _ in entries)
+
+        entries.sort()
+        for mtime, size, filepath in entries:
+            if total <= self.disk_bytes:
+                break
+            if self._remove(filepath):
+                total -= size
+                with self._lock:
+                    self.evictions += 1
+                logger.debug(f"Evicted render cache entry: {os.path.basename(filepath)}")
+
+    def _remove(self, filepath):
+        try:
+            os.remove(filepath)
+            return True
+        except OSError:
+            return False
+
+    def stats(self):
+        """
+        Get cache counters for monitoring.
+
+        Returns:
+            dict: hits per tier, misses, hit rate, evictions, and entries
+            and bytes held per tier
+        """
+        entries = self._disk_entries()
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': round(hits / lookups, 3) if lookups else 0.0,
+                'evictions': self.evictions,
+                'memory_entries': len(self._memory),
+                'memory_bytes': self._memory_size,
+                'max_memory_bytes': self.memory_bytes,
+                'disk_entries': len(entries),
+                'disk_bytes': sum(size for _, size, _ in entries),
+                'max_disk_bytes': self.disk_bytes
+            }
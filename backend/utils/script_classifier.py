@@ -0,0 +1,162 @@
+"""
+Script Classifier Module
+Table-driven detection of Bengali script and Bijoy (ANSI) encoding
+
+Bijoy fonts draw Bengali glyphs for ASCII and Latin-1 code points, so a
+word's encoding is decided from its font name and from which classes of
+characters it contains. Both are computed here once for extraction,
+editing and conversion.
+"""
+
+from functools import lru_cache
+
+# Character classes (bits of the mask returned by classify())
+ASCII_LETTER = 1
+ASCII_DIGIT = 2
+ASCII_OTHER = 4     # Space, punctuation and control characters
+LATIN1_HIGH = 8     # U+0080-U+00FF: Bijoy glyph codes in ANSI fonts
+BIJOY_MARK = 16     # Latin-1 codes only Bijoy text uses (© ¨ ¯ °)
+BENGALI = 32        # Unicode Bengali block U+0980-U+09FF
+OTHER = 64
+
+# Latin-1 characters that alone mark a span as Bijoy text
+BIJOY_MARK_CHARS = '©¨¯°'
+
+
+def _build_byte_classes():
+    table = []
+    for code in range(256):
+        char = chr(code)
+        if code < 128:
+            if char.isalpha():
+                cls = ASCII_LETTER
+            elif char.isdigit():
+                cls = ASCII_DIGIT
+            else:
+                cls = ASCII_OTHER
+        else:
+            cls = LATIN1_HIGH
+            if char in BIJOY_MARK_CHARS:
+                cls |= BIJOY_MARK
+        table.append(cls)
+    return table
+
+
+# Class of every code point below 256
+BYTE_CLASSES = _build_byte_classes()
+
+# str.translate() table mapping every code point below 256 to its class,
+# stored as a single character (classes fit in a byte)
+_CLASS_TRANSLATION = [chr(cls) for cls in BYTE_CLASSES]
+
+# Font families whose text is Bijoy encoded, matched as substrings of the
+# lowercased font name (subset prefixes and style suffixes don't matter)
+BIJOY_FONT_FAMILIES = (
+    'sutonnymj', 'sushree', 'solaiman', 'nikosh', 'kalpurush',
+    'akaash', 'likhan', 'siyam', 'ekushey'
+)
+
+ENCODING_BIJOY = 'bijoy'
+ENCODING_UNICODE = 'unicode'
+
+# Labels of a document's font table (see font_class())
+FONT_UNICODE_BENGALI = 'unicode_bengali'
+FONT_BIJOY = 'bijoy'
+FONT_LATIN = 'latin'
+
+
+def classify(text):
+    """
+    Classify a span of text in one pass.
+
+    Every code point below 256 is mapped to its class by one C-level
+    str.translate() over the span; only the distinct remaining characters
+    are looked at individually.
+
+    Args:
+        text (str): Text of a word or span
+
+    Returns:
+        int: OR of the classes of all characters (0 for empty text)
+    """
+    mask = 0
+    for char in set(text.translate(_CLASS_TRANSLATION)):
+        code = ord(char)
+        if code < 256:
+            mask |= code
+        elif 0x0980 <= code <= 0x09FF:
+            mask |= BENGALI
+        else:
+            mask |= OTHER
+    return mask
+
+
+def has_bengali(text):
+    """Check if text contains Unicode Bengali characters"""
+    return bool(classify(text) & BENGALI)
+
+
+def is_bijoy_text(text):
+    """
+    Detect if text is in Bijoy encoding.
+
+    Bijoy text contains 'Av' (আ), one of the marks in BIJOY_MARK_CHARS, or
+    ASCII letters mixed with Latin-1 glyph codes. (A Bijoy font name
+    inside the text also counts, as it always has.)
+    """
+    mask = classify(text)
+    if mask & BIJOY_MARK or 'Av' in text:
+        return True
+    if not mask & ASCII_LETTER:
+        return False
+    if mask & LATIN1_HIGH:
+        return True
+    lowered = text.lower()
+    return any(font in lowered for font in ('sutonnymj', 'solaiman', 'kalpurush'))
+
+
+@lru_cache(maxsize=4096)
+def font_encoding(font_name):
+    """
+    Get the text encoding of a font.
+
+    Args:
+        font_name (str): Font name as reported by the PDF
+
+    Returns:
+        str: ENCODING_BIJOY or ENCODING_UNICODE
+    """
+    lowered = (font_name or '').lower()
+    if any(family in lowered for family in BIJOY_FONT_FAMILIES):
+        return ENCODING_BIJOY
+    return ENCODING_UNICODE
+
+
+def is_bijoy_font(font_name):
+    """Check if a font name belongs to a Bijoy font"""
+    return font_encoding(font_name) == ENCODING_BIJOY
+
+
+def font_class(font_name, codepoints=()):
+    """
+    Label a font for the per-document font table.
+
+    A font whose cmap covers the Bengali block holds Unicode Bengali text,
+    whatever its name: Nikosh, Kalpurush, SolaimanLipi and Siyam Rupali
+    ship both as Bijoy and as Unicode fonts. Otherwise Bijoy fonts are
+    recognised by name: they map Bengali glyphs onto ASCII and Latin-1
+    codes, so their cmap looks like any Latin font's.
+
+    Args:
+        font_name (str): Font name without the subset prefix
+        codepoints: Unicode code points the font's cmap covers (empty
+            for fonts that are not embedded)
+
+    Returns:
+        str: FONT_BIJOY, FONT_UNICODE_BENGALI or FONT_LATIN
+    """
+    if any(0x0980 <= code <= 0x09FF for code in codepoints):
+        return FONT_UNICODE_BENGALI
+    if is_bijoy_font(font_name):
+        return FONT_BIJOY
+    return FONT_LATIN
@@ -0,0 +1,108 @@
+"""
+Text Conversion Module
+Bulk Bijoy <-> Unicode conversion of plain text in ordered chunks
+"""
+
+import codecs
+import logging
+from concurrent.futures import ProcessPoolExecutor
+
+from .bijoy_codec import (BIJOY_BOUNDARY, DECODING_TABLE, UNICODE_BOUNDARY,
+                          bijoy_to_unicode, unicode_to_bijoy)
+
+logger = logging.getLogger(__name__)
+
+BIJOY_TO_UNICODE = 'bijoy-to-unicode'
+UNICODE_TO_BIJOY = 'unicode-to-bijoy'
+
+# Direction -> (boundary that chunks may end at, chunk converter)
+DIRECTIONS = {
+    BIJOY_TO_UNICODE: (BIJOY_BOUNDARY, bijoy_to_unicode),
+    UNICODE_TO_BIJOY: (UNICODE_BOUNDARY, unicode_to_bijoy),
+}
+
+
+def decode_input(data, direction):
+    """
+    Decode an uploaded text file.
+
+    UTF-8 is tried first (a BOM is dropped). Bijoy files that are not
+    UTF-8 are ANSI, and are read as Windows-1252 like the 'bijoy' codec
+    reads them; Unicode input has to be UTF-8.
+
+    Raises:
+        UnicodeDecodeError: Unicode input that is not UTF-8
+    """
+    try:
+        return data.decode('utf-8-sig')
+    except UnicodeDecodeError:
+        if direction != BIJOY_TO_UNICODE:
+            raise
+        return codecs.charmap_decode(data, 'strict', DECODING_TABLE)[0]
+
+
+def split_chunks(text, direction, chunk_chars):
+    """
+    Split text into chunks of about chunk_chars characters.
+
+    Each chunk ends at a whitespace boundary where the conversion can be
+    split: converting the chunks one by one gives the same text as the
+    'bijoy' codec's incremental decoder or encoder.
+
+    Returns:
+        list: Chunks in order; they join back to text
+    """
+    boundary = DIRECTIONS[direction][0]
+    chunks = []
+    start = 0
+    while len(text) - start > chunk_chars:
+        match = boundary.search(text, start + chunk_chars)
+        if match is None:
+            break
+        chunks.append(text[start:match.end()])
+        start = match.end()
+    if start < len(text):
+        chunks.append(text[start:])
+    return chunks
+
+
+def iter_converted(text, direction, workers=1, chunk_chars=64 * 1024):
+    """
+    Convert text chunk by chunk, yielding converted chunks in order.
+
+    With more than one chunk and worker, chunks are converted by a
+    process pool while earlier results are already being yielded.
+
+    Args:
+        text (str): Text to convert
+        direction (str): BIJOY_TO_UNICODE or UNICODE_TO_BIJOY
+        workers (int): Worker processes (1 = convert in this process)
+        chunk_chars (int): Approximate chunk length in characters
+    """
+    convert = DIRECTIONS[direction][1]
+    chunks = split_chunks(text, direction, chunk_chars)
+    workers = max(1, min(workers or 1, len(chunks)))
+
+    if workers == 1:
+        for chunk in chunks:
+            yield convert(chunk)
+        return
+
+    next_chunk = 0
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            try:
+                for converted in executor.map(convert, chunks):
+                    yield converted
+                    next_chunk += 1
+            except GeneratorExit:
+                # The consumer went away (client disconnected)
+                executor.shutdown(cancel_futures=True)
+                raise
+        logger.info(f"Converted {len(chunks)} chunks with {workers} worker processes")
+    except GeneratorExit:
+        raise
+    except Exception as e:
+        logger.warning(f"Parallel conversion failed ({e}), converting the rest serially")
+        for chunk in chunks[next_chunk:]:
+            yield convert(chunk)
@@ -0,0 +1,245 @@
+"""
+Text Layer Module
+Compact columnar storage for the word-level text layer of a page
+"""
+
+import base64
+import sys
+from array import array
+
+# Bits of PageTextLayer.marks
+MARK_BIJOY = 1
+
+# Column name -> array typecode. Coordinates and sizes are single
+# precision: MuPDF computes them as C floats, so float32 holds the
+# extracted values exactly.
+NUMERIC_COLUMNS = {
+    'bboxes': 'f',      # x0, y0, x1, y1 per word
+    'sizes': 'f',
+    'font_ids': 'H',    # index into fonts
+    'color_ids': 'H',   # index into colors
+    'flags': 'I',       # PDF span flags (bold = 16, italic = 2)
+    'marks': 'B',       # MARK_* bits
+    'block_nos': 'I',
+    'line_nos': 'I',
+    'word_nos': 'I',
+}
+
+# Key that marks a serialized PageTextLayer in stored JSON
+STORAGE_KEY = '__text_layer__'
+
+
+class PageTextLayer:
+    """
+    Words of one page stored column by column.
+
+    Instead of one 15-key dict per word, each attribute lives in a typed
+    array (or a list for the strings) and font names and colors are
+    interned in small per-page tables. The dicts the frontend expects are
+    only built by to_dicts() when a page is sent to the client.
+    """
+
+    __slots__ = ('page_number', 'texts', 'original_texts', 'fonts', 'colors',
+                 '_font_ids_by_name', '_color_ids_by_value') + tuple(NUMERIC_COLUMNS)
+
+    def __init__(self, page_number):
+        self.page_number = page_number
+        self.texts = []
+        self.original_texts = None  # Set once the text has been converted
+        self.fonts = []
+        self.colors = []
+        self._font_ids_by_name = {}
+        self._color_ids_by_value = {}
+        for name, typecode in NUMERIC_COLUMNS.items():
+            setattr(self, name, array(typecode))
+
+    def __len__(self):
+        return len(self.texts)
+
+    def append(self, text, font, size, color, flags, bbox, block_no, line_no, word_no):
+        """Add a word; color is the hex string sent to the client"""
+        self.texts.append(text)
+        self.font_ids.append(self._intern_font(font))
+        self.color_ids.append(self._intern_color(color))
+        self.sizes.append(size)
+        self.flags.append(flags)
+        self.marks.append(0)
+        self.bboxes.extend(bbox)
+        self.block_nos.append(block_no)
+        self.line_nos.append(line_no)
+        self.word_nos.append(word_no)
+
+    def _intern_font(self, font):
+        font_id = self._font_ids_by_name.get(font)
+        if font_id is None:
+            font_id = self._font_ids_by_name[font] = len(self.fonts)
+            self.fonts.append(font)
+        return font_id
+
+    def _intern_color(self, color):
+        color_id = self._color_ids_by_value.get(color)
+        if color_id is None:
+            color_id = self._color_ids_by_value[color] = len(self.colors)
+            self.colors.append(color)
+        return color_id
+
+    def font_of(self, index):
+        """Font name of the word at index"""
+        return self.fonts[self.font_ids[index]]
+
+    def block_id(self, index):
+        """Client-side ID of the word at index"""
+        return f"word_{self.page_number}_{index}"
+
+    def index_of(self, block_id):
+        """Index of the word with the given client-side ID, or None"""
+        prefix = f"word_{self.page_number}_"
+        if not isinstance(block_id, str) or not block_id.startswith(prefix):
+            return None
+        try:
+            index = int(block_id[len(prefix):])
+        except ValueError:
+            return None
+        return index if 0 <= index < len(self) else None
+
+    def set_bijoy(self, index, is_bijoy=True):
+        """Record whether the original text of a word was Bijoy encoded"""
+        if is_bijoy:
+            self.marks[index] |= MARK_BIJOY
+        else:
+            self.marks[index] &= ~MARK_BIJOY & 0xFF
+
+    def update_word(self, index, text, font, size, color):
+        """Apply an edit to the word at index"""
+        self.texts[index] = text
+        self.font_ids[index] = self._intern_font(font)
+        self.color_ids[index] = self._intern_color(color)
+        self.sizes[index] = size if size is not None else 0.0
+
+    def to_dicts(self):
+        """
+        Build the per-word dicts sent to the client.
+
+        Returns:
+            list: One dict per word with the same keys the extractor used
+            to produce ('original_text' and 'is_bijoy' once converted)
+        """
+        blocks = []
+        bboxes = self.bboxes
+        converted = self.original_texts is not None
+        for i, text in enumerate(self.texts):
+            flags = self.flags[i]
+            bbox = [bboxes[4 * i], bboxes[4 * i + 1], bboxes[4 * i + 2], bboxes[4 * i + 3]]
+            block = {
+                'id': f"word_{self.page_number}_{i}",
+                'text': text,
+                'font': self.fonts[self.font_ids[i]],
+                'size': round(self.sizes[i], 2),
+                'color': self.colors[self.color_ids[i]],
+                'flags': flags,
+                'bbox': bbox,
+                'origin': (bbox[0], bbox[3]),  # Bottom-left baseline
+                'bold': bool(flags & 2**4),
+                'italic': bool(flags & 2**1),
+                'block_no': self.block_nos[i],
+                'line_no': self.line_nos[i],
+                'word_no': self.word_nos[i],
+                'is_word': True
+            }
+            if converted:
+                block['original_text'] = self.original_texts[i]
+                block['is_bijoy'] = bool(self.marks[i] & MARK_BIJOY)
+            blocks.append(block)
+        return blocks
+
+    @classmethod
+    def from_dicts(cls, page_number, blocks):
+        """Build a layer from per-word dicts (sessions saved before the columnar layout)"""
+        layer = cls(page_number)
+        for block in blocks:
+            layer.append(
+                block.get('text', ''),
+                block.get('font', ''),
+                block.get('size') or 0.0,
+                block.get('color', '#000000'),
+                block.get('flags', 0),
+                block.get('bbox', [0, 0, 0, 0]),
+                block.get('block_no', 0),
+                block.get('line_no', 0),
+                block.get('word_no', 0)
+            )
+        if blocks and all('original_text' in block for block in blocks):
+            layer.original_texts = [block['original_text'] for block in blocks]
+            for i, block in enumerate(blocks):
+                layer.set_bijoy(i, block.get('is_bijoy', False))
+        return layer
+
+    def to_storage(self):
+        """
+        Serialize to a JSON-compatible dict.
+
+        Numeric columns are stored as base64 of their little-endian bytes,
+        which is much smaller and faster to write than JSON number lists.
+        """
+        data = {
+            STORAGE_KEY: 1,
+            'page_number': self.page_number,
+            'texts': self.texts,
+            'original_texts': self.original_texts,
+            'fonts': self.fonts,
+            'colors': self.colors,
+        }
+        for name in NUMERIC_COLUMNS:
+            column = getattr(self, name)
+            if sys.byteorder != 'little':
+                column = array(column.typecode, column)
+                column.byteswap()
+            data[name] = base64.b64encode(column.tobytes()).decode('ascii')
+        return data
+
+    @classmethod
+    def from_storage(cls, data):
+        """Inverse of to_storage()"""
+        layer = cls(data['page_number'])
+        layer.texts = data['texts']
+        layer.original_texts = data['original_texts']
+        layer.fonts = data['fonts']
+        layer.colors = data['colors']
+        layer._font_ids_by_name = {font: i for i, font in enumerate(layer.fonts)}
+        layer._color_ids_by_value = {color: i for i, color in enumerate(layer.colors)}
+        for name, typecode in NUMERIC_COLUMNS.items():
+            column = array(typecode)
+            column.frombytes(base64.b64decode(data[name]))
+            if sys.byteorder != 'little':
+                column.byteswap()
+            setattr(layer, name, column)
+        return layer
+
+
+def api_default(obj):
+    """json default hook for responses: text layers become per-word dicts"""
+    if isinstance(obj, PageTextLayer):
+        return obj.to_dicts()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def storage_default(obj):
+    """json default hook for session and cache files"""
+    if isinstance(obj, PageTextLayer):
+        return obj.to_storage()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def storage_object_hook(obj):
+    """
+    json object_hook for session and cache files.
+
+    Restores stored text layers, and converts the per-word dict lists of
+    pages saved before the columnar layout.
+    """
+    if STORAGE_KEY in obj:
+        return PageTextLayer.from_storage(obj)
+    blocks = obj.get('text_blocks')
+    if isinstance(blocks, list) and 'page_number' in obj:
+        obj['text_blocks'] = PageTextLayer.from_dicts(obj['page_number'], blocks)
+    return obj
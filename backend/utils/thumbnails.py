@@ -0,0 +1,221 @@
+"""
+Thumbnail Module
+Renders page thumbnails into WebP sprite sheets with a JSON index
+"""
+
+import json
+import os
+import shutil
+import threading
+import time
+import logging
+from concurrent.futures import ProcessPoolExecutor
+
+import fitz  # PyMuPDF
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+INDEX_NAME = 'index.json'
+
+# Thumbnails per row of a sprite sheet
+SHEET_COLUMNS = 10
+
+
+def render_sprite_sheet(filepath, sheet_path, start, stop, width, quality=80):
+    """
+    Render pages [start, stop) at a fixed width into one sprite sheet.
+
+    Runs inside worker processes: the document is opened by path and only
+    the sheet's index entry comes back. Thumbnails are laid out in rows of
+    SHEET_COLUMNS cells of the widest and tallest thumbnail.
+
+    Returns:
+        dict: Sheet size and the offset and size of every page in it
+    """
+    doc = fitz.open(filepath)
+    try:
+        thumbnails = []
+        for page_num in range(start, stop):
+            page = doc[page_num]
+            zoom = width / page.rect.width
+            pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+            thumbnails.append(Image.frombytes('RGB', (pix.width, pix.height), pix.samples))
+    finally:
+        doc.close()
+
+    cell_width = max(thumbnail.width for thumbnail in thumbnails)
+    cell_height = max(thumbnail.height for thumbnail in thumbnails)
+    columns = min(SHEET_COLUMNS, len(thumbnails))
+    rows = -(-len(thumbnails) // columns)
+    sheet = Image.new('RGB', (columns * cell_width, rows * cell_height), 'white')
+
+    pages = []
+    for i, thumbnail in enumerate(thumbnails):
+        x = (i % columns) * cell_width
+        y = (i // columns) * cell_height
+        sheet.paste(thumbnail, (x, y))
+        pages.append({'page_number': start + i, 'x': x, 'y': y,
+                      'width': thumbnail.width, 'height': thumbnail.height})
+
+    tmp_path = f'{sheet_path}.{os.getpid()}.tmp'
+    sheet.save(tmp_path, 'WEBP', quality=quality)
+    os.replace(tmp_path, sheet_path)
+    return {'width': sheet.width, 'height': sheet.height, 'pages': pages}
+
+
+class ThumbnailService:
+    """
+    Builds and serves the thumbnails of uploaded documents.
+
+    Every page is rendered at the same width and packed into WebP sprite
+    sheets of per_sheet pages, so a page navigator loads a handful of
+    images instead of one per page. The sheets of a document are rendered
+    by a process pool on a background thread; index.json is written last
+    and lists each sheet with the position of every page in it. A failed
+    build is remembered, so callers can report it instead of retrying.
+    """
+
+    def __init__(self, thumbnail_folder='cache/thumbnails', workers=1, width=120, per_sheet=50):
+        """
+        Initialize ThumbnailService.
+
+        Args:
+            thumbnail_folder (str): Directory for the per-session sheets
+            workers (int): Worker processes per document (1 = serial)
+            width (int): Thumbnail width in pixels
+            per_sheet (int): Thumbnails per sprite sheet
+        """
+        self.thumbnail_folder = thumbnail_folder
+        self.workers = workers
+        self.width = width
+        self.per_sheet = per_sheet
+        self._building = set()
+        self._failed = {}
+        self._lock = threading.Lock()
+        os.makedirs(thumbnail_folder, exist_ok=True)
+
+    def _session_folder(self, session_id):
+        return os.path.join(self.thumbnail_folder, session_id)
+
+    def sheet_path(self, session_id, sheet_number):
+        """Get file path of a sprite sheet"""
+        return os.path.join(self._session_folder(session_id), f'sheet-{sheet_number}.webp')
+
+    def is_building(self, session_id):
+        """Check if the thumbnails of a session are being rendered"""
+        with self._lock:
+            return session_id in self._building
+
+    def failure(self, session_id):
+        """Error message of the session's last build, None unless it failed"""
+        with self._lock:
+            return self._failed.get(session_id)
+
+    def start(self, session_id, filepath):
+        """
+        Build the thumbnails of a document on a background thread.
+
+        Returns:
+            bool: False if a build for the session is already running
+        """
+        with self._lock:
+            if session_id in self._building:
+                return False
+            self._building.add(session_id)
+            self._failed.pop(session_id, None)
+
+        threading.Thread(target=self._build_and_release, args=(session_id, filepath),
+                         daemon=True, name=f"Thumbnails-{session_id[:8]}").start()
+        return True
+
+    def _build_and_release(self, session_id, filepath):
+        try:
+            self.build(session_id, filepath)
+        except Exception as e:
+            logger.error(f"Thumbnail build failed for session {session_id}: {e}", exc_info=True)
+            with self._lock:
+                self._failed[session_id] = str(e)
+        finally:
+            with self._lock:
+                self._building.discard(session_id)
+
+    def build(self, session_id, filepath):
+        """
+        Render all sprite sheets of a document and write its index.
+
+        Returns:
+            dict: The index (also written to index.json)
+        """
+        started = time.perf_counter()
+        doc = fitz.open(filepath)
+        page_count = doc.page_count
+        doc.close()
+
+        folder = self._session_folder(session_id)
+        os.makedirs(folder, exist_ok=True)
+        ranges = [(start, min(start + self.per_sheet, page_count))
+                  for start in range(0, page_count, self.per_sheet)]
+        jobs = [(filepath, self.sheet_path(session_id, number), start, stop, self.width)
+                for number, (start, stop) in enumerate(ranges)]
+
+        sheets = []
+        workers = max(1, min(self.workers, len(jobs)))
+        if workers > 1:
+            try:
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    futures = [executor.submit(render_sprite_sheet, *job) for job in jobs]
+                    for future in futures:
+                        sheets.append(future.result())
+            except Exception as e:
+                logger.warning(f"Parallel thumbnail rendering failed ({e}), rendering the rest serially")
+        for job in jobs[len(sheets):]:
+            sheets.append(render_sprite_sheet(*job))
+
+        index = {
+            'thumbnail_width': self.width,
+            'page_count': page_count,
+            'sheets': [dict(sheet, sheet_number=number) for number, sheet in enumerate(sheets)]
+        }
+        tmp_path = os.path.join(folder, f'{INDEX_NAME}.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f)
+        os.replace(tmp_path, os.path.join(folder, INDEX_NAME))
+
+        logger.info(f"Rendered {page_count} thumbnails into {len(sheets)} sheets "
+                    f"with {workers} workers in {time.perf_counter() - started:.2f}s")
+        return index
+
+    def get_index(self, session_id):
+        """
+        Get the thumbnail index of a session.
+
+        Returns:
+            dict or None: The index, None if the thumbnails are not built yet
+        """
+        try:
+            with open(os.path.join(self._session_folder(session_id), INDEX_NAME), encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def cleanup(self, max_age_hours=24):
+        """
+        Delete the thumbnails of sessions older than max_age_hours.
+
+        Returns:
+            int: Number of sessions whose thumbnails were deleted
+        """
+        cutoff = time.time() - max_age_hours * 3600
+        deleted = 0
+        for session_id in os.listdir(self.thumbnail_folder):
+            folder = self._session_folder(session_id)
+            try:
+                if os.path.isdir(folder) and os.path.getmtime(folder) < cutoff and not self.is_building(session_id):
+                    shutil.rmtree(folder)
+                    with self._lock:
+                        self._failed.pop(session_id, None)
+                    deleted += 1
+            except OSError as e:
+                logger.warning(f"Could not delete thumbnails {folder}: {e}")
+        return deleted
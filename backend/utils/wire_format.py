@@ -0,0 +1,158 @@
+"""
+Wire Format Module
+Packed binary encoding of API responses that carry page text layers
+
+Clients opt in with "Accept: application/vnd.bangla-pdf.textlayer"; every
+other client keeps getting JSON. The layout (all integers little-endian,
+every section starts on a 4-byte boundary):
+
+    0   4 bytes   magic b'BTXL'
+    4   uint16    format version (WIRE_VERSION)
+    6   uint16    reserved (0)
+    8   uint32    header length in bytes
+    12  header    UTF-8 JSON, space padded to a multiple of 4:
+                  {"fonts": [...], "colors": [...], "payload": {...}}
+    ... body
+
+"payload" is the JSON response with every text layer replaced by a
+descriptor {"count", "offset", "text_bytes", "original_bytes"}; offset is
+relative to the start of the body. "fonts" and "colors" are shared by all
+pages of the response. A page's section holds, in order:
+
+    float32[4n] bboxes        uint32[n] block_nos       uint16[n] font_ids
+    float32[n]  sizes         uint32[n] line_nos        uint16[n] color_ids
+    uint32[n]   flags         uint32[n] word_nos        uint8[n]  marks
+    uint32[n]   text_ends     uint32[n] original_ends (only if converted)
+    UTF-8 text table          UTF-8 original text table (only if converted)
+
+The *_ends arrays are end offsets of each word in the decoded string table,
+counted in UTF-16 code units, so a browser decodes each table with a single
+TextDecoder call and slices words out with substring().
+"""
+
+import json
+import struct
+import sys
+from array import array
+
+from .text_layer import PageTextLayer
+
+WIRE_MIMETYPE = 'application/vnd.bangla-pdf.textlayer'
+WIRE_MAGIC = b'BTXL'
+WIRE_VERSION = 1
+
+
+def encode_response(payload):
+    """
+    Encode a JSON-compatible response containing PageTextLayers.
+
+    Args:
+        payload (dict): Response body as it would be passed to jsonify()
+
+    Returns:
+        bytes: The packed response
+    """
+    encoder = _Encoder()
+    payload_json = json.dumps(payload, ensure_ascii=False, default=encoder.default)
+    header = '{"fonts": %s, "colors": %s, "payload": %s}' % (
+        json.dumps(encoder.fonts, ensure_ascii=False),
+        json.dumps(encoder.colors, ensure_ascii=False),
+        payload_json
+    )
+    header_bytes = header.encode('utf-8')
+    header_bytes += b' ' * (-len(header_bytes) % 4)
+
+    return b''.join([
+        WIRE_MAGIC,
+        struct.pack('<HHI', WIRE_VERSION, 0, len(header_bytes)),
+        header_bytes,
+        bytes(encoder.body)
+    ])
+
+
+class _Encoder:
+    """json default hook that moves text layers into the binary body"""
+
+    def __init__(self):
+        self.fonts = []
+        self.colors = []
+        self.font_ids = {}
+        self.color_ids = {}
+        self.body = bytearray()
+
+    def default(self, obj):
+        if isinstance(obj, PageTextLayer):
+            return self._encode_layer(obj)
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+    def _document_ids(self, table, ids, values):
+        """Map a page's interned table onto the document-wide one"""
+        mapping = []
+        for value in values:
+            doc_id = ids.get(value)
+            if doc_id is None:
+                doc_id = ids[value] = len(table)
+                table.append(value)
+            mapping.append(doc_id)
+        return mapping
+
+    def _encode_layer(self, layer):
+        font_map = self._document_ids(self.fonts, self.font_ids, layer.fonts)
+        color_map = self._document_ids(self.colors, self.color_ids, layer.colors)
+        converted = layer.original_texts is not None
+
+        text_ends, text_bytes = _string_table(layer.texts)
+        columns = [
+            layer.bboxes,
+            layer.sizes,
+            layer.flags,
+            layer.block_nos,
+            layer.line_nos,
+            layer.word_nos,
+            text_ends
+        ]
+        if converted:
+            original_ends, original_bytes = _string_table(layer.original_texts)
+            columns.append(original_ends)
+        columns += [
+            array('H', [font_map[i] for i in layer.font_ids]),
+            array('H', [color_map[i] for i in layer.color_ids]),
+            layer.marks
+        ]
+
+        descriptor = {
+            'count': len(layer),
+            'offset': len(self.body),
+            'text_bytes': len(text_bytes),
+            'original_bytes': len(original_bytes) if converted else None
+        }
+
+        for column in columns:
+            self._write(_little_endian(column))
+        self._write(text_bytes)
+        if converted:
+            self._write(original_bytes)
+        return descriptor
+
+    def _write(self, data):
+        self.body += data
+        self.body += b'\0' * (-len(self.body) % 4)
+
+
+def _string_table(texts):
+    """Concatenate texts into UTF-8 bytes plus UTF-16 end offsets"""
+    ends = array('I')
+    end = 0
+    for text in texts:
+        text = text or ''
+        # Offsets count UTF-16 code units, like JavaScript string indices
+        end += len(text.encode('utf-16-le')) // 2
+        ends.append(end)
+    return ends, ''.join(text or '' for text in texts).encode('utf-8')
+
+
+def _little_endian(column):
+    if sys.byteorder != 'little' and column.itemsize > 1:
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column.tobytes()
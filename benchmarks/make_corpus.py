@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Synthetic Bangla corpus for the converter benchmark
+Regenerates benchmarks/corpus/ (deterministic; run from the project root)
+
+Each corpus is written twice, one item per line: as Unicode text
+(<name>.unicode.txt) and converted to Bijoy (<name>.bijoy.txt).
+"""
+
+import os
+import random
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from utils.unicode_to_bijoy_converter import unicode_to_bijoy
+
+CORPUS_DIR = os.path.join(os.path.dirname(__file__), 'corpus')
+
+COMMON_WORDS = (
+    'আমি তুমি সে আমরা তারা বাংলা ভাষা দেশ মানুষ সরকার শিক্ষা মন্ত্রণালয় প্রতিনিধি '
+    'কর্মকর্তা স্বাধীনতা জনসংখ্যা প্রায় কোটি গান গাই বই পড়ি লিখি নদী পাখি আকাশ '
+    'সূর্য চাঁদ বৃষ্টি গ্রাম শহর বাজার রাস্তা বিদ্যালয় ছাত্র শিক্ষক পরীক্ষা উত্তর '
+    'প্রশ্ন সময় দিন রাত সকাল বিকাল খবর পত্রিকা অর্থনীতি উন্নয়ন প্রযুক্তি বিজ্ঞান '
+    'স্বাস্থ্য হাসপাতাল ডাক্তার রোগী ঔষধ কৃষক ধান চাল মাছ ভাত ডাল পানি বাড়ি ঘর '
+    'দরজা জানালা এবং কিন্তু অথবা যদি তবে কারণ জন্য সঙ্গে থেকে পর্যন্ত মধ্যে উপর '
+    'নিচে কোটি টাকা বছর মাস সপ্তাহ আজ কাল ১৭ ২০২৪ ৫০০'
+).split()
+
+CONJUNCT_WORDS = (
+    'আকাঙ্ক্ষা সম্ভ্রম উচ্ছ্বাস স্বাস্থ্য রাষ্ট্র মন্ত্রী যন্ত্র বিজ্ঞপ্তি সংক্ষিপ্ত কৃষ্ণ '
+    'তীক্ষ্ণ লক্ষ্মী স্পষ্ট ক্ষুদ্র দ্বন্দ্ব উজ্জ্বল শৃঙ্খলা সঙ্ক্রান্তি ব্যঞ্জন প্রত্যক্ষ '
+    'আন্তর্জাতিক নিষ্ক্রিয় উৎকর্ষ সৌন্দর্য ঐতিহ্য ধর্ম কর্ম মর্যাদা পর্যবেক্ষণ দৃষ্টিভঙ্গি '
+    'সম্প্রদায় মুক্তিযুদ্ধ বিশ্ববিদ্যালয় স্থাপত্য ছন্দ গ্রন্থ শ্রদ্ধা স্মৃতি জ্যোৎস্না দুঃখ '
+    'ক্ষমতা বক্তৃতা মধ্যস্থতা সন্ধ্যা স্বপ্ন ইন্দ্রিয় কেন্দ্রীয় অস্ত্র বস্ত্র শাস্ত্র'
+).split()
+
+
+def sentence(rng, words):
+    text = ' '.join(rng.choice(words) for _ in range(rng.randint(5, 14)))
+    if rng.random() < 0.4:
+        text = text.replace(' ', ', ', 1)
+    return text + '।'
+
+
+def build(seed=2024):
+    """Return {corpus name: list of Unicode items}"""
+    rng = random.Random(seed)
+    return {
+        'short_words': [rng.choice(COMMON_WORDS) for _ in range(4000)],
+        'paragraphs': [' '.join(sentence(rng, COMMON_WORDS + CONJUNCT_WORDS)
+                                for _ in range(rng.randint(6, 16)))
+                       for _ in range(40)],
+        'conjuncts': [rng.choice(CONJUNCT_WORDS) for _ in range(3000)],
+    }
+
+
+def main():
+    os.makedirs(CORPUS_DIR, exist_ok=True)
+    for name, items in build().items():
+        for suffix, lines in (('unicode', items), ('bijoy', [unicode_to_bijoy(item) for item in items])):
+            path = os.path.join(CORPUS_DIR, f'{name}.{suffix}.txt')
+            with open(path, 'w', encoding='utf-8', newline='\n') as f:
+                f.write('\n'.join(lines) + '\n')
+            print(f"{path}: {len(lines)} items, {sum(map(len, lines))} characters")
+
+
+if __name__ == '__main__':
+    main()
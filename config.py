@@ -26,6 +26,7 @@ class Config:
     SESSION_FOLDER = 'sessions'
     EXPORT_FOLDER = 'exports'
     FONTS_FOLDER = 'fonts'
+    CACHE_FOLDER = 'cache'
     
     # Session
     SESSION_TIMEOUT = 3600  # 1 hour in seconds
@@ -43,6 +44,43 @@ class Config:
     MAX_DPI = 300
     MIN_DPI = 72
     
+    # Parallel text extraction (documents smaller than the threshold are
+    # extracted serially on the request thread)
+    EXTRACTION_WORKERS = int(os.environ.get('EXTRACTION_WORKERS', os.cpu_count() or 1))
+    PARALLEL_EXTRACTION_MIN_PAGES = 50
+    
+    # Bulk text conversion (/api/convert/...): texts shorter than the
+    # threshold are converted on the request thread
+    CONVERT_WORKERS = int(os.environ.get('CONVERT_WORKERS', os.cpu_count() or 1))
+    CONVERT_CHUNK_CHARS = 64 * 1024
+    PARALLEL_CONVERT_MIN_CHARS = 256 * 1024
+    
+    # Lazy uploads extract only this many pages up front
+    LAZY_UPLOAD_PAGES = 1
+    
+    # Processed uploads are cached by content hash up to this size
+    EXTRACTION_CACHE_MAX_BYTES = 500 * 1024 * 1024  # 500MB
+    
+    # Rendered page images are cached in memory and on disk up to these sizes
+    RENDER_CACHE_MEMORY_BYTES = 64 * 1024 * 1024  # 64MB
+    RENDER_CACHE_MAX_BYTES = 500 * 1024 * 1024  # 500MB
+    
+    # Whole-page renders are refused above this many pixels; larger pages
+    # (high zoom) are rendered as tiles of RENDER_TILE_SIZE pixels square.
+    # The viewer (frontend/static/js/app.js) has a copy of both values
+    RENDER_MAX_PIXELS = 16 * 1024 * 1024
+    RENDER_TILE_SIZE = 512
+    
+    # Quick low-resolution JPEG previews shown while a page image loads
+    RENDER_PREVIEW_ZOOM = 0.5  # 36 DPI
+    RENDER_PREVIEW_QUALITY = 60
+    
+    # Page thumbnails are rendered after upload by a process pool and
+    # packed into WebP sprite sheets
+    THUMBNAIL_WORKERS = int(os.environ.get('THUMBNAIL_WORKERS', os.cpu_count() or 1))
+    THUMBNAIL_WIDTH = 120
+    THUMBNAILS_PER_SHEET = 50
+    
     # Server
     HOST = '0.0.0.0'
     PORT = 5000
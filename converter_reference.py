@@ -0,0 +1,407 @@
+# Original, unoptimized bijoy2unicode implementations kept as the reference
+# ("oracle") that the compiled engines in util.py and the reordering passes
+# in converter.py are tested against. Only the tests import it. Do not
+# optimize or fix anything in here: its only job is to be what the
+# converter used to do. The one addition is _Guard, because the original
+# reordering loops never terminate on some inputs (e.g. Unicode text that
+# starts with a pre-kar).
+
+import os
+import re
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+from utils.bijoy2unicode.converter import preConversionMap, conversionMap, proConversionMap, postConversionMap
+
+
+class ReferenceDivergence(RuntimeError):
+    """The original implementation would not terminate on this input"""
+
+
+class _Guard:
+    """Step and length budget for the original reordering loops"""
+
+    def __init__(self, text):
+        self.steps = 0
+        self.max_steps = 8 * len(text) + 64
+        self.max_length = 4 * len(text) + 64
+
+    def step(self, text):
+        self.steps += 1
+        if self.steps > self.max_steps or len(text) > self.max_length:
+            raise ReferenceDivergence(f"no result after {self.steps} steps")
+
+
+def doCharMap(text, charMap):
+    for srcKey, keyVal in charMap.items():
+        text = preg_replace(srcKey, keyVal, text)
+    return text
+
+def preg_replace(srcKey, keyVal, text):
+    #srcKey = "@"+srcKey+"@"
+    return re.sub(srcKey, keyVal, text)
+
+def mb_strlen(str):
+    return len(str)
+
+def mbCharAt(str, i):
+    try:
+        return str[i]
+    except:
+        pass
+
+def subString(string, frm, to):
+    return string[frm:to]
+
+
+class Unicode:
+
+    def IsBanglaDigit(self, c):
+        if (c >= '০' and c <= '৯'):
+            return True
+        return False
+
+    def IsBanglaPreKar(self, c):
+        if (c == 'ি' or c == 'ৈ' or c == 'ে'):
+            return True
+        return False
+
+    def IsBanglaPostKar(self, c):
+        if (c == 'া' or c == 'ো' or c == 'ৌ' or c == 'ৗ' or c == 'ু' or c == 'ূ' or c == 'ী' or c == 'ৃ'):
+            return True
+        return False
+
+    def IsBanglaKar(self, c):
+        if (self.IsBanglaPreKar(c) or self.IsBanglaPostKar(c)):
+            return True
+        return False
+
+    def IsBanglaBanjonborno(self, c):
+        if (c == 'ক' or c == 'খ' or c == 'গ' or c == 'ঘ' or c == 'ঙ' or c == 'চ' or c == 'ছ' or c == 'জ' or c == 'ঝ' or c == 'ঞ' or c == 'ট' or c == 'ঠ' or c == 'ড' or c == 'ঢ' or c == 'ণ' or c == 'ত' or c == 'থ' or c == 'দ' or c == 'ধ' or c == 'ন' or c == 'প' or c == 'ফ' or c == 'ব' or c == 'ভ' or c == 'ম' or c == 'য' or c == 'র' or c == 'ল' or c == 'শ' or c == 'ষ' or c == 'স' or c == 'হ' or c == 'ড়' or c == 'ঢ়' or c == 'য়' or c == 'ৎ' or c == 'ং' or c == 'ঃ' or c == 'ঁ'):
+            return True
+        return False
+
+    def IsBanglaSoroborno(self, c):
+        if (c == 'অ' or c == 'আ' or c == 'ই' or c == 'ঈ' or c == 'উ' or c == 'ঊ' or c == 'ঋ' or c == 'ঌ' or c == 'এ' or c == 'ঐ' or c == 'ও' or c == 'ঔ'):
+            return True
+        return False
+
+    def IsBanglaNukta(self, c):
+        if (c == 'ঁ'):
+            return True
+        return False
+
+    def IsBanglaHalant(self, c):
+        if (c == '্'):
+            return True
+        return False
+
+    def IsSpace(self, c):
+        if (c == ' ' or c == '\t' or c == '\n' or c == '\r'):
+            return True
+        return False
+
+    def reArrangeUnicodeConvertedText(self, str):
+
+        #mb_internal_encoding("UTF-8") # force multi-byte UTF-8 encoding
+
+        #global proConversionMap
+
+        #for (i = 0; i < mb_strlen(str); ++i) 
+        i = 0
+        guard = _Guard(str)
+        while i < mb_strlen(str):
+            guard.step(str)
+            #  Change refs
+            if (i < (mb_strlen(str) - 1) and mbCharAt(str, i) == 'র' and self.IsBanglaHalant(mbCharAt(str, i + 1)) and self.IsBanglaHalant(mbCharAt(str, i - 1))):
+                j = 1
+                while (True):
+                    if (i - j < 0):
+                        break
+                    
+                    if (self.IsBanglaBanjonborno(mbCharAt(str, i - j)) and self.IsBanglaHalant(mbCharAt(str, i - j - 1))): 
+                        j += 2
+                    elif (j == 1 and self.IsBanglaKar(mbCharAt(str, i - j))):
+                        j += 1
+                    else:
+                        break
+                    
+                
+                temp = subString(str, 0, i - j)
+                temp += mbCharAt(str, i)
+                temp += mbCharAt(str, i + 1)
+                temp += subString(str, i - j, i)
+                temp += subString(str, i + 2, mb_strlen(str))
+                str = temp
+                i += 1
+                continue
+
+            i += 1
+
+        str = doCharMap(str, proConversionMap)
+
+        #for (i = 0 i < mb_strlen(str) ++i) 
+        i=0
+        guard = _Guard(str)
+        while i<mb_strlen(str):
+            guard.step(str)
+            if (i < mb_strlen(str) - 1 and mbCharAt(str, i) == 'র' and self.IsBanglaHalant(mbCharAt(str, i + 1)) and not self.IsBanglaHalant(mbCharAt(str, i - 1)) and self.IsBanglaHalant(mbCharAt(str, i + 2))):
+                j = 1
+                while (True):
+                    if (i - j < 0):
+                        break
+                    
+                    if (self.IsBanglaBanjonborno(mbCharAt(str, i - j)) and self.IsBanglaHalant(mbCharAt(str, i - j - 1))):
+                        j += 2
+                    elif (j == 1 and self.IsBanglaKar(mbCharAt(str, i - j))):
+                        j += 1
+                    else:
+                        break
+                    
+                
+                temp = subString(str, 0, i - j)
+                temp += mbCharAt(str, i)
+                temp += mbCharAt(str, i + 1)
+                temp += subString(str, i - j, i)
+                temp += subString(str, i + 2, mb_strlen(str))
+                str = temp
+                i += 1
+                continue
+            
+
+            #  for 'Vowel + HALANT + Consonant' it should be 'HALANT + Consonant + Vowel'
+            if (i > 0 and mbCharAt(str, i) == '\u09CD' and (self.IsBanglaKar(mbCharAt(str, i - 1)) or self.IsBanglaNukta(mbCharAt(str, i - 1))) and i < mb_strlen(str) - 1):
+                temp = subString(str, 0, i - 1)
+                temp += mbCharAt(str, i)
+                temp += mbCharAt(str, i + 1)
+                temp += mbCharAt(str, i - 1)
+                temp += subString(str, i + 2, mb_strlen(str))
+                str = temp
+            
+
+            #  for 'RA (\u09B0) + HALANT + Vowel' it should be 'Vowel + RA (\u09B0) + HALANT'
+            if (i > 0 and i < mb_strlen(str) - 1 and mbCharAt(str, i) == '\u09CD' and mbCharAt(str, i - 1) == '\u09B0' and mbCharAt(str, i - 2) != '\u09CD' and self.IsBanglaKar(mbCharAt(str, i + 1))):
+                temp = subString(str, 0, i - 1)
+                temp += mbCharAt(str, i + 1)
+                temp += mbCharAt(str, i - 1)
+                temp += mbCharAt(str, i)
+                temp += subString(str, i + 2, mb_strlen(str))
+                str = temp            
+
+            #  Change pre-kar to post format suitable for unicode
+            if (i < mb_strlen(str) - 1 and self.IsBanglaPreKar(mbCharAt(str, i)) and self.IsSpace(mbCharAt(str, i + 1)) == False):
+                
+                temp = subString(str, 0, i)
+
+                j = 1
+                while ((i + j) < mb_strlen(str) - 1 and self.IsBanglaBanjonborno(mbCharAt(str, i + j))):
+                    if ((i + j) < mb_strlen(str) and self.IsBanglaHalant(mbCharAt(str, i + j + 1))):
+                        j += 2
+                    else:
+                        break                    
+                
+                temp += subString(str, i + 1, i + j + 1)
+
+                l = 0
+                if (mbCharAt(str, i) == 'ে' and mbCharAt(str, i + j + 1) == 'া'):
+                    temp += "ো"
+                    l = 1
+                elif (mbCharAt(str, i) == 'ে' and mbCharAt(str, i + j + 1) == "ৗ"):
+                    temp += "ৌ"
+                    l = 1
+                else:
+                    temp += mbCharAt(str, i)
+                
+                temp += subString(str, i + j + l + 1, mb_strlen(str))
+                str = temp
+                i += j
+            
+            #  nukta should be placed after kars
+            if (i < mb_strlen(str) - 1 and self.IsBanglaNukta(mbCharAt(str, i)) and self.IsBanglaPostKar(mbCharAt(str, i + 1))):
+                temp = subString(str, 0, i)
+                temp += mbCharAt(str, i + 1)
+                temp += mbCharAt(str, i)
+                temp += subString(str, i + 2, mb_strlen(str))
+                str = temp
+
+            i += 1
+        return str
+
+    def reArranceUnicodeTextForASCI(self, str):
+        
+        cY = 0
+        i = 0
+        
+        #for ($i = 0; $i < mb_strlen(str); ++$i) 
+        guard = _Guard(str)
+        while i<mb_strlen(str):
+            guard.step(str)
+
+            if(i<mb_strlen(str) and self.IsBanglaPreKar(mbCharAt(str,i))):
+                j=1
+                while self.IsBanglaBanjonborno(mbCharAt(str,i-j)):
+                    if (i-j)<0:
+                        break
+                    if (i-j)<=cY:
+                        break
+                    if self.IsBanglaHalant(mbCharAt(str,i-j-1)):
+                        j+=2
+                    else:
+                        break
+
+                R = subString(str,0, i-j)
+                R += mbCharAt(str,i)
+                R += subString(str,i-j, i)
+                R += subString(str,i+1, mb_strlen(str))
+                
+                str = R
+                
+                cY= i+1
+                continue
+            
+            
+            if i<(mb_strlen(str)-1) and self.IsBanglaHalant(mbCharAt(str,i)) and mbCharAt(str,i-1)=='র' and not self.IsBanglaHalant(mbCharAt(str,i-2)):
+                j=1
+                aZ=0
+
+                while True:
+                    if self.IsBanglaBanjonborno(mbCharAt(str,i+j)) and self.IsBanglaHalant(mbCharAt(str,i+j+1)):
+                        j+=2
+
+                    elif self.IsBanglaBanjonborno(mbCharAt(str,i+j)) and self.IsBanglaPreKar(mbCharAt(str,i+j+1)):
+                        aZ=1
+                        break
+                    
+                    else:
+                        break
+
+                R  = subString(str,0, i-1)
+                R += subString(str, i+j+1, i+j+aZ+1)
+                R += subString(str, i+1, i+j+1)
+                R += mbCharAt(str, i-1)
+                R += mbCharAt(str, i)
+                R += subString(str, i+j+aZ+1, mb_strlen(str))
+                
+                str = R
+                
+                i+=(j+aZ)
+                cY=i+1
+                continue
+
+            i += 1
+        return str
+
+    # main conversion def
+    def convertBijoyToUnicode(self, srcString):
+        if not srcString:
+            return srcString
+
+        srcString = doCharMap(srcString, preConversionMap)
+        srcString = doCharMap(srcString, conversionMap)
+        
+        srcString = self.reArrangeUnicodeConvertedText(srcString)
+        srcString = doCharMap(srcString, postConversionMap)
+        return srcString
+
+    def convertUnicodeToBijoy(self, srcString):
+        if not srcString:
+            return srcString
+
+        main_char = {
+            "।"   :   "|", 	"‘"   :   "Ô", 	"’"   :   "Õ", 
+            "“"   :   "Ò", 	"”"   :   "Ó", 	"্র্য"   :   "ª¨", 
+            "ম্প্র"   :   "¤cÖ", 	"র‌্য"   :   "i¨", 	"ক্ষ্ম"   :   "²", 
+            "ক্ক"   :   "°", 	"ক্ট"   :   "±", 	"ক্ত"   :   "³", 
+            "ক্ব"   :   "K¡", 	"স্ক্র"   :   "¯Œ", 	"ক্র"   :   "µ", 
+            "ক্ল"   :   "K¬", 	"ক্ষ"   :   "¶", 	"ক্স"   :   "·", 
+            "গু"   :   "¸", 	"গ্ধ"   :   "»", 	"গ্ন"   :   "Mœ", 
+            "গ্ম"   :   "M¥", 	"গ্ল"   :   "M­", 	"গ্রু"   :   "Mªy", 
+            "ঙ্ক"   :   "¼", 	"ঙ্ক্ষ"   :   "•¶", 	"ঙ্খ"   :   "•L", 
+            "ঙ্গ"   :   "½", 	"ঙ্ঘ"   :   "•N", 	"চ্ছ্ব"   :   "”Q¡", 
+            "চ্চ"   :   "”P", 	"চ্ছ"   :   "”Q", 	"চ্ঞ"   :   "”T", 
+            "জ্জ্ব"   :   "¾¡", 	"জ্জ"   :   "¾", 	"জ্ঝ"   :   "À", 
+            "জ্ঞ"   :   "Á", 	"জ্ব"   :   "R¡", 	"ঞ্চ"   :   "Â", 
+            "ঞ্ছ"   :   "Ã", 	"ঞ্জ"   :   "Ä", 	"ঞ্ঝ"   :   "Å", 
+            "ট্ট"   :   "Æ", 	"ট্ব"   :   "U¡", 	"ট্ম"   :   "U¥", 
+            "ড্ড"   :   "Ç", 	"ণ্ট"   :   "È", 	"ণ্ঠ"   :   "É", 
+            "ন্স"   :   "Ý", 	"ণ্ড"   :   "Ê", 	"ন্তু"   :   "š‘", 
+            "ণ্ব"   :   "Y^", 	"ত্ত্ব"   :   "Ë¡", 	"ত্ত"   :   "Ë", 
+            "ত্থ"   :   "Ì", 	"ত্ন"   :   "Zœ", 	"ত্ম"   :   "Z¥", 
+            "ন্ত্ব"   :   "š—¡", 	"ত্ব"   :   "Z¡", 	"থ্ব"   :   "_¡", 
+            "দ্গ"   :   "˜M", 	"দ্ঘ"   :   "˜N", 	"দ্দ"   :   "Ï", 
+            "দ্ধ"   :   "×", 	"দ্ব"   :   "Ø", 
+            "দ্ভ"   :   "™¢", 	"দ্ম"   :   "Ù", 	"দ্রু"   :   "`ª“", 
+            "ধ্ব"   :   "aŸ", 	"ধ্ম"   :   "a¥", 	"ন্ট"   :   "›U", 
+            "ন্ঠ"   :   "Ú", 	"ন্ড"   :   "Û", 	"ন্ত্র"   :   "š¿", 
+            "ন্ত"   :   "š—", 	"স্ত্র"   :   "¯¿", 	"ত্র"   :   "Î", 
+            "ন্থ"   :   "š’", 	"ন্দ"   :   "›`", 	"ন্দ্ব"   :   "›Ø", 
+            "ন্ধ"   :   "Ü", 	"ন্ন"   :   "bœ", 	"ন্ব"   :   "š^", 
+            "ন্ম"   :   "b¥", 	"প্ট"   :   "Þ", 	"প্ত"   :   "ß", 
+            "প্ন"   :   "cœ", 	"প্প"   :   "à", 	"প্ল"   :   "c­", 
+            "প্স"   :   "á", 	"ফ্ল"   :   "d¬", 	"ব্জ"   :   "â", 
+            "ব্দ"   :   "ã", 	"ব্ধ"   :   "ä", 	"ব্ব"   :   "eŸ", 
+            "ব্ল"   :   "e­", 	"ভ্র"   :   "å", 	"ম্ন"   :   "gœ", 
+            "ম্প"   :   "¤ú", 	"ম্ফ"   :   "ç", 	"ম্ব"   :   "¤^", 
+            "ম্ভ"   :   "¤¢", 	"ম্ভ্র"   :   "¤£", 	"ম্ম"   :   "¤§", 
+            "ম্ল"   :   "¤­", 	"্র"   :   "ª", 	"রু"   :   "i“", 
+            "রূ"   :   "iƒ", 	"ল্ক"   :   "é", 	"ল্গ"   :   "ê", 
+            "ল্ট"   :   "ë", 	"ল্ড"   :   "ì", 	"ল্প"   :   "í", 
+            "ল্ফ"   :   "î", 	"ল্ব"   :   "j¦", 	"ল্ম"   :   "j¥", 
+            "ল্ল"   :   "j­", 	"শু"   :   "ï", 	"শ্চ"   :   "ð", 
+            "শ্ন"   :   "kœ", 	"শ্ব"   :   "k¦", 	"শ্ম"   :   "k¥", 
+            "শ্ল"   :   "k­", 	"ষ্ক"   :   "®‹", 	"ষ্ক্র"   :   "®Œ", 
+            "ষ্ট"   :   "ó", 	"ষ্ঠ"   :   "ô", 	"ষ্ণ"   :   "ò", 
+            "ষ্প"   :   "®ú", 	"ষ্ফ"   :   "õ", 	"ষ্ম"   :   "®§", 
+            "স্ক"   :   "¯‹", 	"স্ট"   :   "÷", 	"স্খ"   :   "ö", 
+            "স্ত"   :   "¯—", 	"স্তু"   :   "¯‘", 	"স্থ"   :   "¯’", 
+            "স্ন"   :   "mœ", 	"স্প"   :   "¯ú", 	"স্ফ"   :   "ù", 
+            "স্ব"   :   "¯^", 	"স্ম"   :   "¯§", 	"স্ল"   :   "¯­", 
+            "হু"   :   "û", 	"হ্ণ"   :   "nè", 	"হ্ব"   :   "nŸ", 
+            "হ্ন"   :   "ý", 	"হ্ম"   :   "þ", 	"হ্ল"   :   "n¬", 
+            "হৃ"   :   "ü", 	"র্"   :   "©",
+            "্য"   :   "¨", 	"্"   :   "&", 	"আ"   :   "Av", 
+            "অ"   :   "A", 	"ই"   :   "B", 	"ঈ"   :   "C", 
+            "উ"   :   "D", 	"ঊ"   :   "E", 	"ঋ"   :   "F", 
+            "এ"   :   "G", 	"ঐ"   :   "H", 	"ও"   :   "I", 
+            "ঔ"   :   "J", 	"ক"   :   "K", 	"খ"   :   "L", 
+            "গ"   :   "M", 	"ঘ"   :   "N", 	"ঙ"   :   "O", 
+            "চ"   :   "P", 	"ছ"   :   "Q", 	"জ"   :   "R", 
+            "ঝ"   :   "S", 	"ঞ"   :   "T", 	"ট"   :   "U", 
+            "ঠ"   :   "V", 	"ড"   :   "W", 	"ঢ"   :   "X", 
+            "ণ"   :   "Y", 	"ত"   :   "Z", 	"থ"   :   "_", 
+            "দ"   :   "`", 	"ধ"   :   "a", 	"ন"   :   "b", 
+            "প"   :   "c", 	"ফ"   :   "d", 	"ব"   :   "e", 
+            "ভ"   :   "f", 	"ম"   :   "g", 	"য"   :   "h", 
+            "র"   :   "i", 	"ল"   :   "j", 	"শ"   :   "k", 
+            "ষ"   :   "l", 	"স"   :   "m", 	"হ"   :   "n", 
+            "ড়"   :   "o", 	"ঢ়"   :   "p", 	"য়"   :   "q", 
+            "ৎ"   :   "r", 	"০"   :   "0", 	"১"   :   "1", 
+            "২"   :   "2", 	"৩"   :   "3", 	"৪"   :   "4", 
+            "৫"   :   "5", 	"৬"   :   "6", 	"৭"   :   "7", 
+            "৮"   :   "8", 	"৯"   :   "9", 	"া"   :   "v", 
+            "ি"   :   "w", 	"ী"   :   "x", 	"ু"   :   "y", 
+            "ূ"   :   "~", 	"ৃ"   :   "…", 	"ে"   :   "‡", 
+            "ৈ"   :   "‰", 	"ৗ"   :   "Š", 	"ং"   :   "s", 
+            "ঃ"   :   "t", 	"ঁ"   :   "u"
+        }
+
+        pattern = 'ো'
+        replacement = 'ো'
+        srcString = preg_replace(pattern, replacement, srcString)
+	
+        pattern = 'ৌ'
+        replacement = 'ৌ'
+        srcString = preg_replace(pattern, replacement, srcString)
+
+        # make correction
+        srcString = self.reArranceUnicodeTextForASCI(srcString)
+
+        #inv_conversionMap = {v: k for k, v in conversionMap.items()}
+        srcString = doCharMap(srcString, main_char)
+        
+        return srcString
+
+    def __init__(self):
+        pass
+    #def __init__(self):
+    #    self = self
@@ -6,6 +6,16 @@
 // API Base URL
 const API_BASE = window.location.origin;
 
+// Packed text-layer responses (see backend/utils/wire_format.py). Typed
+// array views assume a little-endian machine; others keep getting JSON.
+const TEXT_LAYER_MIMETYPE = 'application/vnd.bangla-pdf.textlayer';
+const LITTLE_ENDIAN = new Uint8Array(new Uint16Array([1]).buffer)[0] === 1;
+
+// Pages with more pixels than this at the current zoom are loaded as
+// tiles of RENDER_TILE_SIZE pixels (same settings as config.py)
+const RENDER_MAX_PIXELS = 16 * 1024 * 1024;
+const RENDER_TILE_SIZE = 512;
+
 // Application State
 const AppState = {
     sessionId: null,
@@ -16,7 +26,10 @@ const AppState = {
     modifications: [],
     undoStack: [],
     redoStack: [],
-    pdfMetadata: null  // Store PDF metadata for zoom compensation
+    pdfMetadata: null,  // Store PDF metadata for zoom compensation
+    pageVersions: {},   // Edit count per page, part of the page image URLs
+    thumbnails: {},     // Sprite sheet URL and cell of each page's thumbnail
+    pageLoads: 0        // Counts loadPDFPage() calls; only the latest one paints
 };
 
 /**
@@ -159,26 +172,28 @@ async function handleFileUpload(event) {
     const formData = new FormData();
     formData.append('file', file);
     
+    // Stream pages in as they are extracted when the browser can read
+    // response bodies incrementally
+    if (window.ReadableStream && window.TextDecoder) {
+        await uploadStreaming(formData);
+        return;
+    }
+    
+    // Only the first page's text is extracted up front; the rest is
+    // fetched on demand by ensurePageText()
+    formData.append('lazy', '1');
+    
     try {
         const response = await fetch(`${API_BASE}/api/upload`, {
             method: 'POST',
+            headers: textLayerAcceptHeaders(),
             body: formData
         });
         
-        const result = await response.json();
+        const result = await readTextLayerResponse(response);
         
         if (result.success) {
-            AppState.sessionId = result.session_id;
-            AppState.pdfData = result.pdf_data;
-            AppState.currentPage = 0;
-            
-            updateStatus(result.message);
-            updateSessionInfo();
-            loadPDFPage(0);
-            enableButtons();
-            
-            // Load thumbnails
-            loadThumbnails();
+            openDocument(result.session_id, result.pdf_data, result.message);
         } else {
             updateStatus('ত্রুটি | Error: ' + result.error);
             alert(result.error);
@@ -189,6 +204,85 @@ async function handleFileUpload(event) {
     }
 }
 
+// Show a freshly uploaded document
+function openDocument(sessionId, pdfData, message) {
+    AppState.sessionId = sessionId;
+    AppState.pdfData = pdfData;
+    AppState.currentPage = 0;
+    AppState.pageVersions = {};
+    AppState.thumbnails = {};
+    
+    updateStatus(message);
+    updateSessionInfo();
+    loadPDFPage(0);
+    enableButtons();
+    
+    // Load thumbnails
+    loadThumbnails();
+}
+
+// Upload via /api/upload/stream, which answers with one JSON object per
+// line: the document (its first page extracted, placeholders for the
+// rest), each further extracted page, done
+async function uploadStreaming(formData) {
+    try {
+        const response = await fetch(`${API_BASE}/api/upload/stream`, {
+            method: 'POST',
+            body: formData
+        });
+        
+        if (!response.ok) {
+            const result = await response.json();
+            updateStatus('ত্রুটি | Error: ' + result.error);
+            alert(result.error);
+            return;
+        }
+        
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        
+        while (true) {
+            const { done, value } = await reader.read();
+            if (done) break;
+            
+            buffer += decoder.decode(value, { stream: true });
+            const lines = buffer.split('\n');
+            buffer = lines.pop();
+            
+            for (const line of lines) {
+                if (line.trim()) handleStreamMessage(JSON.parse(line));
+            }
+        }
+        
+        if (buffer.trim()) handleStreamMessage(JSON.parse(buffer));
+    } catch (error) {
+        updateStatus('ত্রুটি | Error: ' + error.message);
+        alert('Upload failed: ' + error.message);
+    }
+}
+
+function handleStreamMessage(message) {
+    if (message.type === 'document') {
+        openDocument(message.session_id, message.pdf_data,
+            'পৃষ্ঠা লোড হচ্ছে... | Loading pages...');
+    } else if (message.type === 'page') {
+        const page = message.page;
+        const pages = AppState.pdfData ? AppState.pdfData.pages : null;
+        // Keep a page ensurePageText() already fetched (it may be edited)
+        if (!pages || pages[page.page_number].extracted !== false) return;
+        
+        pages[page.page_number] = page;
+        if (page.page_number === AppState.currentPage) {
+            loadTextBoxes(page.page_number);
+        }
+    } else if (message.type === 'done') {
+        updateStatus(message.message);
+    } else if (message.type === 'error') {
+        updateStatus('ত্রুটি | Error: ' + message.error);
+    }
+}
+
 // Close PDF and reset to upload screen
 function closePDF() {
     // Confirm before closing if there are modifications
@@ -227,6 +321,9 @@ function closePDF() {
     AppState.undoStack = [];
     AppState.redoStack = [];
     AppState.pdfMetadata = null;
+    AppState.pageVersions = {};
+    AppState.thumbnails = {};
+    AppState.pageLoads++;
     
     // Disable all buttons
     disableButtons();
@@ -251,53 +348,160 @@ async function loadPDFPage(pageNumber) {
     
     updateStatus('পেজ লোড হচ্ছে... | Loading page...');
     
+    // Images of a page the user has already left (or of an older zoom)
+    // arrive late; only the latest load may draw on the canvas
+    const load = ++AppState.pageLoads;
+    const isLatest = () => load === AppState.pageLoads;
+    
+    // Fetch the text layer while the page image renders
+    const textReady = ensurePageText(pageNumber);
+    
+    // Store PDF metadata for zoom compensation
+    if (!AppState.pdfMetadata && AppState.pdfData) {
+        const pageData = AppState.pdfData.pages[pageNumber];
+        if (pageData) {
+            AppState.pdfMetadata = {
+                width: pageData.width,
+                height: pageData.height
+            };
+        }
+    }
+    
+    const pageData = AppState.pdfData && AppState.pdfData.pages[pageNumber];
+    const width = pageData ? Math.ceil(pageData.width * AppState.zoom) : 0;
+    const height = pageData ? Math.ceil(pageData.height * AppState.zoom) : 0;
+    
+    // Show a low-resolution preview, scaled up, until the full image loads
+    let fullImageShown = false;
+    const preview = new Image();
+    preview.onload = () => {
+        if (fullImageShown || !pageData || !isLatest()) return;
+        const canvas = elements.pdfCanvas;
+        const ctx = canvas.getContext('2d');
+        canvas.width = width;
+        canvas.height = height;
+        ctx.drawImage(preview, 0, 0, canvas.width, canvas.height);
+        
+        elements.pdfCanvas.style.display = 'block';
+        elements.loadingMessage.style.display = 'none';
+    };
+    preview.src = pagePreviewUrl(pageNumber);
+    
+    const pageShown = () => {
+        if (!isLatest()) return;
+        elements.pdfCanvas.style.display = 'block';
+        elements.loadingMessage.style.display = 'none';
+        
+        // Load text boxes for this page
+        textReady.then(() => {
+            if (!isLatest()) return;
+            loadTextBoxes(pageNumber);
+            updateStatus('প্রস্তুত | Ready');
+        });
+    };
+    const pageFailed = () => {
+        if (!isLatest()) return;
+        updateStatus('ত্রুটি | Error: Could not load page ' + (pageNumber + 1));
+    };
+    
+    // Pages too large for one image (A0 at high zoom) are drawn tile by
+    // tile over the preview
+    if (width * height > RENDER_MAX_PIXELS) {
+        const canvas = elements.pdfCanvas;
+        const ctx = canvas.getContext('2d');
+        const tiles = [];
+        for (let row = 0; row * RENDER_TILE_SIZE < height; row++) {
+            for (let column = 0; column * RENDER_TILE_SIZE < width; column++) {
+                tiles.push(new Promise((resolve, reject) => {
+                    const tile = new Image();
+                    tile.onload = () => {
+                        if (!isLatest()) {
+                            resolve();
+                            return;
+                        }
+                        if (!fullImageShown) {
+                            fullImageShown = true;
+                            if (canvas.width !== width || canvas.height !== height) {
+                                canvas.width = width;
+                                canvas.height = height;
+                            }
+                        }
+                        ctx.drawImage(tile, column * RENDER_TILE_SIZE, row * RENDER_TILE_SIZE);
+                        resolve();
+                    };
+                    tile.onerror = reject;
+                    tile.src = pageTileUrl(pageNumber, AppState.zoom, column, row);
+                }));
+            }
+        }
+        Promise.all(tiles).then(pageShown, pageFailed);
+        
+        updatePageInfo();
+        return;
+    }
+    
+    // Display page image (the browser caches it until the page is edited)
+    const img = new Image();
+    img.onload = () => {
+        if (!isLatest()) return;
+        fullImageShown = true;
+        const canvas = elements.pdfCanvas;
+        const ctx = canvas.getContext('2d');
+        canvas.width = img.width;
+        canvas.height = img.height;
+        ctx.drawImage(img, 0, 0);
+        pageShown();
+    };
+    img.onerror = pageFailed;
+    img.src = pageImageUrl(pageNumber, AppState.zoom);
+    
+    // Update page info
+    updatePageInfo();
+}
+
+// URL of a page image; it includes the page version, so it changes
+// exactly when the page is edited
+function pageImageUrl(pageNumber, zoom) {
+    return `${pageUrl(pageNumber)}/image?zoom=${zoom}&v=${AppState.pageVersions[pageNumber] || 0}`;
+}
+
+// URL of one RENDER_TILE_SIZE tile of a page image (column and row
+// counted from the top left)
+function pageTileUrl(pageNumber, zoom, column, row) {
+    return `${pageUrl(pageNumber)}/tile/${column}/${row}?zoom=${zoom}&v=${AppState.pageVersions[pageNumber] || 0}`;
+}
+
+// URL of a page's quick low-resolution preview (one for all zoom levels)
+function pagePreviewUrl(pageNumber) {
+    return `${pageUrl(pageNumber)}/preview?v=${AppState.pageVersions[pageNumber] || 0}`;
+}
+
+function pageUrl(pageNumber) {
+    return `${API_BASE}/api/page/${encodeURIComponent(AppState.sessionId)}/${pageNumber}`;
+}
+
+// Make sure a page's text layer is loaded (lazy uploads skip most pages)
+async function ensurePageText(pageNumber) {
+    if (!AppState.pdfData) return;
+    
+    const pageData = AppState.pdfData.pages[pageNumber];
+    if (!pageData || pageData.extracted !== false) return;
+    
     try {
-        const response = await fetch(`${API_BASE}/api/page/render?t=${Date.now()}`, {
+        const response = await fetch(`${API_BASE}/api/page/text`, {
             method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
+            headers: { 'Content-Type': 'application/json', ...textLayerAcceptHeaders() },
             body: JSON.stringify({
                 session_id: AppState.sessionId,
-                page_number: pageNumber,
-                zoom: AppState.zoom
+                page_number: pageNumber
             })
         });
         
-        const result = await response.json();
+        const result = await readTextLayerResponse(response);
         
-        if (result.success) {
-            // Store PDF metadata for zoom compensation
-            if (!AppState.pdfMetadata && AppState.pdfData) {
-                const pageData = AppState.pdfData.pages[pageNumber];
-                if (pageData) {
-                    AppState.pdfMetadata = {
-                        width: pageData.width,
-                        height: pageData.height
-                    };
-                }
-            }
-            
-            // Display page image
-            const img = new Image();
-            img.onload = () => {
-                const canvas = elements.pdfCanvas;
-                const ctx = canvas.getContext('2d');
-                canvas.width = img.width;
-                canvas.height = img.height;
-                ctx.drawImage(img, 0, 0);
-                
-                elements.pdfCanvas.style.display = 'block';
-                elements.loadingMessage.style.display = 'none';
-                
-                // Load text boxes for this page
-                loadTextBoxes(pageNumber);
-                
-                updateStatus('প্রস্তুত | Ready');
-            };
-            img.src = result.image_data;
-            
-            // Update page info
-            updatePageInfo();
-        } else {
+        if (result.success && AppState.pdfData) {
+            AppState.pdfData.pages[pageNumber] = result.page;
+        } else if (!result.success) {
             updateStatus('ত্রুটি | Error: ' + result.error);
         }
     } catch (error) {
@@ -305,6 +509,136 @@ async function loadPDFPage(pageNumber) {
     }
 }
 
+// Accept header for requests whose response carries text layers
+function textLayerAcceptHeaders() {
+    return LITTLE_ENDIAN ? { 'Accept': `${TEXT_LAYER_MIMETYPE}, application/json;q=0.9` } : {};
+}
+
+// Parse a response that may be JSON or a packed text-layer response
+async function readTextLayerResponse(response) {
+    const contentType = response.headers.get('Content-Type') || '';
+    if (!contentType.startsWith(TEXT_LAYER_MIMETYPE)) {
+        return response.json();
+    }
+    return decodeTextLayerResponse(await response.arrayBuffer());
+}
+
+// Decode a packed response: JSON header, then typed-array sections per page
+function decodeTextLayerResponse(buffer) {
+    const bytes = new Uint8Array(buffer);
+    const view = new DataView(buffer);
+    const decoder = new TextDecoder();
+    
+    if (decoder.decode(bytes.subarray(0, 4)) !== 'BTXL' || view.getUint16(4, true) !== 1) {
+        throw new Error('Unsupported text layer format');
+    }
+    
+    const headerLength = view.getUint32(8, true);
+    const header = JSON.parse(decoder.decode(bytes.subarray(12, 12 + headerLength)));
+    const bodyStart = 12 + headerLength;
+    const payload = header.payload;
+    
+    const pages = payload.pdf_data ? payload.pdf_data.pages : payload.page ? [payload.page] : [];
+    pages.forEach(page => {
+        const layer = decodeTextLayer(buffer, bodyStart, page.text_blocks, decoder);
+        layer.pageNumber = page.page_number;
+        layer.fonts = header.fonts;
+        layer.colors = header.colors;
+        attachTextLayer(page, layer);
+    });
+    
+    return payload;
+}
+
+function decodeTextLayer(buffer, bodyStart, descriptor, decoder) {
+    const count = descriptor.count;
+    let offset = bodyStart + descriptor.offset;
+    
+    const take = (ArrayType, length) => {
+        const array = new ArrayType(buffer, offset, length);
+        offset += Math.ceil(length * ArrayType.BYTES_PER_ELEMENT / 4) * 4;
+        return array;
+    };
+    const takeString = (length) => {
+        const text = decoder.decode(new Uint8Array(buffer, offset, length));
+        offset += Math.ceil(length / 4) * 4;
+        return text;
+    };
+    
+    const converted = descriptor.original_bytes !== null;
+    const layer = {
+        count: count,
+        bboxes: take(Float32Array, 4 * count),
+        sizes: take(Float32Array, count),
+        flags: take(Uint32Array, count),
+        blockNos: take(Uint32Array, count),
+        lineNos: take(Uint32Array, count),
+        wordNos: take(Uint32Array, count),
+        textEnds: take(Uint32Array, count),
+        originalEnds: converted ? take(Uint32Array, count) : null
+    };
+    layer.fontIds = take(Uint16Array, count);
+    layer.colorIds = take(Uint16Array, count);
+    layer.marks = take(Uint8Array, count);
+    layer.text = takeString(descriptor.text_bytes);
+    layer.originalText = converted ? takeString(descriptor.original_bytes) : null;
+    return layer;
+}
+
+// Give a page the usual text_blocks array, built from the typed arrays the
+// first time it is read (most pages of a long document are never shown)
+function attachTextLayer(page, layer) {
+    page.textLayer = layer;
+    Object.defineProperty(page, 'text_blocks', {
+        configurable: true,
+        enumerable: true,
+        get() {
+            const blocks = textLayerToBlocks(layer);
+            Object.defineProperty(page, 'text_blocks', {
+                value: blocks, writable: true, enumerable: true, configurable: true
+            });
+            return blocks;
+        }
+    });
+}
+
+function textLayerToBlocks(layer) {
+    const blocks = new Array(layer.count);
+    let textStart = 0;
+    let originalStart = 0;
+    
+    for (let i = 0; i < layer.count; i++) {
+        const flags = layer.flags[i];
+        const b = layer.bboxes;
+        const bbox = [b[4 * i], b[4 * i + 1], b[4 * i + 2], b[4 * i + 3]];
+        const block = {
+            id: `word_${layer.pageNumber}_${i}`,
+            text: layer.text.substring(textStart, layer.textEnds[i]),
+            font: layer.fonts[layer.fontIds[i]],
+            size: Math.round(layer.sizes[i] * 100) / 100,
+            color: layer.colors[layer.colorIds[i]],
+            flags: flags,
+            bbox: bbox,
+            origin: [bbox[0], bbox[3]],
+            bold: Boolean(flags & 16),
+            italic: Boolean(flags & 2),
+            block_no: layer.blockNos[i],
+            line_no: layer.lineNos[i],
+            word_no: layer.wordNos[i],
+            is_word: true
+        };
+        textStart = layer.textEnds[i];
+        
+        if (layer.originalEnds) {
+            block.original_text = layer.originalText.substring(originalStart, layer.originalEnds[i]);
+            block.is_bijoy = Boolean(layer.marks[i] & 1);
+            originalStart = layer.originalEnds[i];
+        }
+        blocks[i] = block;
+    }
+    return blocks;
+}
+
 // Load Text Boxes
 function loadTextBoxes(pageNumber) {
     if (!AppState.pdfData) return;
@@ -596,6 +930,8 @@ async function applyTextEdit() {
         
         if (result.success) {
             updateStatus(result.message);
+            AppState.pageVersions[AppState.currentPage] = result.page_version;
+            showThumbnail(AppState.currentPage);
             
             // Update the text block in memory
             AppState.selectedTextBox.text = newText;
@@ -811,6 +1147,64 @@ async function loadThumbnails() {
         
         elements.thumbnailContainer.appendChild(thumbnail);
     }
+    
+    loadThumbnailImages(AppState.sessionId);
+}
+
+// Fill in the thumbnails from the sprite sheets (a few images for the whole
+// document), polling while the server is still rendering them
+async function loadThumbnailImages(sessionId, attempt = 0) {
+    try {
+        const response = await fetch(`${API_BASE}/api/thumbnails/${encodeURIComponent(sessionId)}`);
+        if (sessionId !== AppState.sessionId) return;
+        
+        if (response.status === 202) {
+            if (attempt < 120) {
+                setTimeout(() => loadThumbnailImages(sessionId, attempt + 1), 1000);
+            }
+            return;
+        }
+        
+        // Anything but 202 ends the polling; a failed build is not retried
+        const result = await response.json();
+        if (!result.success) {
+            console.warn('Thumbnails unavailable:', result.error);
+            return;
+        }
+        
+        for (const sheet of result.thumbnails.sheets) {
+            const sheetUrl = `${API_BASE}/api/thumbnails/${encodeURIComponent(sessionId)}/${sheet.sheet_number}`;
+            for (const entry of sheet.pages) {
+                AppState.thumbnails[entry.page_number] = { sheetUrl, ...entry };
+                showThumbnail(entry.page_number);
+            }
+        }
+    } catch (error) {
+        console.warn('Thumbnails unavailable:', error.message);
+    }
+}
+
+// Show a page's thumbnail: its cell of the sprite sheet, or the page
+// preview once the page has been edited after the sheets were rendered
+function showThumbnail(pageNumber) {
+    const entry = AppState.thumbnails[pageNumber];
+    const thumbnail = elements.thumbnailContainer.children[pageNumber];
+    if (!entry || !thumbnail) return;
+    
+    let image = thumbnail.querySelector('.thumbnail-image');
+    if (!image) {
+        image = document.createElement('div');
+        image.className = 'thumbnail-image';
+        thumbnail.insertBefore(image, thumbnail.firstChild);
+    }
+    
+    image.style.width = `${entry.width}px`;
+    image.style.height = `${entry.height}px`;
+    if (AppState.pageVersions[pageNumber]) {
+        image.style.background = `url("${pagePreviewUrl(pageNumber)}") center / contain no-repeat`;
+    } else {
+        image.style.background = `url("${entry.sheetUrl}") -${entry.x}px -${entry.y}px no-repeat`;
+    }
 }
 
 // Update Status
@@ -1017,28 +1411,17 @@ function handlePrintPreview() {
         `;
         pagesContainer.appendChild(pageDiv);
         
-        // Fetch and display each page
-        fetch(`${API_BASE}/api/page/render`, {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({
-                session_id: AppState.sessionId,
-                page_number: i,
-                zoom: 1.0
-            })
-        })
-        .then(response => response.json())
-        .then(result => {
-            if (result.success) {
-                pageDiv.innerHTML = `
-                    <div class="page-label">Page ${i + 1} of ${AppState.pdfData.num_pages}</div>
-                    <img src="${result.image_data}" alt="Page ${i + 1}" />
-                `;
-            }
-        })
-        .catch(error => {
+        // Display each page
+        const img = printWindow.document.createElement('img');
+        img.alt = `Page ${i + 1}`;
+        img.onload = () => {
+            pageDiv.innerHTML = `<div class="page-label">Page ${i + 1} of ${AppState.pdfData.num_pages}</div>`;
+            pageDiv.appendChild(img);
+        };
+        img.onerror = () => {
             pageDiv.innerHTML = `<p style="color: red;">Error loading page ${i + 1}</p>`;
-        });
+        };
+        img.src = pageImageUrl(i, 1.0);
     }
     
     updateStatus('প্রিন্ট প্রিভিউ খোলা হয়েছে | Print preview opened');
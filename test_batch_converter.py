@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Check the batch converter (python -m backend.tools.convert)
+Converts a small tree, then checks that a second run resumes from the manifest
+"""
+
+import os
+import shutil
+import tempfile
+import unicodedata
+
+from backend.tools.convert import MANIFEST_NAME, load_manifest, run
+
+
+def test_batch_converter():
+    print("=" * 70)
+    print("BATCH CONVERTER")
+    print("=" * 70)
+
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, 'archive')
+        destination = os.path.join(tmp, 'converted')
+        os.makedirs(os.path.join(source, 'letters'))
+        shutil.copy(os.path.join(os.path.dirname(__file__) or '.', 'test.pdf'), source)
+        with open(os.path.join(source, 'letters', 'ansi.txt'), 'wb') as f:
+            f.write('Avwg evsjvq Mvb MvB|\n'.encode('cp1252'))
+
+        converted, failed, skipped = run(source, destination, 'bijoy-to-unicode', workers=2)
+        with open(os.path.join(destination, 'letters', 'ansi.txt'), encoding='utf-8') as f:
+            text = unicodedata.normalize('NFC', f.read())
+        with open(os.path.join(destination, 'test.pdf.txt'), encoding='utf-8') as f:
+            pages = f.read().split('\f')
+        ok = (converted, failed, skipped) == (2, 0, 0) and text == 'আমি বাংলায় গান গাই।\n'
+        ok = ok and len(pages) == 4 and 'বেগম' in pages[0]
+        failures += not ok
+        print(f"{'✓' if ok else '✗'} first run: {converted} converted, {failed} failed, "
+              f"{len(pages)} PDF pages, {text.strip()}")
+
+        # Nothing changed: everything is skipped
+        result = run(source, destination, 'bijoy-to-unicode', workers=2)
+        ok = result == (0, 0, 2)
+        failures += not ok
+        print(f"{'✓' if ok else '✗'} second run resumes: {result}")
+
+        # A modified file is converted again
+        with open(os.path.join(source, 'letters', 'ansi.txt'), 'ab') as f:
+            f.write(b'wk\xb6v\n')
+        result = run(source, destination, 'bijoy-to-unicode', workers=1)
+        manifest = load_manifest(os.path.join(destination, MANIFEST_NAME))
+        ok = result == (1, 0, 1) and manifest['letters/ansi.txt']['status'] == 'done'
+        failures += not ok
+        print(f"{'✓' if ok else '✗'} modified file converted again: {result}")
+
+    print("=" * 70)
+    if failures == 0:
+        print("✅ ALL TESTS PASSED - Batch converter works")
+    else:
+        print(f"⚠️  {failures} FAILURES - Check the output above")
+    print("=" * 70)
+    return failures == 0
+
+
+if __name__ == "__main__":
+    success = test_batch_converter()
+    exit(0 if success else 1)
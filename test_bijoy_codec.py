@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Check the 'bijoy' codec
+Streaming through the incremental decoder/encoder must match converting the whole text
+"""
+
+import codecs
+import os
+import random
+import sys
+import tempfile
+import unicodedata
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
+
+from utils import bijoy_codec
+from utils.text_conversion import BIJOY_TO_UNICODE, UNICODE_TO_BIJOY, iter_converted
+
+BIJOY_WORDS = ['Avwg', 'evsjvq', 'Mvb', 'MvB|', 'wk¶v', 'gš¿Yvjq', '†`‡ki', 'RbmsL¨v',
+               'cÖvq', '17', '†KvwU', 'Kg©KZ©v', '¯^vaxbZv', 'fvlv', ',', 't', '|', 'wU']
+SEPARATORS = [' ', '  ', '\n', '\n\n\n', ' \n ', '\t', '\r\n']
+
+
+def chunks(data, rng, largest):
+    """Split data into random pieces of 1..largest items"""
+    i = 0
+    while i < len(data):
+        size = rng.randint(1, largest)
+        yield data[i:i + size]
+        i += size
+
+
+def test_bijoy_codec(rounds=500):
+    print("=" * 70)
+    print("BIJOY CODEC")
+    print("=" * 70)
+
+    rng = random.Random(int(os.environ.get('CODEC_SEED', '1')))
+    failures = 0
+
+    # open() round trip (Bijoy to Unicode gives precomposed য়, NFC decomposes it)
+    unicode_text = "আমি বাংলায় গান গাই।\nদেশের জনসংখ্যা প্রায় ১৭ কোটি\n"
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bijoy.txt')
+        with open(path, 'w', encoding='bijoy') as f:
+            f.write(unicode_text)
+        with open(path, 'rb') as f:
+            raw = f.read()
+        with open(path, encoding='bijoy', newline='') as f:
+            read_back = f.read()
+    ok = raw == 'Avwg evsjvq Mvb MvB|\n‡`‡ki RbmsL¨v cªvq 17 ‡KvwU\n'.encode('cp1252') and unicodedata.normalize('NFC', read_back) == unicode_text
+    failures += not ok
+    print(f"{'✓' if ok else '✗'} open(encoding='bijoy') round trip: {raw[:20]!r}...")
+
+    # open() never finalizes its encoder: the last word must still be written
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bijoy.txt')
+        with open(path, 'w', encoding='bijoy') as f:
+            f.write('আমি বাংলায় ')
+            f.write('গান গাই।')
+        with open(path, 'rb') as f:
+            raw = f.read()
+    ok = raw == 'Avwg evsjvq Mvb MvB|'.encode('cp1252')
+    failures += not ok
+    print(f"{'✓' if ok else '✗'} open(encoding='bijoy') writes the last word: {raw!r}")
+
+    # A word split across writes is converted as one word
+    encoder = codecs.getincrementalencoder('bijoy')()
+    pieces = [encoder.encode('ক'), encoder.encode('ি'), encoder.encode(' ')]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bijoy.txt')
+        with open(path, 'w', encoding='bijoy') as f:
+            f.write('ক')
+            f.write('ি\n')
+        with open(path, 'rb') as f:
+            raw = f.read()
+    ok = pieces == [b'', b'', b'wK '] and raw == b'wK\n'
+    failures += not ok
+    print(f"{'✓' if ok else '✗'} split write 'ক' + 'ি': {pieces}, open() {raw!r}")
+
+    # Chunked decoding and encoding against the whole text
+    decode_mismatches = encode_mismatches = 0
+    for _ in range(rounds):
+        bijoy_text = ''.join(rng.choice(BIJOY_WORDS) + rng.choice(SEPARATORS)
+                             for _ in range(rng.randint(1, 40)))
+        data = bijoy_text.encode('cp1252')
+        text = codecs.decode(data, 'bijoy')
+        streamed = ''.join(codecs.iterdecode(chunks(data, rng, 16), 'bijoy'))
+        decode_mismatches += streamed != text
+
+        streamed = b''.join(codecs.iterencode(chunks(text, rng, 16), 'bijoy'))
+        encode_mismatches += streamed != codecs.encode(text, 'bijoy')
+
+    failures += decode_mismatches + encode_mismatches
+    print(f"{'✓' if not decode_mismatches else '✗'} incremental decoder: {rounds} texts, {decode_mismatches} mismatches")
+    print(f"{'✓' if not encode_mismatches else '✗'} incremental encoder: {rounds} texts, {encode_mismatches} mismatches")
+
+    # Chunks of the bulk conversion API (split at whitespace, converted one by one)
+    bijoy_text = ''.join(rng.choice(BIJOY_WORDS) + rng.choice(SEPARATORS) for _ in range(5000))
+    text = codecs.decode(bijoy_text.encode('cp1252'), 'bijoy')
+    for direction, source, expected in ((BIJOY_TO_UNICODE, bijoy_text, text),
+                                        (UNICODE_TO_BIJOY, text, codecs.encode(text, 'bijoy').decode('cp1252'))):
+        converted = ''.join(iter_converted(source, direction, chunk_chars=500))
+        ok = converted == expected
+        failures += not ok
+        print(f"{'✓' if ok else '✗'} {direction} in 500 character chunks")
+
+    # Decomposed nukta letters (as NFC text has them)
+    result = codecs.encode('দিয়ে পড়ে', 'bijoy')
+    ok = result == 'w`‡q c‡o'.encode('cp1252')
+    failures += not ok
+    print(f"{'✓' if ok else '✗'} decomposed য় ড় encode: {result!r}")
+
+    print("=" * 70)
+    if failures == 0:
+        print("✅ ALL TESTS PASSED - Codec streams match whole-text conversion")
+    else:
+        print(f"⚠️  {failures} FAILURES - Check the output above")
+    print("=" * 70)
+    return failures == 0
+
+
+if __name__ == "__main__":
+    success = test_bijoy_codec()
+    exit(0 if success else 1)
@@ -4,6 +4,8 @@ Quick verification test for bijoy2unicode integration
 Run this to verify the converter is working correctly
 """
 
+import unicodedata
+
 from backend.utils.bijoy_unicode_converter import (
     convert_bijoy_to_unicode, 
     is_bijoy_text,
@@ -51,6 +53,9 @@ def test_converter():
     
     print("-" * 70)
     print(f"Result: {passed}/{len(tests)} tests passed")
+
+    # The checks below count their own failures
+    failed = 0
     
     # Test detection
     print("\n" + "-" * 70)
@@ -59,7 +64,76 @@ def test_converter():
     
     print(f"✓ 'Avwg' is Bijoy: {is_bijoy_text('Avwg')}")
     print(f"✓ 'আমি' is Unicode: {not is_bijoy_text('আমি')}")
-    
+
+    # One font table serves extraction, editing and conversion
+    from backend.utils.script_classifier import font_encoding
+
+    font_tests = [
+        ('SutonnyMJ', 'bijoy'),
+        ('ABCDEF+SutonnyMJ-Bold', 'bijoy'),
+        ('SushreeMJ', 'bijoy'),
+        ('Helvetica', 'unicode'),
+        ('', 'unicode'),
+    ]
+    for font_name, expected in font_tests:
+        result = font_encoding(font_name)
+        if result != expected:
+            failed += 1
+        print(f"{'✓' if result == expected else '✗'} font {font_name!r:26s} → {result}")
+
+    # Font table labels: Unicode Bengali by cmap coverage, then Bijoy by name
+    from backend.utils.script_classifier import font_class
+
+    label_tests = [
+        ('SutonnyMJ,Bold', [0x41, 0x76], 'bijoy'),
+        ('Nirmala UI', [0x41, 0x0995, 0x09BE], 'unicode_bengali'),
+        ('Nikosh', [0x41, 0x0995, 0x09BE], 'unicode_bengali'),
+        ('SolaimanLipi', [0x0995, 0x09CD], 'unicode_bengali'),
+        ('Nikosh', [], 'bijoy'),
+        ('Calibri', [0x41, 0x76], 'latin'),
+        ('Times New Roman', [], 'latin'),
+    ]
+    for font_name, codepoints, expected in label_tests:
+        result = font_class(font_name, codepoints)
+        if result != expected:
+            failed += 1
+        print(f"{'✓' if result == expected else '✗'} table {font_name!r:25s} → {result}")
+
+    # Embedded fonts: the Unicode and ANSI releases of one family
+    import os
+    import fitz
+    from backend.utils.page_extractor import build_font_table
+
+    fonts_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fonts')
+    for font_file, expected in [('Nikosh.ttf', 'unicode_bengali'), ('Kalpurush.ttf', 'unicode_bengali'),
+                                ('Kalpurush ANSI.ttf', 'bijoy')]:
+        doc = fitz.open()
+        doc.new_page().insert_font(fontname='F0', fontfile=os.path.join(fonts_dir, font_file))
+        doc[0].insert_text((50, 100), 'Avwg', fontname='F0')
+        labels = list(build_font_table(fitz.open('pdf', doc.tobytes())).values())
+        if labels != [expected]:
+            failed += 1
+        print(f"{'✓' if labels == [expected] else '✗'} embedded {font_file!r:22s} → {labels}")
+
+    # Latin-labelled fonts still get per-word detection: Bijoy fonts missing
+    # from BIJOY_FONT_FAMILIES (or embedded as e.g. Helvetica) are converted
+    from backend.utils.bijoy_unicode_converter import convert_batch
+
+    batch_tests = [
+        ('Helvetica', 'latin', 'Avwg', 'আমি', True),
+        ('SulekhaMJ', 'latin', 'wk¶v', 'শিক্ষা', True),
+        ('Calibri', 'latin', 'Hello', 'Hello', False),
+        ('Nirmala UI', 'unicode_bengali', 'আমি', 'আমি', False),
+        ('SutonnyMJ', 'bijoy', 'Mvb', 'গান', True),
+    ]
+    for font_name, label, text, expected, expected_flag in batch_tests:
+        texts, flags = convert_batch([text], [font_name], {font_name: label})
+        result = unicodedata.normalize('NFC', texts[0])
+        ok = result == unicodedata.normalize('NFC', expected) and flags[0] == expected_flag
+        if not ok:
+            failed += 1
+        print(f"{'✓' if ok else '✗'} batch {font_name!r:13s} ({label}) {text} → {result} {flags[0]}")
+
     # Test bidirectional (if available)
     if using_advanced:
         print("\n" + "-" * 70)
@@ -70,16 +144,59 @@ def test_converter():
         bijoy_text = converter.convert_to_bijoy(unicode_text)
         back_to_unicode = convert_bijoy_to_unicode(bijoy_text)
         
-        print(f"Unicode → Bijoy → Unicode: {unicode_text == back_to_unicode}")
-    
+        # Compare composed forms: য় may come back precomposed (U+09DF)
+        ok = unicodedata.normalize('NFC', unicode_text) == unicodedata.normalize('NFC', back_to_unicode)
+        if not ok:
+            failed += 1
+        print(f"{'✓' if ok else '✗'} Unicode → Bijoy → Unicode: {bijoy_text} → {back_to_unicode}")
+
+    # Test Unicode → Bijoy conjuncts (longest match, same result on the edit path)
+    print("\n" + "-" * 70)
+    print("Testing Unicode → Bijoy conjuncts...")
+    print("-" * 70)
+
+    from backend.utils.unicode_to_bijoy_converter import unicode_to_bijoy
+
+    conjunct_tests = [
+        ("আমি", "Avwg"),
+        ("কোটি", "‡KvwU"),
+        ("আকাঙ্ক্ষা", "AvKv•¶v"),   # 5 code point conjunct
+        ("সম্ভ্রম", "m¤£g"),
+        ("উচ্ছ্বাস", "D”Q¡vm"),
+    ]
+
+    for unicode_text, expected in conjunct_tests:
+        result = unicode_to_bijoy(unicode_text)
+        ok = result == expected and converter.convert_to_bijoy(unicode_text) == expected
+        if not ok:
+            failed += 1
+        print(f"{'✓' if ok else '✗'} {unicode_text:12s} → {result} (expected {expected})")
+
+    # Decomposed ড় ঢ় য় (as NFC text has them) with a pre-kar: the e-kar
+    # moves in front of the whole letter, as with the precomposed letter
+    nukta_tests = [
+        ("\u09a6\u09bf\u09af\u09bc\u09c7", "w`‡q"),   # দিয়ে
+        ("\u09a6\u09bf\u09df\u09c7", "w`‡q"),         # দিয়ে, precomposed
+        ("\u09aa\u09a1\u09bc\u09c7", "c‡o"),           # পড়ে
+        ("\u09a2\u09bc\u09c7", "‡p"),                   # ঢ়ে
+    ]
+
+    for unicode_text, expected in nukta_tests:
+        result = unicode_to_bijoy(unicode_text)
+        ok = result == expected and converter.convert_to_bijoy(unicode_text) == expected
+        if not ok:
+            failed += 1
+        print(f"{'✓' if ok else '✗'} {unicode_text:12s} → {result} (expected {expected})")
+
+    success = passed == len(tests) and failed == 0
     print("\n" + "=" * 70)
-    if passed == len(tests):
+    if success:
         print("✅ ALL TESTS PASSED - Converter is working correctly!")
     else:
-        print("⚠️  SOME TESTS FAILED - Check the output above")
+        print(f"⚠️  SOME TESTS FAILED - {len(tests) - passed + failed} failures, check the output above")
     print("=" * 70)
     
-    return passed == len(tests)
+    return success
 
 if __name__ == "__main__":
     success = test_converter()
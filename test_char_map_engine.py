@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Check the compiled char-map engine against the original doCharMap
+Every shipped conversion map must give exactly the old output
+"""
+
+import random
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
+
+from utils.bijoy2unicode import converter, util
+
+import converter_reference as reference
+
+MAPS = {
+    'preConversionMap': converter.preConversionMap,
+    'conversionMap': converter.conversionMap,
+    'proConversionMap': converter.proConversionMap,
+    'postConversionMap': converter.postConversionMap,
+}
+
+SAMPLES = [
+    'Avwg evsjvq Mvb MvB|',
+    'wk¶v gš¿Yvjq',
+    'MYcÖRvZš¿x evsjv‡`k',
+    '†`‡ki RbmsL¨v cÖvq 17 †KvwU',
+    '  ‡u wu  y& „„„ \\\\ |  ,\n\n\n\n  \n',
+    '১ঃ  ঃ ]ঃ [ঃ অা ্‌্‌',
+]
+
+
+def random_text(rng, charmap, alphabet):
+    """Random mix of map keys and single characters"""
+    parts = []
+    for _ in range(rng.randint(0, 12)):
+        literal = util._literal_key(rng.choice(list(charmap)))
+        if rng.random() < 0.5 and literal:
+            parts.append(literal)
+        elif rng.random() < 0.2:
+            parts.append(' ' * rng.randint(1, 3))
+        else:
+            parts.append(rng.choice(alphabet))
+    return ''.join(parts)
+
+
+def test_char_map_engine(rounds=5000):
+    print("=" * 70)
+    print("COMPILED CHAR MAP ENGINE VS REFERENCE")
+    print("=" * 70)
+
+    rng = random.Random(int(os.environ.get('CHAR_MAP_SEED', '1')))
+    failures = 0
+
+    for name, charmap in MAPS.items():
+        alphabet = sorted(set(''.join(charmap) + ''.join(charmap.values()) + ' \n\\|[]&^+,:'))
+        texts = SAMPLES + [random_text(rng, charmap, alphabet) for _ in range(rounds)]
+
+        mismatches = [t for t in texts if util.doCharMap(t, charmap) != reference.doCharMap(t, charmap)]
+        failures += len(mismatches)
+
+        stages = len(util.compile_char_map(tuple(charmap.items())).stages)
+        status = "✓" if not mismatches else "✗"
+        print(f"{status} {name:20s}: {len(charmap):3d} keys in {stages:2d} stages, "
+              f"{len(texts)} texts, {len(mismatches)} mismatches")
+        for text in mismatches[:3]:
+            print(f"    {text!r}: {util.doCharMap(text, charmap)!r} != {reference.doCharMap(text, charmap)!r}")
+
+    print("=" * 70)
+    if failures == 0:
+        print("✅ ALL TESTS PASSED - Compiled maps match the reference")
+    else:
+        print(f"⚠️  {failures} MISMATCHES - Check the output above")
+    print("=" * 70)
+    return failures == 0
+
+
+if __name__ == "__main__":
+    success = test_char_map_engine()
+    exit(0 if success else 1)
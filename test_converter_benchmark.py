@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Converter benchmark with regression thresholds
+Times the converters on benchmarks/corpus/ and compares with benchmarks/baseline.json
+
+    python test_converter_benchmark.py                    # check against the baseline
+    python test_converter_benchmark.py --update-baseline  # record a new baseline
+
+Throughput is divided by the speed of a fixed pure-Python calibration loop
+before it is compared, so a baseline recorded on one machine still holds
+on a faster or slower one. A benchmark fails when its normalized
+throughput drops more than BENCH_THRESHOLD (default 0.5 = 50%) below the
+baseline; runs on a shared machine vary by about a third, lower it on a
+quiet one.
+"""
+
+import json
+import os
+import platform
+import sys
+import time
+
+from backend.utils.bijoy_unicode_converter import convert_bijoy_to_unicode, is_bijoy_text
+from backend.utils.unicode_to_bijoy_converter import unicode_to_bijoy
+from backend.utils.bijoy2unicode.converter import Unicode
+
+BENCH_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarks')
+CORPUS_DIR = os.path.join(BENCH_DIR, 'corpus')
+BASELINE_PATH = os.path.join(BENCH_DIR, 'baseline.json')
+CORPORA = ('short_words', 'paragraphs', 'conjuncts')
+
+# Each benchmark runs whole passes over a corpus for at least this long
+MIN_SECONDS = float(os.environ.get('BENCH_MIN_SECONDS', '0.2'))
+ROUNDS = int(os.environ.get('BENCH_ROUNDS', '3'))
+
+_unicode = Unicode()
+
+# Name -> (function, corpus encoding it takes)
+BENCHMARKS = {
+    'convert_bijoy_to_unicode': (convert_bijoy_to_unicode, 'bijoy'),
+    'Unicode.convertBijoyToUnicode': (_unicode.convertBijoyToUnicode, 'bijoy'),
+    'unicode_to_bijoy': (unicode_to_bijoy, 'unicode'),
+    'is_bijoy_text': (is_bijoy_text, 'bijoy'),
+}
+
+
+def load_corpus(name, encoding):
+    with open(os.path.join(CORPUS_DIR, f'{name}.{encoding}.txt'), encoding='utf-8') as f:
+        return f.read().splitlines()
+
+
+def calibrate():
+    """Operations per second of a fixed loop of dict, str and list work (best of 5)"""
+    words = [f'w{i % 97}' for i in range(20000)]
+    best = None
+    for _ in range(5):
+        start = time.perf_counter()
+        counts = {}
+        for word in words:
+            counts[word] = counts.get(word, 0) + len(word.upper())
+        ''.join(sorted(counts))
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return len(words) / best
+
+
+def percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run_benchmark(function, items):
+    """
+    Call function on every item, repeating passes for MIN_SECONDS.
+
+    Returns:
+        dict: chars_per_sec of the fastest pass (like timeit, the least
+        disturbed one), p50/p99 microseconds per call over all passes
+    """
+    chars = sum(map(len, items))
+    for item in items[:50]:
+        function(item)  # Warm up
+
+    timings = []
+    fastest = None
+    started = time.perf_counter()
+    clock = time.perf_counter_ns
+    while True:
+        pass_start = clock()
+        for item in items:
+            start = clock()
+            function(item)
+            timings.append(clock() - start)
+        elapsed = clock() - pass_start
+        fastest = elapsed if fastest is None else min(fastest, elapsed)
+        if time.perf_counter() - started >= MIN_SECONDS:
+            break
+
+    timings.sort()
+    return {
+        'chars_per_sec': chars / (fastest / 1e9),
+        'p50_us': percentile(timings, 0.50) / 1000,
+        'p99_us': percentile(timings, 0.99) / 1000,
+    }
+
+
+def run_all():
+    """
+    Run every benchmark on every corpus, ROUNDS times.
+
+    The calibration loop runs right before each benchmark, so both see the
+    machine in the same state. Other load only ever makes a run slower, so
+    each benchmark keeps its best normalized round.
+
+    Returns:
+        tuple: (median calibration, {benchmark/corpus: result})
+    """
+    calibrations = []
+    results = {}
+    for _ in range(ROUNDS):
+        for name, (function, encoding) in BENCHMARKS.items():
+            for corpus in CORPORA:
+                calibration = calibrate()
+                result = run_benchmark(function, load_corpus(corpus, encoding))
+                result['normalized'] = result['chars_per_sec'] / calibration
+                calibrations.append(calibration)
+                key = f'{name}/{corpus}'
+                if key not in results or result['normalized'] > results[key]['normalized']:
+                    results[key] = result
+    return sorted(calibrations)[len(calibrations) // 2], results
+
+
+def test_converter_benchmark(update_baseline=False):
+    print("=" * 70)
+    print("CONVERTER BENCHMARK")
+    print("=" * 70)
+
+    threshold = float(os.environ.get('BENCH_THRESHOLD', '0.5'))
+    calibration, results = run_all()
+
+    baseline = None
+    if not update_baseline and os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH, encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    print(f"Calibration: {calibration:,.0f} ops/s")
+    print(f"{'benchmark':45s} {'chars/s':>11s} {'p50 µs':>9s} {'p99 µs':>9s} {'vs base':>8s}")
+    print("-" * 70)
+
+    regressions = 0
+    for key, result in results.items():
+        change = ''
+        status = ' '
+        if baseline and key in baseline['results']:
+            ratio = result['normalized'] / baseline['results'][key]['normalized']
+            change = f"{ratio - 1:+.0%}"
+            if ratio < 1 - threshold:
+                status = '✗'
+                regressions += 1
+            else:
+                status = '✓'
+        print(f"{status} {key:43s} {result['chars_per_sec']:11,.0f} {result['p50_us']:9.1f} "
+              f"{result['p99_us']:9.1f} {change:>8s}")
+
+    print("=" * 70)
+    if update_baseline:
+        with open(BASELINE_PATH, 'w', encoding='utf-8') as f:
+            json.dump({
+                'python': platform.python_version(),
+                'calibration': calibration,
+                'results': results,
+            }, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"✅ Baseline written to {os.path.relpath(BASELINE_PATH)}")
+    elif baseline is None:
+        print("⚠️  No baseline yet - run with --update-baseline to record one")
+    elif regressions == 0:
+        print(f"✅ ALL BENCHMARKS PASSED - Within {threshold:.0%} of the baseline")
+    else:
+        print(f"⚠️  {regressions} REGRESSIONS - More than {threshold:.0%} slower than the baseline")
+    print("=" * 70)
+    return regressions == 0
+
+
+if __name__ == "__main__":
+    success = test_converter_benchmark('--update-baseline' in sys.argv[1:])
+    exit(0 if success else 1)
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Differential fuzzing of the converter against the reference implementation
+Random text from the conversion maps' alphabets must convert exactly like
+converter_reference.py; any mismatch is minimized before it is reported
+
+    python test_converter_fuzz.py             # FUZZ_SECONDS (default 5) of fuzzing
+    FUZZ_SECONDS=600 FUZZ_SEED=7 python test_converter_fuzz.py
+
+Unicode to Bijoy is only compared up to its reordering pass: its char map
+(one longest-match trie) and the ড় ঢ় য় precomposition deliberately give
+different, correct output where the original did not.
+"""
+
+import random
+import sys
+import os
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
+
+from utils.bijoy2unicode import converter, util
+
+import converter_reference as reference
+
+# Mismatches minimized and printed per target
+MAX_REPORTED = 3
+
+
+def map_tokens(*charmaps):
+    """Literal keys of the maps and the single characters of keys and values"""
+    tokens = set()
+    for charmap in charmaps:
+        for key, value in charmap.items():
+            literal = util._literal_key(key)
+            if literal:
+                tokens.add(literal)
+                tokens.update(literal)
+            tokens.update(value.replace('\\', ''))
+    return sorted(tokens)
+
+
+def random_text(rng, tokens):
+    """Random words of map tokens, separated by whitespace"""
+    words = []
+    for _ in range(rng.randint(1, 8)):
+        words.append(''.join(rng.choice(tokens) for _ in range(rng.randint(0, 6))))
+    separators = [rng.choice([' ', ' ', ' ', '  ', '\n']) for _ in words]
+    return ''.join(word + separator for word, separator in zip(words, separators))[:rng.randint(1, 80)]
+
+
+def minimize(text, fails):
+    """
+    Shrink a failing input (delta debugging over characters).
+
+    Removes ever smaller chunks of text as long as the rest still fails,
+    and returns an input where no single character can be removed.
+    """
+    parts = 2
+    while len(text) > 1:
+        size = -(-len(text) // parts)
+        for start in range(0, len(text), size):
+            candidate = text[:start] + text[start + size:]
+            if fails(candidate):
+                text = candidate
+                parts = max(parts - 1, 2)
+                break
+        else:
+            if size == 1:
+                break
+            parts = min(parts * 2, len(text))
+    return text
+
+
+def differs(fast, ref):
+    """Predicate: fast and ref give different output (False if ref never finishes)"""
+    def fails(text):
+        try:
+            expected = ref(text)
+        except reference.ReferenceDivergence:
+            return False
+        return fast(text) != expected
+    return fails
+
+
+def test_converter_fuzz(seconds=None):
+    print("=" * 70)
+    print("CONVERTER DIFFERENTIAL FUZZING")
+    print("=" * 70)
+
+    seconds = float(os.environ.get('FUZZ_SECONDS', '5') if seconds is None else seconds)
+    seed = int(os.environ.get('FUZZ_SEED', '1'))
+    rng = random.Random(seed)
+    fast = converter.Unicode()
+    ref = reference.Unicode()
+
+    bijoy_tokens = map_tokens(converter.preConversionMap, converter.conversionMap) + ['\\', '|', ',']
+    converted_tokens = sorted(set(converter.conversionMap.values()) | set(map_tokens(converter.postConversionMap)))
+    unicode_tokens = sorted(set(''.join(converter.conversionMap.values())) | set('ড়ঢ়য়ৎো ৌ'))
+
+    # Name -> (fast, reference, alphabet)
+    targets = {
+        'convertBijoyToUnicode': (fast.convertBijoyToUnicode, ref.convertBijoyToUnicode, bijoy_tokens),
+        'reArrangeUnicodeConvertedText': (fast.reArrangeUnicodeConvertedText,
+                                          ref.reArrangeUnicodeConvertedText, converted_tokens),
+        'reArranceUnicodeTextForASCI': (fast.reArranceUnicodeTextForASCI,
+                                        ref.reArranceUnicodeTextForASCI, unicode_tokens),
+    }
+    stats = {name: {'texts': 0, 'skipped': 0, 'mismatches': {}} for name in targets}
+
+    # Round robin over the targets until the time is up
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        for name, (fast_fn, ref_fn, tokens) in targets.items():
+            text = random_text(rng, tokens)
+            stat = stats[name]
+            stat['texts'] += 1
+            try:
+                expected = ref_fn(text)
+            except reference.ReferenceDivergence:
+                stat['skipped'] += 1
+                continue
+            if fast_fn(text) != expected and len(stat['mismatches']) < MAX_REPORTED:
+                minimal = minimize(text, differs(fast_fn, ref_fn))
+                stat['mismatches'].setdefault(minimal, text)
+
+    failures = 0
+    for name, (fast_fn, ref_fn, _) in targets.items():
+        stat = stats[name]
+        mismatches = stat['mismatches']
+        failures += len(mismatches)
+        status = "✓" if not mismatches else "✗"
+        print(f"{status} {name:30s}: {stat['texts']:6d} texts, {len(mismatches)} mismatches "
+              f"({stat['skipped']} never finish in the original)")
+        for minimal, original in mismatches.items():
+            print(f"    {minimal!r}: {fast_fn(minimal)!r} != {ref_fn(minimal)!r}"
+                  f" (from {original!r})")
+
+    print(f"  seed {seed}, {seconds:g} s")
+    print("=" * 70)
+    if failures == 0:
+        print("✅ ALL TESTS PASSED - Converter matches the reference")
+    else:
+        print(f"⚠️  {failures} MISMATCHES - Check the output above")
+    print("=" * 70)
+    return failures == 0
+
+
+if __name__ == "__main__":
+    success = test_converter_fuzz()
+    exit(0 if success else 1)
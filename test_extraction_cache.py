@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Check the content-hash extraction cache
+Hits, misses, LRU eviction and keying by extractor version
+"""
+
+import hashlib
+import io
+import json
+import logging
+import os
+import sys
+import tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+from utils import extraction_cache as cache_module
+from utils.extraction_cache import ExtractionCache, save_with_digest
+from utils.pdf_processor import PDFProcessor
+from utils.text_layer import api_default
+
+TEST_PDF = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test.pdf')
+
+
+def check(ok, label):
+    print(f"{'✓' if ok else '✗'} {label}")
+    return not ok
+
+
+def as_json(value):
+    return json.dumps(value, ensure_ascii=False, default=api_default, sort_keys=True)
+
+
+def test_extraction_cache():
+    print("=" * 70)
+    print("EXTRACTION CACHE")
+    print("=" * 70)
+
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        # The digest is the SHA-256 of the bytes written, over several chunks
+        with open(TEST_PDF, 'rb') as f:
+            content = f.read()
+        chunk_size = cache_module.HASH_CHUNK_SIZE
+        cache_module.HASH_CHUNK_SIZE = 4096
+        try:
+            digest = save_with_digest(io.BytesIO(content), os.path.join(tmp, 'copy.pdf'))
+        finally:
+            cache_module.HASH_CHUNK_SIZE = chunk_size
+        with open(os.path.join(tmp, 'copy.pdf'), 'rb') as f:
+            copied = f.read()
+        failures += check(digest == hashlib.sha256(content).hexdigest() and copied == content,
+                          f"save_with_digest: {digest[:16]}..., {len(copied)} bytes copied")
+
+        # Miss, then a hit that gives back the same pages (text layers included)
+        pdf_data = PDFProcessor({}).process_pdf(TEST_PDF, 'cache')
+        cache = ExtractionCache(os.path.join(tmp, 'cache'))
+        missed = cache.get(digest)
+        cache.put(digest, pdf_data)
+        hit = cache.get(digest)
+        stats = cache.stats()
+        failures += check(missed is None and hit is not None and as_json(hit) == as_json(pdf_data)
+                          and (stats['hits'], stats['misses'], stats['entries']) == (1, 1, 1),
+                          f"miss then hit: {stats['hits']} hit, {stats['misses']} miss, hit rate {stats['hit_rate']}")
+
+        # Every hit is a fresh copy
+        hit['pages'][0]['text_blocks'].texts[0] = 'changed'
+        failures += check(as_json(cache.get(digest)) == as_json(pdf_data), "hits do not share state")
+
+        # Entries of another extractor version are never read
+        version = cache_module.EXTRACTOR_VERSION
+        cache_module.EXTRACTOR_VERSION = version + 1
+        try:
+            other_version = cache.get(digest)
+        finally:
+            cache_module.EXTRACTOR_VERSION = version
+        failures += check(other_version is None and cache.get(digest) is not None,
+                          f"keyed by extractor version: v{version + 1} misses, v{version} hits")
+
+        # Unreadable entries are dropped (with a warning, kept out of the output)
+        with open(cache._get_filepath('broken'), 'w') as f:
+            f.write('{not json')
+        logging.disable(logging.WARNING)
+        try:
+            broken = cache.get('broken')
+        finally:
+            logging.disable(logging.NOTSET)
+        failures += check(broken is None and not os.path.exists(cache._get_filepath('broken')),
+                          "unreadable entry dropped")
+
+        # Past max_bytes the least recently used entries go; a hit counts as a use
+        small = {'num_pages': 0, 'pages': [], 'padding': 'x' * 1000}
+        cache = ExtractionCache(os.path.join(tmp, 'small'), max_bytes=2500)
+        for n, key in enumerate(('a', 'b')):
+            cache.put(key, small)
+            os.utime(cache._get_filepath(key), (n + 1, n + 1))
+        cache.get('a')
+        cache.put('c', small)
+        stats = cache.stats()
+        failures += check([cache.get(key) is not None for key in 'abc'] == [True, False, True]
+                          and stats['evictions'] == 1 and stats['bytes'] <= 2500,
+                          f"eviction: {stats['entries']} entries, {stats['bytes']} bytes, "
+                          f"{stats['evictions']} evicted")
+
+    print("=" * 70)
+    if failures == 0:
+        print("✅ ALL TESTS PASSED - Extraction cache works")
+    else:
+        print(f"⚠️  {failures} FAILURES - Check the output above")
+    print("=" * 70)
+    return failures == 0
+
+
+if __name__ == "__main__":
+    success = test_extraction_cache()
+    exit(0 if success else 1)
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Check the page text endpoints through the Flask app
+Lazy uploads with /api/page/text, the NDJSON upload stream and re-uploads
+served from the extraction cache must give the pages of a full upload
+"""
+
+import json
+import logging
+import os
+import sys
+import tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+TEST_PDF = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test.pdf')
+
+
+def check(ok, label):
+    print(f"{'✓' if ok else '✗'} {label}")
+    return not ok
+
+
+def as_json(value):
+    """Pages as the client receives them"""
+    from utils.text_layer import api_default
+    return json.loads(json.dumps(value, ensure_ascii=False, default=api_default))
+
+
+def expected_pages(appmod):
+    """Every page extracted and converted, as a full upload sends them"""
+    pdf_data = appmod.pdf_processor.process_pdf(TEST_PDF, 'expected')
+    for page in pdf_data['pages']:
+        appmod.convert_page_text(page, pdf_data['font_table'])
+    return as_json(pdf_data['pages'])
+
+
+def full_font_table(appmod):
+    """Font table of a full upload"""
+    return appmod.pdf_processor.process_pdf(TEST_PDF, 'expected')['font_table']
+
+
+def upload(client, url, **form):
+    with open(TEST_PDF, 'rb') as f:
+        return client.post(url, data={'file': (f, 'test.pdf'), **form}, content_type='multipart/form-data')
+
+
+def check_page_text(appmod, expected):
+    """Lazy upload, then the other pages through /api/page/text"""
+    failures = 0
+    client = appmod.app.test_client()
+    first_pages = appmod.app.config.get('LAZY_UPLOAD_PAGES', 1)
+
+    data = upload(client, '/api/upload', lazy='1').get_json()
+    session_id = data['session_id']
+    pages = as_json(data['pdf_data']['pages'])
+    failures += check(pages[:first_pages] == expected[:first_pages]
+                      and all(not p['extracted'] and not p['text_blocks'] for p in pages[first_pages:]),
+                      f"lazy upload: {first_pages} of {len(pages)} pages extracted")
+
+    responses = [client.post('/api/page/text', json={'session_id': session_id, 'page_number': n})
+                 for n in range(len(expected))]
+    pages = [as_json(r.get_json()['page']) for r in responses]
+    failures += check(pages == expected, "/api/page/text gives the pages of a full upload")
+
+    stored = appmod.session_manager.load(session_id)['pdf_data']
+    again = client.post('/api/page/text', json={'session_id': session_id, 'page_number': len(expected) - 1})
+    failures += check(as_json(stored['pages']) == expected and as_json(again.get_json()['page']) == expected[-1],
+                      "extracted pages are stored in the session")
+    failures += check(stored['font_table'] == full_font_table(appmod),
+                      f"their fonts join the session's font table: {len(stored['font_table'])} fonts")
+
+    statuses = [client.post('/api/page/text', json={'session_id': session_id, 'page_number': n}).status_code
+                for n in (-1, len(expected), '0')]
+    missing = client.post('/api/page/text', json={'session_id': 'missing', 'page_number': 0}).status_code
+    failures += check(statuses == [400, 400, 400] and missing == 404,
+                      f"bad page numbers {statuses}, unknown session {missing}")
+    return failures
+
+
+def check_stream(appmod, expected):
+    """NDJSON upload: document line, one line per further page, done line"""
+    failures = 0
+    client = appmod.app.test_client()
+    first_pages = appmod.app.config.get('LAZY_UPLOAD_PAGES', 1)
+
+    response = upload(client, '/api/upload/stream')
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    types = [line['type'] for line in lines]
+    failures += check(response.mimetype == 'application/x-ndjson'
+                      and types == ['document'] + ['page'] * (len(expected) - first_pages) + ['done'],
+                      f"stream: {response.mimetype}, {types}")
+
+    document = as_json(lines[0]['pdf_data']['pages'])
+    streamed = document[:first_pages] + [as_json(line['page']) for line in lines[1:-1]]
+    failures += check(document[:first_pages] == expected[:first_pages]
+                      and all(not p['extracted'] for p in document[first_pages:])
+                      and streamed == expected,
+                      f"document line has {first_pages} page(s), the stream gives the pages of a full upload")
+
+    session_id = lines[0]['session_id']
+    stored = appmod.session_manager.load(session_id)['pdf_data']
+    failures += check(as_json(stored['pages']) == expected and stored['font_table'] == full_font_table(appmod),
+                      "streamed pages and their fonts are stored in the session")
+
+    # The finished extraction is cached: a re-upload is one complete line
+    lines = [json.loads(line) for line in upload(client, '/api/upload/stream').get_data(as_text=True).splitlines()]
+    failures += check([line['type'] for line in lines] == ['document', 'done']
+                      and as_json(lines[0]['pdf_data']['pages']) == expected,
+                      "re-upload is served from the extraction cache")
+    return failures
+
+
+def check_endpoints(tmp):
+    """Run the HTTP checks with the app's folders (relative paths) in tmp"""
+    cwd = os.getcwd()
+    os.chdir(tmp)
+    try:
+        # A fresh import, so the app creates its folders here even when an
+        # earlier test in the same process imported it in another tempdir
+        sys.modules.pop('app', None)
+        try:
+            import app as appmod
+        except ImportError as e:
+            print(f"- HTTP checks skipped, app dependencies missing: {e}")
+            return 0
+        expected = expected_pages(appmod)
+        return check_page_text(appmod, expected) + check_stream(appmod, expected)
+    finally:
+        os.chdir(cwd)
+
+
+def test_page_api():
+    print("=" * 70)
+    print("PAGE TEXT ENDPOINTS")
+    print("=" * 70)
+
+    logging.disable(logging.INFO)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            failures = check_endpoints(tmp)
+    finally:
+        logging.disable(logging.NOTSET)
+
+    print("=" * 70)
+    if failures == 0:
+        print("✅ ALL TESTS PASSED - Page text endpoints work")
+    else:
+        print(f"⚠️  {failures} FAILURES - Check the output above")
+    print("=" * 70)
+    return failures == 0
+
+
+if __name__ == "__main__":
+    success = test_page_api()
+    exit(0 if success else 1)
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Check single-pass page extraction against the per-word lookups it replaced
+Word styles must match a clipped get_text("dict") per word, character
+origins a scan of the whole rawdict, and parallel extraction the serial one
+"""
+
+import os
+import random
+import shutil
+import sys
+import tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
+
+import fitz
+
+from utils.page_extractor import CharOriginIndex, extract_page
+from utils.pdf_processor import PDFProcessor
+
+FONTS_DIR = os.path.join(os.path.dirname(__file__), 'fonts')
+
+
+def make_pdf(path, pages=3):
+    """Pages with several fonts, sizes and colors, some mixed within a line"""
+    doc = fitz.open()
+    for page_num in range(pages):
+        page = doc.new_page()
+        page.insert_font(fontname='F0', fontfile=os.path.join(FONTS_DIR, 'SutonnyMJ.ttf'))
+        y = 72
+        for i in range(12):
+            page.insert_text((72, y), f"Line {page_num}.{i} alpha beta", fontname='helv',
+                             fontsize=10 + i % 3, color=(i % 2, 0, 0))
+            page.insert_text((250, y), "Avwg evsjvq Mvb MvB|", fontname='F0', fontsize=12)
+            page.insert_text((450, y), "mono", fontname='cour', fontsize=9)
+            y += 20
+
+        # Three spans on one line
+        writer = fitz.TextWriter(page.rect)
+        pos = writer.append((72, y + 20), "plain start ", font=fitz.Font('helv'), fontsize=11)[1]
+        pos = writer.append(pos, "bold middle ", font=fitz.Font('hebo'), fontsize=11)[1]
+        writer.append(pos, "tail", font=fitz.Font('tiro'), fontsize=13)
+        writer.write_text(page, color=(0, 0, 1))
+    doc.save(path)
+    doc.close()
+
+
+def make_font_pdf(path):
+    """A Latin page, then Unicode Bengali fonts named like Bijoy fonts next to SutonnyMJ"""
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), "Latin only", fontname='helv')
+    page = doc.new_page()
+    y = 100
+    for n, font_file in enumerate(('Nikosh.ttf', 'Kalpurush.ttf', 'SolaimanLipi.ttf', 'SutonnyMJ.ttf')):
+        page.insert_font(fontname=f'F{n}', fontfile=os.path.join(FONTS_DIR, font_file))
+        text = "Avwg evsjvq" if font_file == 'SutonnyMJ.ttf' else "আমি বাংলায়"
+        page.insert_text((72, y), text, fontname=f'F{n}', fontsize=14)
+        y += 40
+    doc.save(path)
+    doc.close()
+
+
+def clipped_style(page, word):
+    """Word style as the old extraction read it: a clipped dict per word"""
+    try:
+        text_dict = page.get_text("dict", clip=fitz.Rect(word[:4]))
+        span = text_dict["blocks"][0]["lines"][0]["spans"][0]
+        return span.get("font", ""), round(span.get("size", 12), 2), span.get("color", 0), span.get("flags", 0)
+    except (IndexError, KeyError):
+        return "", 12, 0, 0
+
+
+def scanned_origin(raw_dict, x0, y0):
+    """Origin of the first character at (x0, y0), scanning every character"""
+    for block in raw_dict.get("blocks", []):
+        for line in block.get("lines", []):
+            for span in line.get("spans", []):
+                for char in span.get("chars", []):
+                    char_bbox = char.get("bbox", [0, 0, 0, 0])
+                    if abs(char_bbox[0] - x0) < 1.0 and abs(char_bbox[1] - y0) < 5.0:
+                        return char.get("origin", [0, 0])
+    return None
+
+
+def page_output(page):
+    """What a page sends to the client"""
+    return (page['page_number'], page['text_blocks'].to_dicts(), page['images'], page['bbox_corrections'])
+
+
+def check(ok, label):
+    print(f"{'✓' if ok else '✗'} {label}")
+    return ok
+
+
+def test_page_extraction():
+    print("=" * 70)
+    print("SINGLE-PASS PAGE EXTRACTION")
+    print("=" * 70)
+
+    tmp = tempfile.mkdtemp()
+    path = os.path.join(tmp, 'extract.pdf')
+    make_pdf(path)
+    doc = fitz.open(path)
+    all_ok = True
+
+    # Span join: every word gets the style of the clipped lookup
+    mismatches = []
+    words = 0
+    for page_num, page in enumerate(doc):
+        blocks = extract_page(page, page_num)['text_blocks'].to_dicts()
+        page_words = page.get_text("words")
+        words += len(page_words)
+        all_ok &= check(len(blocks) == len(page_words), f"page {page_num}: {len(blocks)} words")
+        for word, block in zip(page_words, blocks):
+            font, size, color, flags = clipped_style(page, word)
+            expected = (word[4], font, size, f"#{color:06x}", flags)
+            got = (block['text'], block['font'], block['size'], block['color'], block['flags'])
+            if got != expected:
+                mismatches.append((got, expected))
+    all_ok &= check(not mismatches, f"span join matches the clipped lookup for {words} words")
+    for got, expected in mismatches[:3]:
+        print(f"    {got} != {expected}")
+
+    # Origin index: same character as the full scan, for word starts and
+    # for points near or between characters
+    rng = random.Random(2)
+    queries = 0
+    mismatches = []
+    for page_num, page in enumerate(doc):
+        raw_dict = page.get_text("rawdict")
+        index = CharOriginIndex(raw_dict)
+        points = [word[:2] for word in page.get_text("words")]
+        points += [(x + rng.uniform(-6, 6), y + rng.uniform(-12, 12)) for x, y in points]
+        for x0, y0 in points:
+            if index.find(x0, y0) != scanned_origin(raw_dict, x0, y0):
+                mismatches.append((page_num, x0, y0))
+        queries += len(points)
+    all_ok &= check(not mismatches, f"origin index matches the rawdict scan for {queries} points")
+    for page_num, x0, y0 in mismatches[:3]:
+        print(f"    page {page_num} at ({x0:.2f}, {y0:.2f})")
+
+    # The Bijoy words get the baseline of their first character
+    page = doc[0]
+    raw_dict = page.get_text("rawdict")
+    blocks = extract_page(page, 0)['text_blocks'].to_dicts()
+    bijoy = [(word, block) for word, block in zip(page.get_text("words"), blocks)
+             if block['font'] == 'SutonnyMJ']
+    ok = bool(bijoy)
+    for word, block in bijoy:
+        origin_y = scanned_origin(raw_dict, word[0], word[1])[1]
+        ok &= block['bbox'] == [word[0], origin_y - (word[3] - word[1]), word[2], origin_y]
+    all_ok &= check(ok, f"{len(bijoy)} SutonnyMJ bboxes corrected to the character origin")
+
+    doc.close()
+
+    # A process pool gives the pages of serial extraction, in page order
+    serial = PDFProcessor({'EXTRACTION_WORKERS': 1})
+    parallel = PDFProcessor({'EXTRACTION_WORKERS': 2, 'PARALLEL_EXTRACTION_MIN_PAGES': 2})
+    for start in (0, 1):
+        expected = [page_output(p) for p in serial.iter_pages(path, start=start)]
+        got = [page_output(p) for p in parallel.iter_pages(path, start=start)]
+        all_ok &= check(got == expected, f"parallel pages {start}.. match serial extraction")
+
+    # The bbox correction goes by the font table: Unicode fonts whose names
+    # are also Bijoy families keep their bbox
+    font_path = os.path.join(tmp, 'fonts.pdf')
+    make_font_pdf(font_path)
+    doc = fitz.open(font_path)
+    page = extract_page(doc[1], 1)
+    shifted = {block['font']: list(word[:4]) != block['bbox']
+               for word, block in zip(doc[1].get_text("words"), page['text_blocks'].to_dicts())}
+    doc.close()
+    expected = {'Nikosh': False, 'Kalpurush': False, 'SolaimanLipi': False, 'SutonnyMJ': True}
+    all_ok &= check(shifted == expected and page['font_table'] == {
+                        'Nikosh': 'unicode_bengali', 'Kalpurush': 'unicode_bengali',
+                        'SolaimanLipi': 'unicode_bengali', 'SutonnyMJ': 'bijoy'},
+                    f"bbox corrected by font table label: {shifted}")
+
+    # The font table only covers the pages extracted so far
+    lazy = serial.process_pdf(font_path, 'fonts', page_limit=1)
+    full = serial.process_pdf(font_path, 'fonts')
+    all_ok &= check(list(lazy['font_table']) == ['Helvetica'] and len(full['font_table']) == 5
+                    and not any('font_table' in p for p in lazy['pages'] + full['pages']),
+                    f"lazy font table {sorted(lazy['font_table'])}, full {len(full['font_table'])} fonts")
+
+    shutil.rmtree(tmp)
+    print("=" * 70)
+    if all_ok:
+        print("✅ ALL TESTS PASSED - Page extraction matches the per-word lookups")
+    else:
+        print("⚠️  SOME TESTS FAILED - Check the output above")
+    print("=" * 70)
+    return all_ok
+
+
+if __name__ == "__main__":
+    success = test_page_extraction()
+    exit(0 if success else 1)
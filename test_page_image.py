@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Check the page image endpoints through the Flask app
+GET /api/page/<session>/<page>/image with ETags and versioned URLs, and the
+request checks it shares with POST /api/page/render
+"""
+
+import logging
+import os
+import sys
+import tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+TEST_PDF = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test.pdf')
+
+
+def check(ok, label):
+    print(f"{'✓' if ok else '✗'} {label}")
+    return not ok
+
+
+def upload(client):
+    with open(TEST_PDF, 'rb') as f:
+        return client.post('/api/upload', data={'file': (f, 'test.pdf')},
+                           content_type='multipart/form-data').get_json()['session_id']
+
+
+def check_image(appmod):
+    """Immutable versioned URLs, ETags and 304 answers"""
+    failures = 0
+    client = appmod.app.test_client()
+    session_id = upload(client)
+    url = f'/api/page/{session_id}/0/image'
+
+    # The current version is immutable and revalidates to 304
+    response = client.get(url + '?zoom=1&v=0')
+    etag = response.headers.get('ETag')
+    failures += check(response.status_code == 200 and response.data[:4] == b'\x89PNG'
+                      and 'immutable' in response.headers['Cache-Control'],
+                      f"image v=0: {response.status_code} {response.headers['Cache-Control']}")
+    response = client.get(url + '?zoom=1&v=0', headers={'If-None-Match': etag})
+    failures += check(response.status_code == 304 and not response.data, f"If-None-Match: {response.status_code}")
+    response = client.get(url + '?zoom=1')
+    failures += check(response.headers['Cache-Control'] == 'private, no-cache',
+                      f"image without v: {response.headers['Cache-Control']}")
+
+    # An edit bumps the version: the old URL and ETag are stale
+    edit = client.post('/api/text/edit', json={
+        'session_id': session_id, 'page_number': 0, 'bbox': [50, 50, 120, 70], 'original_text': '',
+        'new_text': 'Hello', 'text_box_id': 'x', 'font': 'helv', 'font_size': 12, 'color': '#000000'
+    }).get_json()
+    stale = client.get(url + '?zoom=1&v=0', headers={'If-None-Match': etag})
+    current = client.get(url + '?zoom=1&v=1')
+    failures += check(edit.get('page_version') == 1 and stale.status_code == 200
+                      and stale.headers['ETag'] != etag and stale.headers['Cache-Control'] == 'private, no-cache'
+                      and 'immutable' in current.headers['Cache-Control'],
+                      f"after an edit: stale v=0 {stale.status_code}, v=1 {current.headers['Cache-Control']}")
+    return failures
+
+
+def check_requests(appmod):
+    """Page numbers, zooms and the pixel budget, for GET image and POST render"""
+    failures = 0
+    client = appmod.app.test_client()
+    session_id = upload(client)
+
+    def render(**fields):
+        return client.post('/api/page/render', json={'session_id': session_id, **fields}).status_code
+
+    statuses = [render(page_number=n) for n in (-1, 4, '0', None)]
+    statuses += [render(page_number=0, zoom=z) for z in (0, -1, 'x', None, True, float('inf'))]
+    failures += check(statuses == [400] * 10 and render(page_number=0, zoom=1.5) == 200,
+                      f"POST render rejects bad page numbers and zooms: {statuses}")
+
+    statuses = [client.get(f'/api/page/{session_id}/0/image?zoom={z}').status_code
+                for z in ('0', '-1', 'x', 'nan', 'inf')]
+    missing = client.get(f'/api/page/{session_id}/4/image').status_code
+    failures += check(statuses == [400] * 5 and missing == 404,
+                      f"GET image rejects bad zooms {statuses}, page past the end {missing}")
+
+    # Both refuse pages over RENDER_MAX_PIXELS (those load as tiles)
+    max_pixels = appmod.app.config.get('RENDER_MAX_PIXELS')
+    appmod.app.config['RENDER_MAX_PIXELS'] = 100 * 100
+    try:
+        statuses = [render(page_number=1, zoom=1), client.get(f'/api/page/{session_id}/1/image').status_code,
+                    render(page_number=1, zoom=0.1)]
+    finally:
+        appmod.app.config['RENDER_MAX_PIXELS'] = max_pixels
+    failures += check(statuses == [400, 400, 200], f"RENDER_MAX_PIXELS: render, image, small zoom {statuses}")
+    return failures
+
+
+def check_endpoints(tmp):
+    """Run the HTTP checks with the app's folders (relative paths) in tmp"""
+    cwd = os.getcwd()
+    os.chdir(tmp)
+    try:
+        # A fresh import, so the app creates its folders here even when an
+        # earlier test in the same process imported it in another tempdir
+        sys.modules.pop('app', None)
+        try:
+            import app as appmod
+        except ImportError as e:
+            print(f"- HTTP checks skipped, app dependencies missing: {e}")
+            return 0
+        return check_image(appmod) + check_requests(appmod)
+    finally:
+        os.chdir(cwd)
+
+
+def test_page_image():
+    print("=" * 70)
+    print("PAGE IMAGE ENDPOINTS")
+    print("=" * 70)
+
+    # The test edit falls back to default fonts; keep its warnings out of the output
+    logging.disable(logging.WARNING)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            failures = check_endpoints(tmp)
+    finally:
+        logging.disable(logging.NOTSET)
+
+    print("=" * 70)
+    if failures == 0:
+        print("✅ ALL TESTS PASSED - Page image endpoints work")
+    else:
+        print(f"⚠️  {failures} FAILURES - Check the output above")
+    print("=" * 70)
+    return failures == 0
+
+
+if __name__ == "__main__":
+    success = test_page_image()
+    exit(0 if success else 1)
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Check tiled page rendering through the Flask app
+Tiles cover the page at any zoom, and pages over RENDER_MAX_PIXELS load as tiles
+"""
+
+import io
+import logging
+import math
+import os
+import sys
+import tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+import fitz  # PyMuPDF
+from PIL import Image
+
+TEST_PDF = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test.pdf')
+
+
+def check(ok, label):
+    print(f"{'✓' if ok else '✗'} {label}")
+    return not ok
+
+
+def upload(client, data, filename):
+    return client.post('/api/upload', data={'file': (io.BytesIO(data), filename)},
+                       content_type='multipart/form-data').get_json()
+
+
+def check_tiles(appmod):
+    """Tile grid, partial edge tiles, tile caching and the A0 case"""
+    failures = 0
+    client = appmod.app.test_client()
+    with open(TEST_PDF, 'rb') as f:
+        document = upload(client, f.read(), 'test.pdf')
+    session_id = document['session_id']
+    page = document['pdf_data']['pages'][0]
+
+    # The last tile is partial, one past it does not exist
+    zoom = 2
+    tile_size = appmod.app.config['RENDER_TILE_SIZE']
+    columns = math.ceil(page['width'] * zoom / tile_size)
+    rows = math.ceil(page['height'] * zoom / tile_size)
+    first = client.get(f'/api/page/{session_id}/0/tile/0/0?zoom={zoom}&v=0')
+    last = client.get(f'/api/page/{session_id}/0/tile/{columns - 1}/{rows - 1}?zoom={zoom}&v=0')
+    sizes = [Image.open(io.BytesIO(tile.data)).size for tile in (first, last)]
+    expected = [(tile_size, tile_size),
+                (math.ceil(page['width'] * zoom) - (columns - 1) * tile_size,
+                 math.ceil(page['height'] * zoom) - (rows - 1) * tile_size)]
+    failures += check(first.status_code == last.status_code == 200 and sizes == expected,
+                      f"tiles: {columns}x{rows} at zoom {zoom}, sizes {sizes}")
+    statuses = [client.get(f'/api/page/{session_id}/0/tile/{columns}/0?zoom={zoom}').status_code,
+                client.get(f'/api/page/{session_id}/0/tile/0/{rows}?zoom={zoom}').status_code,
+                client.get(f'/api/page/{session_id}/0/tile/0/0?zoom=0').status_code]
+    failures += check(statuses == [404, 404, 400], f"tile out of range, bad zoom: {statuses}")
+
+    # Tiles are cached on their own
+    before = appmod.render_cache.stats()
+    again = client.get(f'/api/page/{session_id}/0/tile/0/0?zoom={zoom}&v=0')
+    after = appmod.render_cache.stats()
+    failures += check(again.data == first.data and after['misses'] == before['misses'],
+                      "a tile is rendered once")
+
+    # Pages over RENDER_MAX_PIXELS are only served as tiles; the viewer
+    # loads an A0 page at its 2.0 maximum zoom that way
+    doc = fitz.open()
+    doc.new_page(width=2384, height=3370).insert_text((100, 100), 'A0')
+    a0 = upload(client, doc.tobytes(), 'a0.pdf')['session_id']
+    doc.close()
+    too_large = client.get(f'/api/page/{a0}/0/image?zoom=2')
+    columns, rows = math.ceil(2384 * 2 / tile_size), math.ceil(3370 * 2 / tile_size)
+    tiles = [client.get(f'/api/page/{a0}/0/tile/{column}/{row}?zoom=2&v=0')
+             for column, row in ((0, 0), (columns - 1, rows - 1))]
+    failures += check(too_large.status_code == 400 and all(tile.status_code == 200 for tile in tiles),
+                      f"A0 at zoom 2: image {too_large.status_code}, {columns}x{rows} tiles "
+                      f"{[tile.status_code for tile in tiles]}")
+    return failures
+
+
+def check_endpoints(tmp):
+    """Run the HTTP checks with the app's folders (relative paths) in tmp"""
+    cwd = os.getcwd()
+    os.chdir(tmp)
+    try:
+        # A fresh import, so the app creates its folders here even when an
+        # earlier test in the same process imported it in another tempdir
+        sys.modules.pop('app', None)
+        try:
+            import app as appmod
+        except ImportError as e:
+            print(f"- HTTP checks skipped, app dependencies missing: {e}")
+            return 0
+        return check_tiles(appmod)
+    finally:
+        os.chdir(cwd)
+
+
+def test_page_tiles():
+    print("=" * 70)
+    print("PAGE TILES")
+    print("=" * 70)
+
+    logging.disable(logging.INFO)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            failures = check_endpoints(tmp)
+    finally:
+        logging.disable(logging.NOTSET)
+
+    print("=" * 70)
+    if failures == 0:
+        print("✅ ALL TESTS PASSED - Page tiles work")
+    else:
+        print(f"⚠️  {failures} FAILURES - Check the output above")
+    print("=" * 70)
+    return failures == 0
+
+
+if __name__ == "__main__":
+    success = test_page_tiles()
+    exit(0 if success else 1)
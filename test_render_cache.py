@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Check the render cache
+RenderCache tiers, eviction and invalidation, and (when the app's
+dependencies are installed) cached renders through /api/page/render
+"""
+
+import logging
+import os
+import sys
+import tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+from utils.render_cache import RenderCache, render_key
+
+TEST_PDF = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test.pdf')
+
+
+def check(ok, label):
+    print(f"{'✓' if ok else '✗'} {label}")
+    return not ok
+
+
+def check_cache(tmp):
+    """RenderCache on its own: LRU tiers, disk cap, invalidation, stats"""
+    failures = 0
+
+    # Memory tier: a hit moves an entry to the end, the oldest one goes
+    cache = RenderCache(os.path.join(tmp, 'memory'), memory_bytes=250, disk_bytes=10000)
+    cache.put('s', 0, 1.0, 0, b'a' * 100)
+    cache.put('s', 1, 1.0, 0, b'b' * 100)
+    cache.get('s', 0, 1.0, 0)
+    cache.put('s', 2, 1.0, 0, b'c' * 100)
+    before = cache.stats()
+    cache.get('s', 0, 1.0, 0)
+    cache.get('s', 1, 1.0, 0)
+    after = cache.stats()
+    failures += check(before['memory_entries'] == 2 and before['memory_bytes'] == 200
+                      and after['memory_hits'] - before['memory_hits'] == 1
+                      and after['disk_hits'] - before['disk_hits'] == 1,
+                      f"memory LRU evicts the least recently used page: {after['memory_entries']} entries")
+
+    # Disk tier: least recently written (oldest mtime) files go first
+    cache = RenderCache(os.path.join(tmp, 'disk'), memory_bytes=10000, disk_bytes=250)
+    cache.put('s', 0, 1.0, 0, b'a' * 100)
+    cache.put('s', 1, 1.0, 0, b'b' * 100)
+    os.utime(os.path.join(cache.cache_folder, render_key('s', 0, 1.0, 0)), (1, 1))
+    os.utime(os.path.join(cache.cache_folder, render_key('s', 1, 1.0, 0)), (2, 2))
+    cache.put('s', 2, 1.0, 0, b'c' * 100)
+    files = sorted(os.listdir(cache.cache_folder))
+    stats = cache.stats()
+    failures += check(files == [render_key('s', 1, 1.0, 0), render_key('s', 2, 1.0, 0)]
+                      and stats['evictions'] == 1 and stats['disk_bytes'] <= 250,
+                      f"disk cap evicts the oldest file: {stats['disk_entries']} files, {stats['disk_bytes']} bytes")
+
+    # Per-page invalidation: page 1 must not take page 10 (or other sessions) with it
+    cache = RenderCache(os.path.join(tmp, 'invalidate'))
+    cache.put('s', 1, 1.0, 0, b'one')
+    cache.put('s', 1, 1.0, 0, b'tile', tile=(0, 0))
+    cache.put('s', 10, 1.0, 0, b'ten')
+    cache.put('t', 1, 1.0, 0, b'other')
+    removed = cache.invalidate('s', 1)
+    failures += check(removed == 4 and cache.get('s', 1, 1.0, 0) is None
+                      and cache.get('s', 10, 1.0, 0) == b'ten' and cache.get('t', 1, 1.0, 0) == b'other',
+                      f"invalidate(page 1) removes {removed} entries, keeps page 10")
+    removed = cache.invalidate('s')
+    failures += check(removed == 2 and cache.get('s', 10, 1.0, 0) is None,
+                      f"invalidate(session) removes {removed} entries")
+
+    # Versions and formats are separate entries
+    cache.put('s', 3, 1.0, 1, b'v1')
+    cache.put('s', 3, 0.5, 1, b'jpg', image_format='jpg')
+    failures += check(cache.get('s', 3, 1.0, 0) is None and cache.get('s', 3, 1.0, 1) == b'v1'
+                      and cache.get('s', 3, 0.5, 1) is None
+                      and cache.get('s', 3, 0.5, 1, image_format='jpg') == b'jpg',
+                      "page versions and image formats are keyed separately")
+
+    stats = cache.stats()
+    lookups = stats['memory_hits'] + stats['disk_hits'] + stats['misses']
+    failures += check(lookups > 0 and stats['hit_rate'] == round((lookups - stats['misses']) / lookups, 3),
+                      f"stats: hit rate {stats['hit_rate']} over {lookups} lookups")
+    return failures
+
+
+
+def check_render(appmod):
+    """POST /api/page/render through the app's render cache"""
+    failures = 0
+    client = appmod.app.test_client()
+    with open(TEST_PDF, 'rb') as f:
+        session_id = client.post('/api/upload', data={'file': (f, 'test.pdf')},
+                                 content_type='multipart/form-data').get_json()['session_id']
+
+    def render(page_number):
+        before = appmod.render_cache.stats()
+        response = client.post('/api/page/render', json={'session_id': session_id,
+                                                         'page_number': page_number, 'zoom': 1.0})
+        after = appmod.render_cache.stats()
+        hit = after['memory_hits'] + after['disk_hits'] > before['memory_hits'] + before['disk_hits']
+        return response.get_json()['image_data'], hit
+
+    first, first_hit = render(0)
+    again, again_hit = render(0)
+    other, _ = render(1)
+    failures += check(first.startswith('data:image/png;base64,') and again == first
+                      and not first_hit and again_hit,
+                      "a page is rendered once, then served from the cache")
+
+    # An edit invalidates the page it touches, not the others
+    client.post('/api/text/edit', json={
+        'session_id': session_id, 'page_number': 0, 'bbox': [50, 50, 120, 70], 'original_text': '',
+        'new_text': 'Hello', 'text_box_id': 'x', 'font': 'helv', 'font_size': 12, 'color': '#000000'
+    })
+    edited, edited_hit = render(0)
+    other_again, other_hit = render(1)
+    failures += check(edited != first and not edited_hit and other_again == other and other_hit,
+                      "an edit re-renders its page only")
+
+    stats = appmod.render_cache.stats()
+    failures += check(stats['misses'] == 3 and stats['memory_bytes'] > 0,
+                      f"app render cache: {stats['misses']} misses, hit rate {stats['hit_rate']}, "
+                      f"{stats['memory_bytes']} bytes in memory")
+    return failures
+
+
+def check_endpoints(tmp):
+    """Run the HTTP checks with the app's folders (relative paths) in tmp"""
+    cwd = os.getcwd()
+    os.chdir(tmp)
+    try:
+        # A fresh import, so the app creates its folders here even when an
+        # earlier test in the same process imported it in another tempdir
+        sys.modules.pop('app', None)
+        try:
+            import app as appmod
+        except ImportError as e:
+            print(f"- HTTP checks skipped, app dependencies missing: {e}")
+            return 0
+        return check_render(appmod)
+    finally:
+        os.chdir(cwd)
+
+
+def test_render_cache():
+    print("=" * 70)
+    print("RENDER CACHE")
+    print("=" * 70)
+
+    # The test edit falls back to default fonts; keep its warnings out of the output
+    logging.disable(logging.WARNING)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            failures = check_cache(tmp) + check_endpoints(tmp)
+    finally:
+        logging.disable(logging.NOTSET)
+
+    print("=" * 70)
+    if failures == 0:
+        print("✅ ALL TESTS PASSED - Render cache works")
+    else:
+        print(f"⚠️  {failures} FAILURES - Check the output above")
+    print("=" * 70)
+    return failures == 0
+
+
+if __name__ == "__main__":
+    success = test_render_cache()
+    exit(0 if success else 1)
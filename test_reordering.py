@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Check the linear reordering passes against the original implementation
+Both directions must give exactly the old output wherever the old loops terminate
+"""
+
+import random
+import sys
+import os
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
+
+from utils.bijoy2unicode import converter
+
+import converter_reference as reference
+
+ALPHABET = list('কগরমনতযসদ্্্রররিেৈাোৌৗুূীৃঁংঃ অআ\n') + ['ড়']
+
+BIJOY_WORDS = ['Avwg', 'evsjvq', 'Mvb', 'MvB|', 'wk¶v', 'gš¿Yvjq', '†`‡ki', 'RbmsL¨v',
+               'cÖvq', '17', '†KvwU', 'cÖwZwbwa', 'Kg©KZ©v', '¯^vaxbZv', 'fvlv']
+
+# The original Unicode to Bijoy loop never finishes on these
+NON_TERMINATING = ['িক', 'ে', 'েকি', 'ি ক']
+
+
+def test_reordering(rounds=20000):
+    print("=" * 70)
+    print("LINEAR REORDERING VS REFERENCE")
+    print("=" * 70)
+
+    rng = random.Random(int(os.environ.get('REORDER_SEED', '1')))
+    fast = converter.Unicode()
+    ref = reference.Unicode()
+    passes = [
+        ('reArrangeUnicodeConvertedText', fast.reArrangeUnicodeConvertedText, ref.reArrangeUnicodeConvertedText),
+        ('reArranceUnicodeTextForASCI', fast.reArranceUnicodeTextForASCI, ref.reArranceUnicodeTextForASCI),
+    ]
+    texts = [''.join(rng.choice(ALPHABET) for _ in range(rng.randint(0, rng.choice([6, 30, 120]))))
+             for _ in range(rounds)]
+    failures = 0
+
+    for name, fast_pass, ref_pass in passes:
+        mismatches = []
+        skipped = 0
+        for text in texts:
+            try:
+                expected = ref_pass(text)
+            except reference.ReferenceDivergence:
+                skipped += 1
+                continue
+            if fast_pass(text) != expected:
+                mismatches.append(text)
+        failures += len(mismatches)
+        status = "✓" if not mismatches else "✗"
+        print(f"{status} {name:30s}: {len(texts) - skipped} texts, {len(mismatches)} mismatches "
+              f"({skipped} never finish in the original)")
+        for text in mismatches[:3]:
+            print(f"    {text!r}: {fast_pass(text)!r} != {ref_pass(text)!r}")
+
+    for text in NON_TERMINATING:
+        print(f"✓ terminates on {text!r}: {fast.reArranceUnicodeTextForASCI(text)!r}")
+
+    page = ' '.join(rng.choice(BIJOY_WORDS) for _ in range(4000))
+    start = time.perf_counter()
+    unicode_page = fast.convertBijoyToUnicode(page)
+    to_unicode = time.perf_counter() - start
+    start = time.perf_counter()
+    fast.convertUnicodeToBijoy(unicode_page)
+    to_bijoy = time.perf_counter() - start
+    print(f"  4000 words: Bijoy to Unicode {to_unicode * 1000:.1f} ms, "
+          f"Unicode to Bijoy {to_bijoy * 1000:.1f} ms")
+
+    print("=" * 70)
+    if failures == 0:
+        print("✅ ALL TESTS PASSED - Reordering matches the reference")
+    else:
+        print(f"⚠️  {failures} MISMATCHES - Check the output above")
+    print("=" * 70)
+    return failures == 0
+
+
+if __name__ == "__main__":
+    success = test_reordering()
+    exit(0 if success else 1)
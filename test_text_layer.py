@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Check the columnar text layer
+Storage round trips must give back the same words, and pages saved as
+per-word dicts must load into the same layer
+"""
+
+import json
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+import fitz  # PyMuPDF
+
+from utils.page_extractor import extract_page
+from utils.text_layer import PageTextLayer, api_default, storage_default, storage_object_hook
+
+TEST_PDF = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test.pdf')
+
+
+def check(ok, label):
+    print(f"{'✓' if ok else '✗'} {label}")
+    return not ok
+
+
+def stored(value):
+    """value after a trip through a session or cache file"""
+    return json.loads(json.dumps(value, ensure_ascii=False, default=storage_default),
+                      object_hook=storage_object_hook)
+
+
+def test_text_layer():
+    print("=" * 70)
+    print("COLUMNAR TEXT LAYER")
+    print("=" * 70)
+
+    failures = 0
+    doc = fitz.open(TEST_PDF)
+    page = extract_page(doc[0], 0)
+    doc.close()
+    layer = page['text_blocks']
+
+    # Extracted layer, as stored before conversion
+    restored = stored(page)
+    failures += check(isinstance(restored['text_blocks'], PageTextLayer)
+                      and restored['text_blocks'].to_dicts() == layer.to_dicts(),
+                      f"to_storage/from_storage: {len(layer)} words")
+
+    # Converted layer: original texts and Bijoy marks survive too
+    layer.original_texts = list(layer.texts)
+    layer.texts = [text.upper() for text in layer.texts]
+    for index in range(0, len(layer), 3):
+        layer.set_bijoy(index)
+    restored = stored(page)['text_blocks']
+    failures += check(restored.to_dicts() == layer.to_dicts()
+                      and sum(block['is_bijoy'] for block in restored.to_dicts()) == (len(layer) + 2) // 3,
+                      "converted layer round trip keeps original_text and is_bijoy")
+
+    # Every column is restored with its type and values
+    columns = ('bboxes', 'sizes', 'font_ids', 'color_ids', 'flags', 'marks', 'block_nos', 'line_nos', 'word_nos')
+    failures += check(all(getattr(restored, name) == getattr(layer, name)
+                          and getattr(restored, name).typecode == getattr(layer, name).typecode
+                          for name in columns),
+                      "numeric columns restored with their typecodes")
+
+    # A restored layer keeps interning: an edit with a known font and color
+    # reuses their IDs, a new one is appended
+    restored.update_word(0, 'edited', layer.fonts[0], 11.0, layer.colors[0])
+    restored.update_word(1, 'edited', 'NewFont', 11.0, '#123456')
+    failures += check(restored.fonts == layer.fonts + ['NewFont']
+                      and restored.colors == layer.colors + ['#123456']
+                      and restored.font_ids[0] == 0,
+                      f"edits after a round trip: {len(restored.fonts)} fonts, {len(restored.colors)} colors")
+
+    # Sessions saved before the columnar layout held per-word dicts
+    legacy = json.loads(json.dumps({'page_number': 0, 'text_blocks': layer.to_dicts()}, default=api_default),
+                        object_hook=storage_object_hook)
+    failures += check(isinstance(legacy['text_blocks'], PageTextLayer)
+                      and json.dumps(legacy['text_blocks'].to_dicts()) == json.dumps(layer.to_dicts()),
+                      "per-word dicts load into the same layer")
+
+    # Per-word dicts are only built on demand; the layer has no __dict__
+    failures += check(not hasattr(layer, '__dict__') and len(layer.fonts) < len(layer),
+                      f"{len(layer)} words share {len(layer.fonts)} fonts and {len(layer.colors)} colors")
+
+    print("=" * 70)
+    if failures == 0:
+        print("✅ ALL TESTS PASSED - Text layers survive storage")
+    else:
+        print(f"⚠️  {failures} FAILURES - Check the output above")
+    print("=" * 70)
+    return failures == 0
+
+
+if __name__ == "__main__":
+    success = test_text_layer()
+    exit(0 if success else 1)
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Check the thumbnail sprite sheets
+ThumbnailService sheets and index, failed builds, and (when the app's
+dependencies are installed) the thumbnail endpoints
+"""
+
+import io
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+import fitz  # PyMuPDF
+from PIL import Image
+
+from utils.thumbnails import ThumbnailService
+
+TEST_PDF = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test.pdf')
+
+
+def check(ok, label):
+    print(f"{'✓' if ok else '✗'} {label}")
+    return not ok
+
+
+def wait_for_build(service, session_id, seconds=30):
+    deadline = time.monotonic() + seconds
+    while service.is_building(session_id) and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+
+def check_service(tmp):
+    """ThumbnailService on its own: sheets, index offsets and failed builds"""
+    service = ThumbnailService(os.path.join(tmp, 'thumbnails'), width=60, per_sheet=3)
+    index = service.build('s', TEST_PDF)
+    pages = [page for sheet in index['sheets'] for page in sheet['pages']]
+    ok = (index == service.get_index('s') and index['page_count'] == 4 and len(index['sheets']) == 2
+          and [page['page_number'] for page in pages] == [0, 1, 2, 3]
+          and all(page['width'] == 60 for page in pages)
+          and all(os.path.exists(service.sheet_path('s', sheet['sheet_number'])) for sheet in index['sheets']))
+    failures = check(ok, f"thumbnails: {index['page_count']} pages in {len(index['sheets'])} sheets")
+
+    # Every thumbnail sits inside its sheet at its offset and looks like its page
+    doc = fitz.open(TEST_PDF)
+    offsets_ok = True
+    for sheet in index['sheets']:
+        image = Image.open(service.sheet_path('s', sheet['sheet_number'])).convert('RGB')
+        for page in sheet['pages']:
+            box = (page['x'], page['y'], page['x'] + page['width'], page['y'] + page['height'])
+            rect = doc[page['page_number']].rect
+            offsets_ok &= (box[2] <= image.width and box[3] <= image.height
+                           and abs(page['height'] - 60 * rect.height / rect.width) <= 1
+                           and image.crop(box).getextrema() != ((255, 255),) * 3)
+    doc.close()
+    failures += check(offsets_ok, "index offsets point at the page thumbnails")
+
+    # A failed build is remembered until the next start()
+    broken = os.path.join(tmp, 'broken.pdf')
+    with open(broken, 'wb') as f:
+        f.write(b'not a pdf')
+    service.start('broken', broken)
+    wait_for_build(service, 'broken')
+    failures += check(service.failure('broken') is not None and service.failure('s') is None
+                      and service.get_index('broken') is None,
+                      f"failed thumbnail build recorded: {service.failure('broken')!r}")
+    return failures
+
+
+def poll(client, url, seconds=60):
+    """GET url until it stops answering 202"""
+    deadline = time.monotonic() + seconds
+    response = client.get(url)
+    while response.status_code == 202 and time.monotonic() < deadline:
+        time.sleep(0.2)
+        response = client.get(url)
+    return response
+
+
+def check_http(appmod):
+    """Thumbnails built after an upload, and a failed build over HTTP"""
+    failures = 0
+    client = appmod.app.test_client()
+    with open(TEST_PDF, 'rb') as f:
+        session_id = client.post('/api/upload', data={'file': (f, 'test.pdf')},
+                                 content_type='multipart/form-data').get_json()['session_id']
+
+    response = poll(client, f'/api/thumbnails/{session_id}')
+    index = (response.get_json() or {}).get('thumbnails', {})
+    sheet = client.get(f'/api/thumbnails/{session_id}/0')
+    failures += check(response.status_code == 200 and index.get('page_count') == 4
+                      and sheet.mimetype == 'image/webp',
+                      f"thumbnail index: {response.status_code}, {index.get('page_count')} pages")
+
+    # A build that fails is reported (and not restarted by every poll)
+    doc = fitz.open()
+    doc.new_page()
+    broken_id = client.post('/api/upload', data={'file': (io.BytesIO(doc.tobytes()), 'broken.pdf')},
+                            content_type='multipart/form-data').get_json()['session_id']
+    doc.close()
+    wait_for_build(appmod.thumbnail_service, broken_id)
+    with open(appmod.session_manager.load(broken_id)['filepath'], 'wb') as f:
+        f.write(b'not a pdf')
+    shutil.rmtree(os.path.dirname(appmod.thumbnail_service.sheet_path(broken_id, 0)), ignore_errors=True)
+    response = poll(client, f'/api/thumbnails/{broken_id}')
+    again = client.get(f'/api/thumbnails/{broken_id}')
+    failures += check(response.status_code == 500 and response.get_json().get('status') == 'failed'
+                      and again.status_code == 500 and not appmod.thumbnail_service.is_building(broken_id),
+                      f"failed thumbnail build: {response.status_code} {response.get_json().get('status')}")
+    return failures
+
+
+def check_endpoints(tmp):
+    """Run check_http() with the app's folders (relative paths) in tmp"""
+    cwd = os.getcwd()
+    os.chdir(tmp)
+    try:
+        # A fresh import, so the app creates its folders here even when an
+        # earlier test in the same process imported it in another tempdir
+        sys.modules.pop('app', None)
+        try:
+            import app as appmod
+        except ImportError as e:
+            print(f"- HTTP checks skipped, app dependencies missing: {e}")
+            return 0
+        return check_http(appmod)
+    finally:
+        os.chdir(cwd)
+
+
+def test_thumbnails():
+    print("=" * 70)
+    print("THUMBNAIL SPRITE SHEETS")
+    print("=" * 70)
+
+    # Failures are provoked on purpose; keep their logs out of the output
+    logging.disable(logging.CRITICAL)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            failures = check_service(tmp) + check_endpoints(tmp)
+    finally:
+        logging.disable(logging.NOTSET)
+
+    print("=" * 70)
+    if failures == 0:
+        print("✅ ALL TESTS PASSED - Thumbnails work")
+    else:
+        print(f"⚠️  {failures} FAILURES - Check the output above")
+    print("=" * 70)
+    return failures == 0
+
+
+if __name__ == "__main__":
+    success = test_thumbnails()
+    exit(0 if success else 1)
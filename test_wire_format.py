@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Check the packed text-layer wire format
+A decoder written from the layout in wire_format.py must give back the
+JSON response, with every section on a 4-byte boundary
+"""
+
+import json
+import os
+import struct
+import sys
+from array import array
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+import fitz  # PyMuPDF
+
+from utils.page_extractor import extract_page
+from utils.text_layer import PageTextLayer, api_default
+from utils.wire_format import WIRE_MAGIC, WIRE_VERSION, encode_response
+
+TEST_PDF = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test.pdf')
+
+
+def check(ok, label):
+    print(f"{'✓' if ok else '✗'} {label}")
+    return not ok
+
+
+def read_column(body, pos, typecode, count, offsets):
+    """Read one column at pos; returns it and the next 4-byte aligned position"""
+    offsets.append(pos)
+    column = array(typecode)
+    column.frombytes(body[pos:pos + count * column.itemsize])
+    if sys.byteorder != 'little':
+        column.byteswap()
+    pos += count * column.itemsize
+    return column, pos + (-pos % 4)
+
+
+def read_strings(body, pos, size, ends, offsets):
+    """Slice words out of a UTF-8 string table by UTF-16 end offsets"""
+    offsets.append(pos)
+    units = body[pos:pos + size].decode('utf-8').encode('utf-16-le')
+    texts = []
+    start = 0
+    for end in ends:
+        texts.append(units[2 * start:2 * end].decode('utf-16-le'))
+        start = end
+    pos += size
+    return texts, pos + (-pos % 4)
+
+
+def decode_layer(body, descriptor, fonts, colors, offsets):
+    """Per-word dicts of one text layer, as PageTextLayer.to_dicts() builds them"""
+    n = descriptor['count']
+    converted = descriptor['original_bytes'] is not None
+    pos = descriptor['offset']
+    bboxes, pos = read_column(body, pos, 'f', 4 * n, offsets)
+    sizes, pos = read_column(body, pos, 'f', n, offsets)
+    flags, pos = read_column(body, pos, 'I', n, offsets)
+    block_nos, pos = read_column(body, pos, 'I', n, offsets)
+    line_nos, pos = read_column(body, pos, 'I', n, offsets)
+    word_nos, pos = read_column(body, pos, 'I', n, offsets)
+    text_ends, pos = read_column(body, pos, 'I', n, offsets)
+    if converted:
+        original_ends, pos = read_column(body, pos, 'I', n, offsets)
+    font_ids, pos = read_column(body, pos, 'H', n, offsets)
+    color_ids, pos = read_column(body, pos, 'H', n, offsets)
+    marks, pos = read_column(body, pos, 'B', n, offsets)
+    texts, pos = read_strings(body, pos, descriptor['text_bytes'], text_ends, offsets)
+    if converted:
+        original_texts, pos = read_strings(body, pos, descriptor['original_bytes'], original_ends, offsets)
+
+    layer = PageTextLayer(descriptor['page_number'])
+    for i in range(n):
+        layer.append(texts[i], fonts[font_ids[i]], sizes[i], colors[color_ids[i]], flags[i],
+                     bboxes[4 * i:4 * i + 4], block_nos[i], line_nos[i], word_nos[i])
+        layer.marks[i] = marks[i]
+    if converted:
+        layer.original_texts = original_texts
+    return layer.to_dicts()
+
+
+def decode_response(data):
+    """Decode a packed response into the JSON it stands for"""
+    magic = data[:4]
+    version, reserved, header_length = struct.unpack('<HHI', data[4:12])
+    assert magic == WIRE_MAGIC and version == WIRE_VERSION and reserved == 0
+    header = json.loads(data[12:12 + header_length].decode('utf-8'))
+    body = data[12 + header_length:]
+    offsets = []
+
+    def restore(value, page_number=None):
+        if isinstance(value, dict):
+            if set(value) == {'count', 'offset', 'text_bytes', 'original_bytes'}:
+                return decode_layer(body, dict(value, page_number=page_number),
+                                    header['fonts'], header['colors'], offsets)
+            return {key: restore(item, value.get('page_number', page_number)) for key, item in value.items()}
+        if isinstance(value, list):
+            return [restore(item, page_number) for item in value]
+        return value
+
+    return restore(header['payload']), header_length, offsets
+
+
+def test_wire_format():
+    print("=" * 70)
+    print("TEXT LAYER WIRE FORMAT")
+    print("=" * 70)
+
+    failures = 0
+    doc = fitz.open(TEST_PDF)
+    pages = [extract_page(doc[page_num], page_num) for page_num in range(doc.page_count)]
+    doc.close()
+
+    # One converted page, with words outside the BMP (two UTF-16 units)
+    # and words that are empty
+    layer = pages[1]['text_blocks']
+    layer.original_texts = list(layer.texts)
+    layer.texts = [f"{text}\U0001F600ক" if i % 5 == 0 else ('' if i % 7 == 0 else text)
+                   for i, text in enumerate(layer.texts)]
+    for i in range(0, len(layer), 2):
+        layer.set_bijoy(i)
+    # One page with a font of its own, and one without words
+    pages[2]['text_blocks'].update_word(0, 'renamed', 'OnlyOnPage2', 9.5, '#abcdef')
+    pages.append({'page_number': len(pages), 'text_blocks': PageTextLayer(len(pages))})
+
+    payload = {'success': True, 'pdf_data': {'num_pages': len(pages), 'pages': pages}}
+    expected = json.loads(json.dumps(payload, ensure_ascii=False, default=api_default))
+    data = encode_response(payload)
+    decoded, header_length, offsets = decode_response(data)
+    decoded = json.loads(json.dumps(decoded, ensure_ascii=False))
+
+    failures += check(decoded == expected,
+                      f"decodes to the JSON response: {len(data)} bytes vs "
+                      f"{len(json.dumps(expected, ensure_ascii=False).encode('utf-8'))} bytes of JSON")
+    failures += check(header_length % 4 == 0 and len(data) % 4 == 0 and all(o % 4 == 0 for o in offsets),
+                      f"4-byte alignment: header {header_length} bytes, {len(offsets)} sections")
+
+    converted = expected['pdf_data']['pages'][1]['text_blocks']
+    failures += check(sum(block['is_bijoy'] for block in converted) == (len(converted) + 1) // 2
+                      and any('\U0001F600' in block['text'] for block in converted),
+                      "original texts, Bijoy marks and non-BMP words survive")
+
+    failures += check(decode_response(encode_response({'success': True}))[0] == {'success': True},
+                      "a response without text layers")
+
+    print("=" * 70)
+    if failures == 0:
+        print("✅ ALL TESTS PASSED - Wire format round trip matches JSON")
+    else:
+        print(f"⚠️  {failures} FAILURES - Check the output above")
+    print("=" * 70)
+    return failures == 0
+
+
+if __name__ == "__main__":
+    success = test_wire_format()
+    exit(0 if success else 1)